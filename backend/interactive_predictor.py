@@ -5,12 +5,20 @@ import os
 
 # Get the project root directory
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'scripts'))
+from model_bundle import load_bundle
 
-with open(os.path.join(project_root, 'models', 'ultimate_ensemble_model.pkl'), 'rb') as f:
-    model = pickle.load(f)
+# Memory-mapped bundle from scripts/model_bundle.py when it is current
+model_path = os.path.join(project_root, 'models', 'ultimate_ensemble_model.pkl')
+bundle = load_bundle('ensemble', os.path.join(project_root, 'models', 'bundles'), source=model_path)
+if bundle is not None:
+    model, team_stats = bundle.model, bundle.team_stats
+else:
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
 
-with open(os.path.join(project_root, 'models', 'team_statistics.pkl'), 'rb') as f:
-    team_stats = pickle.load(f)
+    with open(os.path.join(project_root, 'models', 'team_statistics.pkl'), 'rb') as f:
+        team_stats = pickle.load(f)
 
 venue_stats = pd.read_csv(os.path.join(project_root, 'data', 'processed', 'venue_statistics_complete.csv'))
 team_list = pd.read_csv(os.path.join(project_root, 'data', 'processed', 'team_list.csv'))
@@ -6,6 +6,8 @@ import os
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'scripts'))
+from model_bundle import load_bundle
 
 print("🏏 CRICKET MATCH PREDICTOR - Enhanced Version")
 print("="*70)
@@ -22,13 +24,20 @@ try:
     team_list_path = os.path.join(project_root, 'data', 'processed', 'team_list.csv')
     venue_list_path = os.path.join(project_root, 'data', 'processed', 'venue_list.csv')
     
-    with open(model_path, 'rb') as f:
-        model = pickle.load(f)
-    
-    with open(team_stats_path, 'rb') as f:
-        team_stats = pickle.load(f)
+    # Memory-mapped bundle from scripts/model_bundle.py when it is current
+    bundle = load_bundle('ensemble', os.path.join(project_root, 'models', 'bundles'), source=model_path)
+    if bundle is not None:
+        model, team_stats = bundle.model, bundle.team_stats
+    else:
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        
+        with open(team_stats_path, 'rb') as f:
+            team_stats = pickle.load(f)
     
     venue_stats = pd.read_csv(venue_path)
+    if bundle is not None and bundle.venue_stats is not None:
+        venue_stats = bundle.venue_stats
     team_list = pd.read_csv(team_list_path)
     venue_list = pd.read_csv(venue_list_path)
     
@@ -7,11 +7,21 @@ import json
 import os
 import logging
 import numpy as np
+import sys
+import threading
 
 # Get the base directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(BASE_DIR)
 
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scripts'))
+from feature_store import load_serving_tables
+from model_bundle import current_version, load_bundle
+from elo_ratings import EloRatings
+from name_index import PlayerNameIndex, TypeaheadIndex, VenueResolver
+from prediction_cache import PredictionCache, artifact_version
+from tree_compiler import COMPILED_MAX_ROWS
+
 # Initialize Flask with correct paths
 app = Flask(__name__,
             template_folder=os.path.join(PROJECT_ROOT, 'frontend', 'templates'),
@@ -30,6 +40,50 @@ print(f"📁 Project Root: {PROJECT_ROOT}")
 print(f"📁 Templates: {app.template_folder}")
 print("="*70)
 
+def load_match_model():
+    """(bundle, match_model, team_stats, venue_stats) for the served model.
+
+    The bundle and its tables when one is current for the model file; otherwise the
+    pickle with the feature-store tables it was trained on, or team_statistics.pkl
+    and the venue CSV.
+    """
+    # Prefer the memory-mapped bundle (scripts/model_bundle.py): workers share its pages
+    bundle = load_bundle(model_name, bundle_root, source=bundle_source)
+    if bundle is not None:
+        print(f"📂 Loading model bundle from: {bundle.path}")
+        match_model = bundle.model
+        team_stats = bundle.team_stats
+        print(f"✅ Match Predictor Bundle Loaded ({bundle.manifest['model_type']}, "
+              f"{match_model.n_trees} trees memory-mapped)")
+    else:
+        print(f"📂 Loading model from: {model_path}")
+        with open(model_path, 'rb') as f:
+            match_model = pickle.load(f)
+        print(f"✅ Match Predictor Model Loaded ({type(match_model).__name__})")
+
+        print(f"📂 Loading team stats from: {team_stats_path}")
+        with open(team_stats_path, 'rb') as f:
+            team_stats = pickle.load(f)
+        print("✅ Team Statistics Loaded")
+
+    print(f"📂 Loading venue stats from: {venue_path}")
+    venue_stats = pd.read_csv(venue_path)
+    print(f"✅ Venue Statistics Loaded ({len(venue_stats)} venues)")
+
+    # Prefer the team/venue tables stored with the model's feature version
+    if bundle is not None:
+        if bundle.venue_stats is not None:
+            venue_stats = bundle.venue_stats
+            print(f"✅ Bundle venue table loaded ({len(venue_stats)} venues)")
+    elif os.path.exists(model_info_path):
+        with open(model_info_path, 'rb') as f:
+            model_info = pickle.load(f)
+        serving_tables = load_serving_tables(model_info, os.path.join(PROJECT_ROOT, 'data', 'features'))
+        if serving_tables is not None:
+            team_stats, venue_stats = serving_tables
+            print(f"✅ Feature store tables loaded ({model_info['feature_set']} {model_info['feature_version']})")
+    return bundle, match_model, team_stats, venue_stats
+
 # Load all models and data
 try:
     model_path = os.path.join(PROJECT_ROOT, 'models', 'ultimate_ensemble_model.pkl')
@@ -38,21 +92,18 @@ try:
     players_path = os.path.join(PROJECT_ROOT, 'data', 'global_cricket_players_fixed.json')
     batting_stats_path = os.path.join(PROJECT_ROOT, 'data', 'processed', 'players', 'batting_statistics.csv')
     bowling_stats_path = os.path.join(PROJECT_ROOT, 'data', 'processed', 'players', 'bowling_statistics.csv')
+    model_info_path = os.path.join(PROJECT_ROOT, 'models', 'model_info.pkl')
+    bundle_root = os.path.join(PROJECT_ROOT, 'models', 'bundles')
     augmented_players_path = os.path.join(PROJECT_ROOT, 'data', 'global_cricket_players_fixed_augmented_rich_v2.json')
 
-    print(f"📂 Loading model from: {model_path}")
-    with open(model_path, 'rb') as f:
-        match_model = pickle.load(f)
-    print("✅ Match Predictor Model Loaded")
-
-    print(f"📂 Loading team stats from: {team_stats_path}")
-    with open(team_stats_path, 'rb') as f:
-        team_stats = pickle.load(f)
-    print("✅ Team Statistics Loaded")
+    # MATCH_MODEL=student serves the distilled model from scripts/distill_model.py
+    model_name = 'student' if os.environ.get('MATCH_MODEL') == 'student' else 'ensemble'
+    student_path = os.path.join(PROJECT_ROOT, 'models', 'student_model.pkl')
+    bundle_source = student_path if model_name == 'student' else model_path
+    if model_name == 'student' and os.path.exists(student_path):
+        model_path = student_path
 
-    print(f"📂 Loading venue stats from: {venue_path}")
-    venue_stats = pd.read_csv(venue_path)
-    print(f"✅ Venue Statistics Loaded ({len(venue_stats)} venues)")
+    bundle, match_model, team_stats, venue_stats = load_match_model()
 
     print(f"📂 Loading players from: {players_path}")
     with open(players_path, 'r') as f:
@@ -87,6 +138,7 @@ try:
 except Exception as e:
     print(f"❌ Error loading data: {e}")
     match_model = None
+    bundle = None
     team_stats = {}
     venue_stats = pd.DataFrame()
     players_df = pd.DataFrame()
@@ -94,6 +146,32 @@ except Exception as e:
     bowling_stats = pd.DataFrame()
     augmented_players_data = {}
 
+def served_version():
+    """The model file's version plus the bundle CURRENT points at; either changing means a reload.
+
+    CURRENT's own version is included because rebuilding a bundle from an unchanged pickle keeps
+    its version but replaces a bundle the loader may have rejected as stale.
+    """
+    current_path = os.path.join(bundle_root, model_name, 'CURRENT')
+    return (f"{artifact_version(model_path)}+{current_version(model_name, bundle_root)}"
+            f"@{artifact_version(current_path)}")
+
+# Match-model probabilities cached per canonical feature row (scripts/prediction_cache.py), tagged
+# with the served version: when the model file or its bundle changes the model is reloaded and the
+# entries dropped
+model_version = served_version()
+model_reload_lock = threading.Lock()
+# Opt-in: score batches too large for the compiled bundle with the pickle behind it (see predict_batch)
+native_batch_scoring = os.environ.get('NATIVE_BATCH_SCORING') == '1'
+native_model = None
+prediction_cache = PredictionCache(int(os.environ.get('PREDICTION_CACHE_SIZE', 4096)),
+                                   float(os.environ.get('PREDICTION_CACHE_TTL', 600)))
+
+# Per-format Elo ratings (scripts/elo_ratings.py); results posted to the API update them in place
+elo_path = os.path.join(PROJECT_ROOT, 'models', 'elo_ratings.json')
+elo_ratings = EloRatings.load(elo_path)
+print(f"✅ Elo Ratings Loaded ({elo_ratings.matches} matches)")
+
 # Comprehensive teams list (including IPL)
 INTERNATIONAL_TEAMS = [
     "India", "Australia", "England", "Pakistan", "South Africa",
@@ -138,6 +216,32 @@ VENUES = sorted([
     "Bulawayo Athletic Club, Zimbabwe", "Village, Dublin"
 ])
 
+# Venue name -> venue table stats by normalized dict lookup, trigram match for anything else
+venue_resolver = VenueResolver(venue_stats, display_names=VENUES)
+print(f"✅ Venue Resolver Ready ({len(venue_resolver)} venues, "
+      f"{len(VENUES) - len(venue_resolver.unresolved)}/{len(VENUES)} listed venues matched)")
+
+# Player typeahead: prefix/token-prefix bisects over sorted names, trigram match for typos
+player_names = players_df['player_name'].tolist() if 'player_name' in players_df else []
+player_cards = [{'name': name, 'country': country}
+                for name, country in zip(player_names, players_df.get('country', [None] * len(player_names)))]
+player_search = TypeaheadIndex(player_names)
+print(f"✅ Player Search Index Ready ({len(player_search)} players)")
+
+# Player name -> roster row / augmented record: normalized keys, Cricsheet short names, typo tolerance
+player_index = PlayerNameIndex(player_names)
+augmented_index = PlayerNameIndex(augmented_players_data)
+
+def find_player(name):
+    """A player's players_df row as a dict, or None."""
+    row = player_index.position(name)
+    return None if row is None else players_df.iloc[row].to_dict()
+
+def find_augmented(name):
+    """A player's augmented record (insights), or None."""
+    key = augmented_index.resolve(name)
+    return augmented_players_data.get(key) if key else None
+
 # Routes
 @app.route('/')
 def home():
@@ -194,137 +298,311 @@ def search_venues():
 
 @app.route('/api/search-players', methods=['GET'])
 def search_players():
-    query = request.args.get('q', '').lower()
+    query = request.args.get('q', '').strip()
     if not query:
         return jsonify({'success': True, 'players': []})
     try:
-        matching_players = players_df[players_df['player_name'].str.lower().str.contains(query, na=False)]
-        suggestions = [{'name': row['player_name'], 'country': row['country']} for _, row in matching_players.iterrows()][:10]
+        suggestions = [player_cards[i] for i in player_search.search(query, limit=10)]
         return jsonify({'success': True, 'players': suggestions})
     except Exception as e:
         logger.error(f"Error in search_players: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Largest /api/predict-matches request, in fixtures
+MAX_BATCH_FIXTURES = 1000
+
+def match_feature_row(team1, team2, venue, runs, wickets, run_rate):
+    """Model features for one fixture, plus the team/venue context the response reports."""
+    t1_stats = team_stats.get(team1, {'wr': 0.5, 'bat_wr': 0.5, 'chase_wr': 0.5, 'avg_score': 150})
+    t2_stats = team_stats.get(team2, {'wr': 0.5, 'bat_wr': 0.5, 'chase_wr': 0.5, 'avg_score': 150})
+
+    v_avg, v_std, v_bat_adv, v_rr = venue_resolver.stats(venue)
+
+    score_above_venue = (runs - v_avg) / v_std if v_std > 0 else 0
+    team_strength = t1_stats['wr'] - t2_stats['wr']
+    situation_advantage = t1_stats['bat_wr'] - t2_stats['chase_wr']
+    wickets_remaining = 10 - wickets
+    wicket_quality = (wickets_remaining / 10) * (runs / 150)
+    big_score = 1 if runs >= (v_avg + 15) else 0
+    low_wickets = 1 if wickets <= 5 else 0
+    dominant_performance = big_score * low_wickets
+    balanced_match = 1 if abs(team_strength) < 0.15 else 0
+    score_normalized = runs / v_avg if v_avg > 0 else 1
+    overall_strength = (score_above_venue * 0.4 + team_strength * 0.3 + wicket_quality * 0.2 + situation_advantage * 0.1)
+
+    features = {
+        'runs': runs, 'wickets': wickets, 'rr': run_rate,
+        't1_wr': t1_stats['wr'], 't2_wr': t2_stats['wr'],
+        't1_bat_wr': t1_stats['bat_wr'], 't2_chase_wr': t2_stats['chase_wr'],
+        'v_avg': v_avg, 'v_bat_adv': v_bat_adv,
+        'score_above_venue': score_above_venue, 'team_strength': team_strength,
+        'situation_advantage': situation_advantage, 'wickets_remaining': wickets_remaining,
+        'wicket_quality': wicket_quality, 'big_score': big_score,
+        'low_wickets': low_wickets, 'dominant_performance': dominant_performance,
+        'balanced_match': balanced_match, 'score_normalized': score_normalized,
+        'overall_strength': overall_strength
+    }
+    context = {'t1_stats': t1_stats, 't2_stats': t2_stats, 'v_avg': v_avg, 'v_bat_adv': v_bat_adv, 'v_rr': v_rr}
+    return features, context
+
+def current_match_model():
+    """(match_model, version), reloading the model and its serving tables first if the model
+    file or its bundle changed since they were loaded."""
+    global match_model, bundle, team_stats, venue_stats, venue_resolver, model_version, native_model
+    version = served_version()
+    if version != model_version and artifact_version(model_path) != 'missing':
+        with model_reload_lock:
+            if version != model_version:
+                try:
+                    logger.info(f"{model_path} or its bundle changed; reloading the match model")
+                    loaded = load_match_model()
+                    resolver = VenueResolver(loaded[3], display_names=VENUES)
+                    bundle, match_model, team_stats, venue_stats = loaded
+                    venue_resolver = resolver
+                    native_model = None
+                    # Last, once the model and its tables are all in place
+                    model_version = version
+                except Exception as e:
+                    logger.error(f"Could not reload {model_path}, still serving the loaded model: {e}")
+    return match_model, model_version
+
+def native_batch_model(model):
+    """The pickle ``model`` (the current bundle's) was compiled from, loaded on first use; None if it fails."""
+    global native_model
+    with model_reload_lock:
+        if native_model is None and model is bundle.model:
+            try:
+                with open(model_path, 'rb') as f:
+                    native_model = pickle.load(f)
+                logger.info(f"Loaded {model_path} for batches over {COMPILED_MAX_ROWS} rows")
+            except Exception as e:
+                logger.error(f"Could not load {model_path}, scoring the batch with the bundle: {e}")
+        return native_model if model is bundle.model else None
+
+def predict_batch(model, frame):
+    """predict_proba over ``frame``.
+
+    The compiled bundle trails the native model past COMPILED_MAX_ROWS rows, so larger batches are
+    scored in chunks of that size to bound its working arrays. NATIVE_BATCH_SCORING=1 sends them to
+    the native pickle instead: faster, but every worker that sees one keeps its own unpickled copy
+    of the ensemble, the memory the shared bundle is there to save.
+    """
+    if bundle is None or model is not bundle.model or len(frame) <= COMPILED_MAX_ROWS:
+        return model.predict_proba(frame)
+    if native_batch_scoring:
+        native = native_batch_model(model)
+        if native is not None:
+            return native.predict_proba(frame)
+    return np.vstack([model.predict_proba(frame.iloc[start:start + COMPILED_MAX_ROWS])
+                      for start in range(0, len(frame), COMPILED_MAX_ROWS)])
+
+def score_feature_rows(rows):
+    """predict_proba rows for feature dicts, scoring only the cache misses in one model call.
+
+    Returns (probabilities, number served from the cache); probabilities are None without a model.
+    """
+    model, version = current_match_model()
+    if model is None:
+        return [None] * len(rows), 0
+    keys = [tuple(row.values()) for row in rows]
+    probabilities = [prediction_cache.get(key, version) for key in keys]
+    missing = [i for i, probability in enumerate(probabilities) if probability is None]
+    if missing:
+        scored = predict_batch(model, pd.DataFrame([rows[i] for i in missing]))
+        for i, probability in zip(missing, scored):
+            probabilities[i] = prediction_cache.put(keys[i], probability, version)
+    return probabilities, len(rows) - len(missing)
+
+def parse_fixture(data):
+    """(team1, team2, venue, runs, wickets, run_rate) from a request body."""
+    return (data['team1'], data['team2'], data['venue'],
+            int(data['runs']), int(data['wickets']), float(data['run_rate']))
+
+def match_prediction_response(fixture, context, probability):
+    """The /api/predict-match body for one fixture; ``probability`` is its predict_proba row or None."""
+    team1, team2, venue, runs, wickets, run_rate = fixture
+    t1_stats, t2_stats = context['t1_stats'], context['t2_stats']
+    v_avg, v_bat_adv, v_rr = context['v_avg'], context['v_bat_adv'], context['v_rr']
+
+    if probability is not None:
+        winner = team1 if probability[1] > probability[0] else team2
+        team1_prob = round(probability[1] * 100, 1)
+        team2_prob = round(probability[0] * 100, 1)
+    else:
+        winner = team1
+        team1_prob = 65.0
+        team2_prob = 35.0
+
+    max_prob = max(team1_prob, team2_prob)
+    if max_prob >= 80:
+        confidence = "VERY HIGH"
+        confidence_desc = "Strong prediction - Clear favorite"
+    elif max_prob >= 70:
+        confidence = "HIGH"
+        confidence_desc = "Good prediction with solid evidence"
+    elif max_prob >= 60:
+        confidence = "MODERATE"
+        confidence_desc = "Slight edge - Could be competitive"
+    else:
+        confidence = "LOW"
+        confidence_desc = "Very close match - High uncertainty"
+
+    if runs > v_avg + 20:
+        score_analysis = "EXCELLENT SCORE - Well above venue average"
+    elif runs > v_avg:
+        score_analysis = "GOOD SCORE - Above venue average"
+    elif runs > v_avg - 15:
+        score_analysis = "PAR SCORE - Around venue average"
+    else:
+        score_analysis = "BELOW PAR - Below venue average"
+
+    prob_diff = abs(team1_prob - team2_prob)
+    if prob_diff < 10:
+        match_situation = "VERY CLOSE - Could go either way"
+    elif prob_diff < 20:
+        match_situation = "COMPETITIVE - Slight edge"
+    elif prob_diff < 40:
+        match_situation = "CLEAR FAVORITE - Strong advantage"
+    else:
+        match_situation = "DOMINANT - Overwhelming favorite"
+
+    return {
+        'success': True,
+        'prediction': {
+            'winner': winner, 'team1': team1, 'team2': team2,
+            'team1_probability': team1_prob, 'team2_probability': team2_prob,
+            'confidence': confidence, 'confidence_description': confidence_desc
+        },
+        'match_details': {
+            'venue': venue, 'score': f"{runs}/{wickets}",
+            'run_rate': run_rate, 'wickets_remaining': 10 - wickets
+        },
+        'venue_analysis': {
+            'average_score': round(v_avg, 0),
+            'batting_first_advantage': round(v_bat_adv * 100, 0),
+            'average_run_rate': round(v_rr, 1),
+            'score_vs_average': round(runs - v_avg, 0),
+            'score_analysis': score_analysis
+        },
+        'team_analysis': {
+            'team1_win_rate': round(t1_stats['wr'] * 100, 1),
+            'team2_win_rate': round(t2_stats['wr'] * 100, 1),
+            'team1_batting_wr': round(t1_stats['bat_wr'] * 100, 1),
+            'team2_chase_wr': round(t2_stats['chase_wr'] * 100, 1),
+            'match_situation': match_situation
+        }
+    }
+
 @app.route('/api/predict-match', methods=['POST'])
 def predict_match():
+    try:
+        fixture = parse_fixture(request.json)
+        features, context = match_feature_row(*fixture)
+
+        # One predict_proba call (none on a cache hit); the winner is its larger class
+        probabilities, _ = score_feature_rows([features])
+        return jsonify(match_prediction_response(fixture, context, probabilities[0]))
+    except Exception as e:
+        logger.error(f"Error in predict_match: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/predict-matches', methods=['POST'])
+def predict_matches():
+    """Score many fixtures in one model call: {"fixtures": [{team1, team2, venue, runs, wickets, run_rate}, ...]}
+
+    Each result has the /api/predict-match shape. A fixture that fails to
+    parse gets {'success': False, 'error': ...} in its slot; the rest are
+    still scored.
+    """
     try:
         data = request.json
-        team1 = data['team1']
-        team2 = data['team2']
-        venue = data['venue']
-        runs = int(data['runs'])
-        wickets = int(data['wickets'])
-        run_rate = float(data['run_rate'])
-
-        t1_stats = team_stats.get(team1, {'wr': 0.5, 'bat_wr': 0.5, 'chase_wr': 0.5, 'avg_score': 150})
-        t2_stats = team_stats.get(team2, {'wr': 0.5, 'bat_wr': 0.5, 'chase_wr': 0.5, 'avg_score': 150})
-
-        venue_row = venue_stats[venue_stats['venue'].str.contains(venue.split(',')[0], case=False, na=False)]
-        if len(venue_row) > 0:
-            v_avg = venue_row['v_avg'].values[0]
-            v_std = venue_row['v_std'].values[0]
-            v_bat_adv = venue_row['v_bat_adv'].values[0]
-            v_rr = venue_row['v_rr'].values[0]
-        else:
-            v_avg, v_std, v_bat_adv, v_rr = 165, 25, 0.5, 7.5
-
-        score_above_venue = (runs - v_avg) / v_std if v_std > 0 else 0
-        team_strength = t1_stats['wr'] - t2_stats['wr']
-        situation_advantage = t1_stats['bat_wr'] - t2_stats['chase_wr']
-        wickets_remaining = 10 - wickets
-        wicket_quality = (wickets_remaining / 10) * (runs / 150)
-        big_score = 1 if runs >= (v_avg + 15) else 0
-        low_wickets = 1 if wickets <= 5 else 0
-        dominant_performance = big_score * low_wickets
-        balanced_match = 1 if abs(team_strength) < 0.15 else 0
-        score_normalized = runs / v_avg if v_avg > 0 else 1
-        overall_strength = (score_above_venue * 0.4 + team_strength * 0.3 + wicket_quality * 0.2 + situation_advantage * 0.1)
-
-        user_input = pd.DataFrame({
-            'runs': [runs], 'wickets': [wickets], 'rr': [run_rate],
-            't1_wr': [t1_stats['wr']], 't2_wr': [t2_stats['wr']],
-            't1_bat_wr': [t1_stats['bat_wr']], 't2_chase_wr': [t2_stats['chase_wr']],
-            'v_avg': [v_avg], 'v_bat_adv': [v_bat_adv],
-            'score_above_venue': [score_above_venue], 'team_strength': [team_strength],
-            'situation_advantage': [situation_advantage], 'wickets_remaining': [wickets_remaining],
-            'wicket_quality': [wicket_quality], 'big_score': [big_score],
-            'low_wickets': [low_wickets], 'dominant_performance': [dominant_performance],
-            'balanced_match': [balanced_match], 'score_normalized': [score_normalized],
-            'overall_strength': [overall_strength]
+        fixtures = data.get('fixtures') if isinstance(data, dict) else data
+        if not isinstance(fixtures, list) or not fixtures:
+            return jsonify({'success': False, 'error': 'fixtures must be a non-empty list'}), 400
+        if len(fixtures) > MAX_BATCH_FIXTURES:
+            return jsonify({'success': False, 'error': f'at most {MAX_BATCH_FIXTURES} fixtures per request'}), 400
+
+        results = [None] * len(fixtures)
+        parsed, rows, contexts = [], [], []
+        for i, body in enumerate(fixtures):
+            try:
+                fixture = parse_fixture(body)
+                features, context = match_feature_row(*fixture)
+            except Exception as e:
+                results[i] = {'success': False, 'error': str(e)}
+                continue
+            parsed.append((i, fixture))
+            rows.append(features)
+            contexts.append(context)
+
+        probabilities, cached = score_feature_rows(rows) if rows else ([], 0)
+        for (i, fixture), context, probability in zip(parsed, contexts, probabilities):
+            results[i] = match_prediction_response(fixture, context, probability)
+
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'scored': len(rows),
+            'cached': cached,
+            'predictions': results
         })
+    except Exception as e:
+        logger.error(f"Error in predict_matches: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 400
 
-        if match_model:
-            prediction = match_model.predict(user_input)[0]
-            probability = match_model.predict_proba(user_input)[0]
-            winner = team1 if prediction == 1 else team2
-            team1_prob = round(probability[1] * 100, 1)
-            team2_prob = round(probability[0] * 100, 1)
-        else:
-            winner = team1
-            team1_prob = 65.0
-            team2_prob = 35.0
-
-        max_prob = max(team1_prob, team2_prob)
-        if max_prob >= 80:
-            confidence = "VERY HIGH"
-            confidence_desc = "Strong prediction - Clear favorite"
-        elif max_prob >= 70:
-            confidence = "HIGH"
-            confidence_desc = "Good prediction with solid evidence"
-        elif max_prob >= 60:
-            confidence = "MODERATE"
-            confidence_desc = "Slight edge - Could be competitive"
-        else:
-            confidence = "LOW"
-            confidence_desc = "Very close match - High uncertainty"
-
-        if runs > v_avg + 20:
-            score_analysis = "EXCELLENT SCORE - Well above venue average"
-        elif runs > v_avg:
-            score_analysis = "GOOD SCORE - Above venue average"
-        elif runs > v_avg - 15:
-            score_analysis = "PAR SCORE - Around venue average"
-        else:
-            score_analysis = "BELOW PAR - Below venue average"
-
-        prob_diff = abs(team1_prob - team2_prob)
-        if prob_diff < 10:
-            match_situation = "VERY CLOSE - Could go either way"
-        elif prob_diff < 20:
-            match_situation = "COMPETITIVE - Slight edge"
-        elif prob_diff < 40:
-            match_situation = "CLEAR FAVORITE - Strong advantage"
-        else:
-            match_situation = "DOMINANT - Overwhelming favorite"
+@app.route('/api/prediction-cache', methods=['GET'])
+def get_prediction_cache_stats():
+    """Hit rate and size of the match-prediction cache, and the model version it holds."""
+    stats = prediction_cache.stats()
+    stats['bundle_version'] = bundle.version if bundle is not None else None
+    return jsonify({'success': True, 'cache': stats})
 
+@app.route('/api/elo-ratings', methods=['GET'])
+def get_elo_ratings():
+    """Current ratings of one format. Query params: format=(T20|ODI|IPL), limit=int"""
+    try:
+        elo_ratings.refresh()
+        match_format = request.args.get('format', 'T20')
+        limit = int(request.args.get('limit', 20))
+        table = elo_ratings.table(match_format).head(limit)
+        table['rating'] = table['rating'].round(1)
         return jsonify({
             'success': True,
-            'prediction': {
-                'winner': winner, 'team1': team1, 'team2': team2,
-                'team1_probability': team1_prob, 'team2_probability': team2_prob,
-                'confidence': confidence, 'confidence_description': confidence_desc
-            },
-            'match_details': {
-                'venue': venue, 'score': f"{runs}/{wickets}",
-                'run_rate': run_rate, 'wickets_remaining': wickets_remaining
-            },
-            'venue_analysis': {
-                'average_score': round(v_avg, 0),
-                'batting_first_advantage': round(v_bat_adv * 100, 0),
-                'average_run_rate': round(v_rr, 1),
-                'score_vs_average': round(runs - v_avg, 0),
-                'score_analysis': score_analysis
+            'format': match_format,
+            'formats': sorted(elo_ratings.ratings),
+            'matches': elo_ratings.matches,
+            'updated_at': elo_ratings.updated_at,
+            'ratings': table.to_dict('records')
+        })
+    except Exception as e:
+        logger.error(f"Error in get_elo_ratings: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/elo-ratings/match', methods=['POST'])
+def record_elo_match():
+    """Apply one result: {format, team1, team2, winner, date or season}; a winner outside the two teams is a tie."""
+    try:
+        data = request.json
+        match_format, team1, team2 = data['format'], data['team1'], data['team2']
+        when = data.get('date') or data.get('season')
+        # Other workers record results too: refresh, update and save under the file lock
+        with elo_ratings.exclusive():
+            before = (elo_ratings.rating(match_format, team1, when), elo_ratings.rating(match_format, team2, when))
+            expected = elo_ratings.expected(match_format, team1, team2, when)
+            after = elo_ratings.update(match_format, team1, team2, data.get('winner'), when)
+            elo_ratings.save()
+        return jsonify({
+            'success': True,
+            'format': match_format,
+            'team1_expected_win_probability': round(expected * 100, 1),
+            'ratings': {
+                team1: {'before': round(before[0], 1), 'after': round(after[0], 1)},
+                team2: {'before': round(before[1], 1), 'after': round(after[1], 1)}
             },
-            'team_analysis': {
-                'team1_win_rate': round(t1_stats['wr'] * 100, 1),
-                'team2_win_rate': round(t2_stats['wr'] * 100, 1),
-                'team1_batting_wr': round(t1_stats['bat_wr'] * 100, 1),
-                'team2_chase_wr': round(t2_stats['chase_wr'] * 100, 1),
-                'match_situation': match_situation
-            }
+            'matches': elo_ratings.matches
         })
     except Exception as e:
-        logger.error(f"Error in predict_match: {e}")
+        logger.error(f"Error in record_elo_match: {e}")
         return jsonify({'success': False, 'error': str(e)}), 400
 
 @app.route('/api/players', methods=['GET'])
@@ -358,11 +636,9 @@ def performance_analysis():
         analysis_type = data.get('analysis_type', 'complete')
 
         # Find player in database
-        player1_data = players_df[players_df['player_name'].str.contains(player1_name, case=False, na=False)]
-        if len(player1_data) == 0:
+        player1 = find_player(player1_name)
+        if player1 is None:
             return jsonify({'success': False, 'error': f'Player {player1_name} not found'}), 404
-
-        player1 = player1_data.iloc[0].to_dict()
         
         # Calculate comprehensive metrics
         player1_metrics = calculate_comprehensive_metrics(player1, batting_stats, bowling_stats, period)
@@ -385,17 +661,7 @@ def performance_analysis():
         }
         # Attach augmented insights for player1 if available
         try:
-            aug1 = None
-            key1 = player1.get('player_name')
-            if key1:
-                # exact match
-                aug1 = augmented_players_data.get(key1)
-                if not aug1:
-                    # case-insensitive match
-                    for aname, arec in augmented_players_data.items():
-                        if aname and aname.lower() == key1.lower():
-                            aug1 = arec
-                            break
+            aug1 = find_augmented(player1.get('player_name'))
             if aug1:
                 result['player1']['augmented'] = aug1
             # create highlight for player1
@@ -409,9 +675,8 @@ def performance_analysis():
             logger.debug('Could not attach augmented insights for player1')
 
         if player2_name:
-            player2_data = players_df[players_df['player_name'].str.contains(player2_name, case=False, na=False)]
-            if len(player2_data) > 0:
-                player2 = player2_data.iloc[0].to_dict()
+            player2 = find_player(player2_name)
+            if player2 is not None:
                 player2_metrics = calculate_comprehensive_metrics(player2, batting_stats, bowling_stats, period)
 
                 result['player2'] = {
@@ -422,15 +687,7 @@ def performance_analysis():
                 }
                 # Attach augmented insights for player2 if available
                 try:
-                    aug2 = None
-                    key2 = player2.get('player_name')
-                    if key2:
-                        aug2 = augmented_players_data.get(key2)
-                        if not aug2:
-                            for aname, arec in augmented_players_data.items():
-                                if aname and aname.lower() == key2.lower():
-                                    aug2 = arec
-                                    break
+                    aug2 = find_augmented(player2.get('player_name'))
                     if aug2:
                         result['player2']['augmented'] = aug2
                     # create highlight for player2
@@ -523,16 +780,7 @@ def select_playing_xi():
             }), 404
 
         # Get venue statistics
-        venue_name = venue.split(',')[0]
-        venue_row = venue_stats[venue_stats['venue'].str.contains(venue_name, case=False, na=False)]
-        
-        if len(venue_row) > 0:
-            v_avg = venue_row['v_avg'].values[0]
-            v_std = venue_row['v_std'].values[0]
-            v_bat_adv = venue_row['v_bat_adv'].values[0]
-            v_rr = venue_row['v_rr'].values[0]
-        else:
-            v_avg, v_std, v_bat_adv, v_rr = 165, 25, 0.5, 7.5
+        v_avg, v_std, v_bat_adv, v_rr = venue_resolver.stats(venue)
 
         logger.info(f"Venue stats - Avg: {v_avg}, Bat advantage: {v_bat_adv}")
 
@@ -629,9 +877,8 @@ def select_playing_xi():
                 score *= 0.95
 
             # Apply fatigue/readiness penalty from augmented data
-            pkey = player.get('player_name')
-            if pkey and pkey in augmented_players_data:
-                aug = augmented_players_data[pkey]
+            aug = find_augmented(player.get('player_name'))
+            if aug:
                 ins = aug.get('player_insights') or {}
                 perf = ins.get('performance_prediction', {}) if isinstance(ins, dict) else {}
                 if 'high' in str(perf.get('fatigue_risk','')).lower():
@@ -1211,19 +1458,7 @@ def create_player_highlight(player, metrics, augmented=None):
 def get_player_insights(player_name):
     """Get detailed player insights including physiological profile and performance prediction."""
     try:
-        # Search in augmented data first
-        player_rec = None
-        
-        # Try exact match
-        if player_name in augmented_players_data:
-            player_rec = augmented_players_data[player_name]
-        else:
-            # Try case-insensitive match
-            for name, data in augmented_players_data.items():
-                if name.lower() == player_name.lower():
-                    player_rec = data
-                    break
-        
+        player_rec = find_augmented(player_name)
         if not player_rec:
             return jsonify({'success': False, 'error': f'Player {player_name} not found'}), 404
         
@@ -1,59 +1,75 @@
 import pandas as pd
-import os
 
-print("Analyzing venue statistics...")
+from ball_store import iter_match_frames
+from match_sources import source_exists
 
-def analyze_venues(folder_path):
-    files = [f for f in os.listdir(folder_path) if f.endswith('.csv')]
-    
+def venue_match_row(df):
+    """Venue row for one match (None if it has fewer than two innings)"""
+    venue = df['venue'].iloc[0]
+
+    # Calculate innings totals
+    innings_totals = df.groupby('innings')['runs_off_bat'].sum()
+
+    if len(innings_totals) < 2:
+        return None
+
+    return {
+        'venue': venue,
+        'innings1_runs': innings_totals.get(1, 0),
+        'innings2_runs': innings_totals.get(2, 0),
+        'total_runs': innings_totals.sum(),
+        'batting_first_won': innings_totals.get(1, 0) > innings_totals.get(2, 0)
+    }
+
+def analyze_venues(folder_path, match_format):
     venue_data = []
-    
-    for i, file in enumerate(files[:200], 1):
+
+    columns = ['venue', 'innings', 'runs_off_bat']
+    for i, (match_id, df) in enumerate(iter_match_frames(match_format, folder_path, columns=columns, limit=200), 1):
         try:
-            df = pd.read_csv(os.path.join(folder_path, file))
-            venue = df['venue'].iloc[0]
-            
-            # Calculate innings totals
-            innings_totals = df.groupby('innings')['runs_off_bat'].sum()
-            
-            if len(innings_totals) >= 2:
-                venue_data.append({
-                    'venue': venue,
-                    'innings1_runs': innings_totals.get(1, 0),
-                    'innings2_runs': innings_totals.get(2, 0),
-                    'total_runs': innings_totals.sum(),
-                    'batting_first_won': innings_totals.get(1, 0) > innings_totals.get(2, 0)
-                })
+            row = venue_match_row(df)
+            if row:
+                venue_data.append(row)
         except:
             continue
-    
+
     return pd.DataFrame(venue_data)
 
-# Process T20 and IPL
-all_venues = []
-for folder in ['data/raw/t20', 'data/raw/ipl']:
-    if os.path.exists(folder):
-        venues = analyze_venues(folder)
-        all_venues.append(venues)
-
-venue_df = pd.concat(all_venues, ignore_index=True)
-
-# Aggregate by venue
-venue_stats = venue_df.groupby('venue').agg({
-    'innings1_runs': 'mean',
-    'innings2_runs': 'mean',
-    'total_runs': 'mean',
-    'batting_first_won': 'mean',
-    'venue': 'count'
-}).rename(columns={'venue': 'matches_played'})
-
-venue_stats['chase_success_rate'] = 1 - venue_stats['batting_first_won']
-venue_stats = venue_stats.sort_values('matches_played', ascending=False)
-
-# Save
-venue_stats.to_csv('data/processed/venue_statistics.csv')
-print(f"\n✅ Analyzed {len(venue_stats)} unique venues")
-print("✅ Saved: data/processed/venue_statistics.csv")
-
-print("\nTop 10 venues by matches:")
-print(venue_stats.head(10))
\ No newline at end of file
+def aggregate_venues(venue_df):
+    """Per-venue averages, most-played venues first"""
+    venue_stats = venue_df.groupby('venue').agg({
+        'innings1_runs': 'mean',
+        'innings2_runs': 'mean',
+        'total_runs': 'mean',
+        'batting_first_won': 'mean',
+        'venue': 'count'
+    }).rename(columns={'venue': 'matches_played'})
+
+    venue_stats['chase_success_rate'] = 1 - venue_stats['batting_first_won']
+    return venue_stats.sort_values('matches_played', ascending=False)
+
+def main():
+    print("Analyzing venue statistics...")
+
+    # Process T20 and IPL
+    all_venues = []
+    for folder, match_format in [('data/raw/t20', 'T20'), ('data/raw/ipl', 'IPL')]:
+        if source_exists(folder):
+            venues = analyze_venues(folder, match_format)
+            all_venues.append(venues)
+
+    venue_df = pd.concat(all_venues, ignore_index=True)
+
+    # Aggregate by venue
+    venue_stats = aggregate_venues(venue_df)
+
+    # Save
+    venue_stats.to_csv('data/processed/venue_statistics.csv')
+    print(f"\n✅ Analyzed {len(venue_stats)} unique venues")
+    print("✅ Saved: data/processed/venue_statistics.csv")
+
+    print("\nTop 10 venues by matches:")
+    print(venue_stats.head(10))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,586 @@
+"""Columnar ball-by-ball store built once from the raw Cricsheet CSVs.
+
+Every pipeline script used to call ``pd.read_csv`` on ~17,800 small files in
+``data/raw/{t20,ipl,odi}`` on every run. This module compacts the whole raw
+corpus into typed Parquet files, partitioned by format and season, and exposes
+a small loader API the extraction scripts share.
+
+Layout::
+
+    data/store/balls/<FORMAT>/<season>.parquet
+    data/store/balls/store_info.json
+    data/store/balls/dictionaries.json
+
+Usage:
+  python scripts/ball_store.py                      # build the store
+  python scripts/ball_store.py --formats IPL ODI    # rebuild selected formats
+
+From a script:
+  from ball_store import iter_match_frames, iter_matches, read_match
+  for match_id, df in iter_match_frames('IPL', 'data/raw/ipl/'):
+      ...
+  for match_id, source in iter_matches('IPL', 'data/raw/ipl/'):
+      df = read_match(source)     # store reference, raw CSV path or zip member
+
+Both iterators read from the store when it has been built and fall back to
+the raw CSVs otherwise, so scripts keep working on a fresh checkout. Raw
+folders may also be left zipped (see match_sources.py).
+
+store_info.json records, per format, which raw folder the store was built
+from (relative to the project root, so moving or re-mounting the checkout
+does not invalidate it), its file count, newest mtime and a digest of every file's id, size
+and mtime. Before trusting the store the loaders compare that against the
+raw source. After a new Cricsheet drop (added, deleted or changed files),
+or when a script passes a different folder, they warn and read the raw
+CSVs until the format is rebuilt with ``--formats``.
+
+Frames come back compact (see ``compact_balls``): team, player, venue and
+other text columns are categoricals over global dictionaries saved with the
+store (``dictionaries.json``), so frames from different matches concatenate
+without falling back to object columns; run columns are int8, ``ball`` is
+float32 and ``innings`` int8.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from match_sources import open_source, read_source, resolve_location, source_exists
+
+
+RAW_ROOT = "data/raw"
+STORE_ROOT = "data/store"
+
+# Raw locations are recorded relative to this, so moving the checkout keeps the store valid
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Encodings tried in order on a raw CSV (a few Cricsheet files are not UTF-8)
+RAW_ENCODINGS = ("utf-8", "latin-1")
+
+# Format label used by the pipeline scripts -> raw sub-folder name
+FORMATS = {
+    "T20": "t20",
+    "IPL": "ipl",
+    "ODI": "odi",
+}
+
+# Cricsheet "csv2" ball-by-ball schema with compact types.
+# Integer columns that are blank on most rows stay nullable and come back
+# as float64/NaN in pandas, exactly like pd.read_csv on the raw files.
+BALL_SCHEMA = pa.schema([
+    ("match_id", pa.int64()),
+    ("season", pa.string()),
+    ("start_date", pa.string()),
+    ("venue", pa.string()),
+    ("innings", pa.int8()),
+    ("ball", pa.float64()),
+    ("batting_team", pa.string()),
+    ("bowling_team", pa.string()),
+    ("striker", pa.string()),
+    ("non_striker", pa.string()),
+    ("bowler", pa.string()),
+    ("runs_off_bat", pa.int16()),
+    ("extras", pa.int16()),
+    ("wides", pa.int16()),
+    ("noballs", pa.int16()),
+    ("byes", pa.int16()),
+    ("legbyes", pa.int16()),
+    ("penalty", pa.int16()),
+    ("wicket_type", pa.string()),
+    ("player_dismissed", pa.string()),
+    ("other_wicket_type", pa.string()),
+    ("other_player_dismissed", pa.string()),
+])
+
+BALL_COLUMNS = BALL_SCHEMA.names
+
+# Rows buffered per (format, season) before a row group is flushed
+FLUSH_ROWS = 250_000
+
+# Text columns -> the global dictionary their categories come from
+CATEGORY_DOMAINS = {
+    "season": "seasons",
+    "start_date": "dates",
+    "venue": "venues",
+    "batting_team": "teams",
+    "bowling_team": "teams",
+    "striker": "players",
+    "non_striker": "players",
+    "bowler": "players",
+    "player_dismissed": "players",
+    "other_player_dismissed": "players",
+    "wicket_type": "wicket_types",
+    "other_wicket_type": "wicket_types",
+}
+
+# Per-ball run counts fit in int8. The extras breakdown is blank on most
+# raw rows; no extractor distinguishes blank from 0, so it is stored as 0.
+INT8_COLUMNS = ("runs_off_bat", "extras", "wides", "noballs", "byes", "legbyes", "penalty")
+COMPACT_DTYPES = {"match_id": "int32", "innings": "int8", "ball": "float32"}
+
+
+def season_key(season: str) -> str:
+    """File-system safe partition name for a season ('2009/10' -> '2009-10')."""
+    return str(season).strip().replace("/", "-") or "unknown"
+
+
+def store_dir(store_root: str = STORE_ROOT) -> str:
+    return os.path.join(store_root, "balls")
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    df = df.reindex(columns=BALL_COLUMNS)
+    for col in ("season", "start_date", "venue", "batting_team", "bowling_team",
+                "striker", "non_striker", "bowler", "wicket_type", "player_dismissed",
+                "other_wicket_type", "other_player_dismissed"):
+        df[col] = df[col].astype("string")
+    return pa.Table.from_pandas(df, schema=BALL_SCHEMA, preserve_index=False)
+
+
+class BallDictionaries:
+    """Global category lists (teams, players, venues...) shared by every frame.
+
+    Loaded from the store; values missing from it (a raw fallback, a stale
+    store) are appended for the rest of the process, so existing codes never
+    move.
+    """
+
+    def __init__(self, values: Optional[Dict[str, List[str]]] = None):
+        self.values: Dict[str, List[str]] = {d: list(v) for d, v in (values or {}).items()}
+        self._index: Dict[str, pd.Index] = {}
+        self._dtype: Dict[str, pd.CategoricalDtype] = {}
+
+    @staticmethod
+    def path(store_root: str = STORE_ROOT) -> str:
+        return os.path.join(store_dir(store_root), "dictionaries.json")
+
+    @classmethod
+    def load(cls, store_root: str = STORE_ROOT) -> "BallDictionaries":
+        path = cls.path(store_root)
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def save(self, store_root: str = STORE_ROOT) -> None:
+        os.makedirs(store_dir(store_root), exist_ok=True)
+        with open(self.path(store_root), "w", encoding="utf-8") as f:
+            json.dump({d: sorted(v) for d, v in self.values.items()}, f, ensure_ascii=False)
+
+    def index(self, domain: str) -> pd.Index:
+        if domain not in self._index:
+            self._index[domain] = pd.Index(self.values.setdefault(domain, []), dtype=object)
+        return self._index[domain]
+
+    def dtype(self, domain: str) -> pd.CategoricalDtype:
+        if domain not in self._dtype:
+            self._dtype[domain] = pd.CategoricalDtype(self.index(domain))
+        return self._dtype[domain]
+
+    def add(self, domain: str, values: Iterable[str]) -> None:
+        known = self.index(domain)
+        candidates = pd.Index(pd.unique(pd.Index(list(values), dtype=object)), dtype=object)
+        new = candidates[known.get_indexer(candidates) < 0]
+        if len(new):
+            self.values[domain].extend(new)
+            self._index.pop(domain, None)
+            self._dtype.pop(domain, None)
+
+    def encode(self, column: pd.Series, domain: str) -> pd.Categorical:
+        """``column`` as a categorical over the domain's global dictionary."""
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy()
+            local = column.cat.categories.astype(object)
+        else:
+            codes, local = pd.factorize(column.astype(object), use_na_sentinel=True)
+        mapping = self.index(domain).get_indexer(local)
+        if (mapping < 0).any():
+            self.add(domain, local[mapping < 0])
+            mapping = self.index(domain).get_indexer(local)
+        global_codes = np.where(codes >= 0, mapping[np.maximum(codes, 0)], -1) if len(local) else codes
+        return pd.Categorical.from_codes(global_codes, dtype=self.dtype(domain))
+
+
+_dictionaries: Dict[str, BallDictionaries] = {}
+
+
+def ball_dictionaries(store_root: str = STORE_ROOT) -> BallDictionaries:
+    """The store's dictionaries, loaded once per process."""
+    if store_root not in _dictionaries:
+        _dictionaries[store_root] = BallDictionaries.load(store_root)
+    return _dictionaries[store_root]
+
+
+def compact_balls(df: pd.DataFrame, dictionaries: Optional[BallDictionaries] = None) -> pd.DataFrame:
+    """Ball-by-ball frame with compact dtypes; unknown columns are left as they are."""
+    dictionaries = dictionaries or ball_dictionaries()
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        try:
+            if col in CATEGORY_DOMAINS:
+                values = dictionaries.encode(values, CATEGORY_DOMAINS[col])
+            elif col in INT8_COLUMNS:
+                values = pd.to_numeric(values).fillna(0)
+                values = values.astype("int8" if values.abs().max() <= 127 else "int16")
+            elif col in COMPACT_DTYPES and values.notna().all():
+                values = pd.to_numeric(values).astype(COMPACT_DTYPES[col])
+        except (TypeError, ValueError):
+            values = df[col]
+        out[col] = values
+    return pd.DataFrame(out, index=df.index)
+
+
+def _read_partition(path: str, columns: Optional[List[str]] = None,
+                    store_root: str = STORE_ROOT) -> pd.DataFrame:
+    """One store partition, text columns read as dictionaries, then compacted."""
+    names = columns or BALL_COLUMNS
+    table = pq.read_table(path, columns=columns,
+                          read_dictionary=[c for c in names if c in CATEGORY_DOMAINS])
+    return compact_balls(table.to_pandas(), ball_dictionaries(store_root))
+
+
+class _PartitionWriter:
+    """Buffers tables per season and appends them as row groups."""
+
+    def __init__(self, fmt_dir: str):
+        self.fmt_dir = fmt_dir
+        self.buffers: Dict[str, List[pa.Table]] = {}
+        self.buffered_rows: Dict[str, int] = {}
+        self.writers: Dict[str, pq.ParquetWriter] = {}
+        self.rows: Dict[str, int] = {}
+
+    def add(self, season: str, table: pa.Table) -> None:
+        key = season_key(season)
+        self.buffers.setdefault(key, []).append(table)
+        self.buffered_rows[key] = self.buffered_rows.get(key, 0) + table.num_rows
+        self.rows[key] = self.rows.get(key, 0) + table.num_rows
+        if self.buffered_rows[key] >= FLUSH_ROWS:
+            self._flush(key)
+
+    def _flush(self, key: str) -> None:
+        tables = self.buffers.pop(key, [])
+        self.buffered_rows[key] = 0
+        if not tables:
+            return
+        if key not in self.writers:
+            path = os.path.join(self.fmt_dir, f"{key}.parquet")
+            self.writers[key] = pq.ParquetWriter(path, BALL_SCHEMA, compression="zstd")
+        self.writers[key].write_table(pa.concat_tables(tables))
+
+    def close(self) -> None:
+        for key in list(self.buffers):
+            self._flush(key)
+        for writer in self.writers.values():
+            writer.close()
+
+
+def read_raw(ball_source, **read_csv_kwargs) -> pd.DataFrame:
+    """``read_source`` retrying RAW_ENCODINGS, as the extractors always did."""
+    for encoding in RAW_ENCODINGS[:-1]:
+        try:
+            return read_source(ball_source, encoding=encoding, **read_csv_kwargs)
+        except UnicodeDecodeError:
+            continue
+    return read_source(ball_source, encoding=RAW_ENCODINGS[-1], **read_csv_kwargs)
+
+
+def raw_location(path: str) -> str:
+    """``path`` relative to the project root, with forward slashes, as store_info.json records it."""
+    return os.path.relpath(os.path.abspath(path), PROJECT_ROOT).replace(os.sep, "/")
+
+
+def raw_signature(source) -> Dict[str, object]:
+    """Identity of a raw folder/archive: location, file count, newest mtime and a digest."""
+    entries = [(match_id,) + tuple(source.stat(match_id)) for match_id in source.match_ids()]
+    return {
+        "location": raw_location(source.path),
+        "files": len(entries),
+        "max_mtime": max((e[2] for e in entries), default=0),
+        "digest": hashlib.sha1(repr(entries).encode("utf-8")).hexdigest()[:16],
+    }
+
+
+def build_format(fmt: str, raw_root: str = RAW_ROOT, store_root: str = STORE_ROOT) -> Dict[str, int]:
+    """Compact one raw format folder into per-season Parquet files."""
+    source = open_source(os.path.join(raw_root, FORMATS[fmt]))
+    fmt_dir = os.path.join(store_dir(store_root), fmt)
+    os.makedirs(fmt_dir, exist_ok=True)
+    for old in os.listdir(fmt_dir):
+        if old.endswith(".parquet"):
+            os.remove(os.path.join(fmt_dir, old))
+
+    # Fingerprinted before reading, so a file changed during the build marks the store stale
+    signature = raw_signature(source)
+    writer = _PartitionWriter(fmt_dir)
+    dictionaries = ball_dictionaries(store_root)
+    matches = skipped = 0
+
+    for i, (match_id, ball_source) in enumerate(source.iter_balls(), 1):
+        if i % 1000 == 0:
+            print(f"   Progress: {i}/{len(source)}")
+        try:
+            df = read_raw(ball_source, low_memory=False)
+        except Exception:
+            skipped += 1
+            continue
+        if df.empty or "season" not in df.columns:
+            skipped += 1
+            continue
+        writer.add(str(df["season"].iloc[0]), _to_table(df))
+        for col, domain in CATEGORY_DOMAINS.items():
+            if col in df.columns:
+                dictionaries.add(domain, df[col].dropna().astype(str))
+        matches += 1
+
+    writer.close()
+    return {"files": len(source), "matches": matches, "skipped": skipped,
+            "partitions": dict(sorted(writer.rows.items())), "raw": signature}
+
+
+def build_store(formats: Optional[List[str]] = None, raw_root: str = RAW_ROOT,
+                store_root: str = STORE_ROOT) -> Dict[str, Dict]:
+    """Build (or rebuild) the store for the given formats and write store_info.json."""
+    info_path = os.path.join(store_dir(store_root), "store_info.json")
+    info: Dict[str, Dict] = {}
+    if os.path.exists(info_path):
+        with open(info_path, "r", encoding="utf-8") as f:
+            info = json.load(f)
+
+    for fmt in formats or list(FORMATS):
+        if not source_exists(os.path.join(raw_root, FORMATS[fmt])):
+            print(f"⚠️  {fmt} raw folder/archive not found, skipping")
+            continue
+        print(f"\n📂 {fmt}: compacting raw CSVs...")
+        start = time.time()
+        summary = build_format(fmt, raw_root, store_root)
+        summary["built_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        info[fmt] = summary
+        print(f"   ✅ {summary['matches']} matches in {len(summary['partitions'])} seasons "
+              f"({summary['skipped']} skipped, {time.time() - start:.1f}s)")
+
+    os.makedirs(store_dir(store_root), exist_ok=True)
+    with open(info_path, "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=2)
+    ball_dictionaries(store_root).save(store_root)
+    _store_checks.clear()
+    _partition_cache.clear()
+    return info
+
+
+def has_store(fmt: str, store_root: str = STORE_ROOT) -> bool:
+    fmt_dir = os.path.join(store_dir(store_root), fmt)
+    return os.path.isdir(fmt_dir) and any(f.endswith(".parquet") for f in os.listdir(fmt_dir))
+
+
+def store_info(store_root: str = STORE_ROOT) -> Dict[str, Dict]:
+    path = os.path.join(store_dir(store_root), "store_info.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# (format, raw location, store root) -> whether the store may be read, checked once per process
+_store_checks: Dict[Tuple[str, Optional[str], str], bool] = {}
+
+
+def use_store(fmt: str, folder: Optional[str] = None, store_root: str = STORE_ROOT) -> bool:
+    """True if the store holds ``fmt`` and still matches the raw source it stands in for.
+
+    With no raw source on disk the store is all there is and is trusted.
+    Otherwise the raw folder (``folder`` or the default) must be the one the
+    store was built from, with the same files, sizes and mtimes.
+    """
+    if not has_store(fmt, store_root):
+        return False
+    location = resolve_location(folder or os.path.join(RAW_ROOT, FORMATS[fmt]))
+    key = (fmt, os.path.abspath(location) if location else None, store_root)
+    if key in _store_checks:
+        return _store_checks[key]
+
+    recorded = store_info(store_root).get(fmt, {}).get("raw")
+    fresh, reason = True, None
+    if location is not None:
+        if recorded is None:
+            fresh, reason = False, "was built without a raw fingerprint"
+        elif recorded["location"] not in (raw_location(location), key[1]):
+            fresh, reason = False, f"was built from {recorded['location']}, not {location}"
+        else:
+            current = raw_signature(open_source(location))
+            if current["files"] != recorded["files"]:
+                fresh, reason = False, (f"is stale: {location} has {current['files']} files, "
+                                        f"the store was built from {recorded['files']}")
+            elif current["digest"] != recorded["digest"]:
+                fresh, reason = False, f"is stale: files in {location} changed since it was built"
+    if not fresh:
+        print(f"⚠️  {fmt} store {reason}; reading raw CSVs. "
+              f"Rebuild with: python scripts/ball_store.py --formats {fmt}")
+    _store_checks[key] = fresh
+    return fresh
+
+
+def partition_paths(fmt: str, seasons: Optional[List[str]] = None,
+                    store_root: str = STORE_ROOT) -> List[str]:
+    fmt_dir = os.path.join(store_dir(store_root), fmt)
+    if not os.path.isdir(fmt_dir):
+        return []
+    wanted = {season_key(s) for s in seasons} if seasons else None
+    paths = []
+    for f in sorted(os.listdir(fmt_dir)):
+        if not f.endswith(".parquet"):
+            continue
+        if wanted is not None and f[:-len(".parquet")] not in wanted:
+            continue
+        paths.append(os.path.join(fmt_dir, f))
+    return paths
+
+
+def load_balls(fmt: str, seasons: Optional[List[str]] = None,
+               columns: Optional[List[str]] = None,
+               store_root: str = STORE_ROOT) -> pd.DataFrame:
+    """Load every ball of one format (optionally a subset of seasons/columns), compacted."""
+    paths = partition_paths(fmt, seasons, store_root)
+    if not paths:
+        return pd.DataFrame(columns=columns or BALL_COLUMNS)
+    return pd.concat([_read_partition(p, columns, store_root) for p in paths], ignore_index=True)
+
+
+def match_count(fmt: str, folder: Optional[str] = None, store_root: str = STORE_ROOT) -> int:
+    """Number of matches ``iter_match_frames`` will yield for a format."""
+    if use_store(fmt, folder, store_root):
+        return store_info(store_root).get(fmt, {}).get("matches", 0)
+    source = open_source(folder or os.path.join(RAW_ROOT, FORMATS[fmt]))
+    return len(source) if source is not None else 0
+
+
+@dataclass(frozen=True)
+class StoreMatch:
+    """One match in a store partition. Small and picklable, so worker
+    processes are sent this and read the partition themselves."""
+
+    path: str
+    match_id: int
+    store_root: str = STORE_ROOT
+
+    def frame(self) -> pd.DataFrame:
+        return _match_frame(self.path, self.match_id, self.store_root)
+
+
+# The last partition this process read, with each match's row positions
+_partition_cache: Dict[Tuple[str, str], Tuple[pd.DataFrame, Dict[int, np.ndarray]]] = {}
+
+
+def _match_frame(path: str, match_id: int, store_root: str = STORE_ROOT) -> pd.DataFrame:
+    key = (path, store_root)
+    if key not in _partition_cache:
+        # Matches arrive partition by partition, so one cached partition is enough
+        _partition_cache.clear()
+        part = _read_partition(path, store_root=store_root)
+        _partition_cache[key] = (part, part.groupby("match_id", sort=False).indices)
+    part, rows = _partition_cache[key]
+    return part.take(rows[match_id]).reset_index(drop=True)
+
+
+def read_match(source, **read_csv_kwargs) -> pd.DataFrame:
+    """Return ``source`` if it is already a frame, load it if it is a
+    :class:`StoreMatch`, otherwise read it as a raw CSV (a file path or a
+    member of a Cricsheet zip) and compact it."""
+    if isinstance(source, pd.DataFrame):
+        return source
+    if isinstance(source, StoreMatch):
+        return source.frame()
+    return compact_balls(read_source(source, **read_csv_kwargs))
+
+
+def iter_match_frames(fmt: str, folder: Optional[str] = None,
+                      columns: Optional[List[str]] = None,
+                      store_root: str = STORE_ROOT,
+                      limit: Optional[int] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """Yield ``(match_id, balls)`` for every match of a format.
+
+    Reads one season partition at a time from the store. When the store has
+    not been built, or no longer matches the raw source (see ``use_store``),
+    the raw CSVs in ``folder`` (a directory or zip archive) are parsed instead.
+    """
+    count = 0
+    if use_store(fmt, folder, store_root):
+        if columns is not None and "match_id" not in columns:
+            columns = ["match_id"] + list(columns)
+        for path in partition_paths(fmt, store_root=store_root):
+            part = _read_partition(path, columns, store_root)
+            for match_id, balls in part.groupby("match_id", sort=False):
+                if limit is not None and count >= limit:
+                    return
+                yield str(match_id), balls.reset_index(drop=True)
+                count += 1
+        return
+
+    source = open_source(folder or os.path.join(RAW_ROOT, FORMATS[fmt]))
+    if source is None:
+        return
+    for match_id, ball_source in source.iter_balls():
+        if limit is not None and count >= limit:
+            return
+        try:
+            balls = read_raw(ball_source, low_memory=False,
+                             usecols=(lambda c: c in columns) if columns else None)
+        except Exception:
+            continue
+        yield match_id, compact_balls(balls)
+        count += 1
+
+
+def iter_matches(fmt: str, folder: Optional[str] = None,
+                 store_root: str = STORE_ROOT) -> Iterator[Tuple[str, object]]:
+    """Yield ``(match_id, source)`` where source is a :class:`StoreMatch`, a raw
+    CSV path or a :class:`match_sources.ZipMember`.
+
+    Extractors pass ``source`` to :func:`read_match`, so on the raw fallback
+    each keeps its own ``read_csv`` options (encodings, ``low_memory``...).
+    Every kind of source is a few bytes to pickle, so tasks sent to a worker
+    pool carry references, not ball-by-ball frames.
+    """
+    if use_store(fmt, folder, store_root):
+        for path in partition_paths(fmt, store_root=store_root):
+            match_ids = pq.read_table(path, columns=["match_id"]).column("match_id").to_numpy()
+            for match_id in pd.unique(match_ids):
+                yield str(match_id), StoreMatch(path, int(match_id), store_root)
+        return
+    source = open_source(folder or os.path.join(RAW_ROOT, FORMATS[fmt]))
+    if source is None:
+        return
+    yield from source.iter_balls()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compact raw Cricsheet CSVs into a columnar store")
+    parser.add_argument("--raw", default=RAW_ROOT, help="Raw data root (default: data/raw)")
+    parser.add_argument("--store", default=STORE_ROOT, help="Store root (default: data/store)")
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=None,
+                        help="Formats to (re)build (default: all)")
+    args = parser.parse_args()
+
+    print("🗜️  BUILDING COLUMNAR BALL-BY-BALL STORE")
+    print("=" * 70)
+    info = build_store(args.formats, args.raw, args.store)
+
+    print("\n" + "=" * 70)
+    total = sum(v.get("matches", 0) for v in info.values())
+    print(f"🎉 Store ready: {total} matches in {store_dir(args.store)}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Ingestion benchmark for the extraction scripts.
+
+Runs each extractor over a Cricsheet-format corpus (normally one written by
+synth_cricsheet.py) and reports files/sec, MB/sec and peak RSS. Every
+extractor runs in its own fresh process, so peak RSS is not inflated by an
+earlier run, and always parses the raw files: the columnar store is
+bypassed on purpose.
+
+Usage:
+  python scripts/benchmark_extraction.py --generate 2000             # write data/synth, then bench
+  python scripts/benchmark_extraction.py --corpus data/synth
+  python scripts/benchmark_extraction.py --corpus data/raw --extractors smart quality
+  python scripts/benchmark_extraction.py --corpus data/synth --json bench.json
+
+Extractors:
+  smart     extract_maximum_matches.smart_extract_match, per file
+  quality   final_data_extraction.extract_quality_match, per file
+  complete  create_real_match_dataset.process_match_file, per file
+  players   player_database.extract_all_performances, batched pass
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from ball_store import FORMATS
+from match_sources import open_source
+
+
+# Store root that never exists, so iter_match_frames always reads raw files
+NO_STORE = os.path.join("data", ".no-store")
+
+
+def corpus_formats(corpus: str, formats: Optional[List[str]] = None) -> Dict[str, str]:
+    """{format: folder-or-archive} for every format present in the corpus."""
+    found = {}
+    for fmt in formats or list(FORMATS):
+        location = os.path.join(corpus, FORMATS[fmt])
+        if open_source(location) is not None:
+            found[fmt] = location
+    return found
+
+
+def corpus_size(formats: Dict[str, str]) -> Dict[str, int]:
+    """Ball-by-ball files and their uncompressed bytes."""
+    files = size = 0
+    for location in formats.values():
+        source = open_source(location)
+        for match_id in source.match_ids():
+            files += 1
+            size += source.stat(match_id)[0]
+    return {"files": files, "bytes": size}
+
+
+def _per_file(func: Callable) -> Callable[[Dict[str, str]], int]:
+    def run(formats: Dict[str, str]) -> int:
+        extracted = 0
+        for fmt, location in formats.items():
+            for match_id, ball_source in open_source(location).iter_balls():
+                if func(ball_source, fmt):
+                    extracted += 1
+        return extracted
+    return run
+
+
+# Each loader imports its extractor (outside the timed region) and returns
+# a runner that processes every match and returns how many it extracted
+def _smart():
+    from extract_maximum_matches import smart_extract_match
+    return _per_file(smart_extract_match)
+
+
+def _quality():
+    from final_data_extraction import extract_quality_match
+    return _per_file(extract_quality_match)
+
+
+def _complete():
+    from create_real_match_dataset import process_match_file
+    return _per_file(process_match_file)
+
+
+def _players():
+    from player_database import extract_all_performances
+
+    def run(formats):
+        batting, bowling, processed = extract_all_performances(formats, store_root=NO_STORE)
+        return processed
+    return run
+
+
+EXTRACTORS = {
+    "smart": _smart,
+    "quality": _quality,
+    "complete": _complete,
+    "players": _players,
+}
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 2**20
+    except ImportError:
+        return None
+
+
+def _child(name: str, formats: Dict[str, str], queue) -> None:
+    runner = EXTRACTORS[name]()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        extracted = runner(formats)
+        elapsed = time.perf_counter() - start
+    queue.put({"extracted": extracted, "seconds": elapsed, "peak_rss_mb": peak_rss_mb()})
+
+
+def run_benchmark(name: str, formats: Dict[str, str]) -> Dict:
+    """Run one extractor in a fresh process and collect its measurements."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_child, args=(name, formats, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the extractors on a Cricsheet-format corpus")
+    parser.add_argument("--corpus", default="data/synth", help="Corpus root with t20/ipl/odi folders or zips")
+    parser.add_argument("--generate", type=int, default=None, metavar="MATCHES",
+                        help="Generate a synthetic corpus with this many matches per format first")
+    parser.add_argument("--zip", action="store_true", help="With --generate, write zip archives")
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=None)
+    parser.add_argument("--extractors", nargs="+", choices=list(EXTRACTORS), default=list(EXTRACTORS))
+    parser.add_argument("--json", default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    print("⏱️  EXTRACTION BENCHMARK")
+    print("=" * 70)
+
+    if args.generate:
+        from synth_cricsheet import generate_corpus
+        print(f"🧪 Generating {args.generate} matches per format in {args.corpus}...")
+        generate_corpus(args.corpus, args.generate, args.formats, archive=args.zip)
+
+    formats = corpus_formats(args.corpus, args.formats)
+    if not formats:
+        print(f"❌ No match folders or archives under {args.corpus}")
+        return
+    size = corpus_size(formats)
+    mb = size["bytes"] / 2**20
+    print(f"📂 Corpus: {size['files']} ball files, {mb:.1f} MB ({', '.join(formats)})")
+
+    print(f"\n{'extractor':<10} {'files/s':>10} {'MB/s':>8} {'seconds':>9} {'peak RSS':>10} {'extracted':>10}")
+    print("-" * 62)
+    results = []
+    for name in args.extractors:
+        result = run_benchmark(name, formats)
+        seconds = result["seconds"]
+        result.update(extractor=name, files=size["files"], mb=round(mb, 2),
+                      files_per_sec=round(size["files"] / seconds, 1) if seconds else None,
+                      mb_per_sec=round(mb / seconds, 2) if seconds else None)
+        results.append(result)
+        rss = f"{result['peak_rss_mb']:.0f} MB" if result["peak_rss_mb"] is not None else "n/a"
+        print(f"{name:<10} {result['files_per_sec']:>10} {result['mb_per_sec']:>8} "
+              f"{seconds:>9.1f} {rss:>10} {result['extracted']:>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"corpus": args.corpus, **size, "results": results}, f, indent=2)
+        print(f"\n💾 Saved: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
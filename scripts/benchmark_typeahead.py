@@ -0,0 +1,138 @@
+"""Latency of /api/search-players suggestions as the roster grows.
+
+Builds synthetic rosters of the requested sizes. Each name joins a random
+first and last name taken from data/global_cricket_players_fixed.json, and
+a syllable is added when needed to keep names unique. The benchmark then
+times the same mix of keystroke queries against two implementations:
+
+  scan   the old endpoint: lowercase + str.contains over the frame, iterrows, first 10
+  index  name_index.TypeaheadIndex built once, search(query, limit=10)
+
+The query mix includes one- to six-letter prefixes, surname prefixes,
+full names, mid-word fragments and one-letter typos.
+
+Usage:
+  python scripts/benchmark_typeahead.py                        # 10k and 100k players
+  python scripts/benchmark_typeahead.py --sizes 1000 10000 100000 --queries 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from name_index import TypeaheadIndex
+
+
+PLAYERS_PATH = "data/global_cricket_players_fixed.json"
+SYLLABLES = ["an", "ar", "el", "in", "ka", "la", "ma", "ni", "or", "ra", "sh", "ta", "vi", "ya"]
+
+
+def synthetic_roster(seed_names: List[str], size: int, seed: int = 42) -> List[str]:
+    """``size`` distinct names recombined from the first and last names of ``seed_names``."""
+    rng = random.Random(seed)
+    parts = [name.split() for name in seed_names if len(name.split()) >= 2]
+    firsts = sorted({p[0] for p in parts})
+    lasts = sorted({" ".join(p[1:]) for p in parts})
+    names, seen = [], set()
+    while len(names) < size:
+        name = f"{rng.choice(firsts)} {rng.choice(lasts)}"
+        while name in seen:
+            name += rng.choice(SYLLABLES)
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def query_mix(names: List[str], count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        name = rng.choice(names)
+        kind = rng.randrange(5)
+        if kind == 0:
+            queries.append(name[:rng.randint(1, 6)])
+        elif kind == 1:
+            surname = name.split()[-1]
+            queries.append(surname[:rng.randint(2, len(surname))])
+        elif kind == 2:
+            queries.append(name)
+        elif kind == 3:
+            start = rng.randrange(max(1, len(name) - 4))
+            queries.append(name[start:start + 4])
+        else:
+            i = rng.randrange(1, len(name))
+            queries.append(name[:i - 1] + name[i] + name[i - 1] + name[i + 1:])
+    return queries
+
+
+def scan_search(players_df: pd.DataFrame, query: str) -> List[Dict[str, str]]:
+    matching = players_df[players_df["player_name"].str.lower().str.contains(query.lower(), na=False)]
+    return [{"name": row["player_name"], "country": row["country"]} for _, row in matching.iterrows()][:10]
+
+
+def latencies(search, queries: List[str]) -> Dict[str, float]:
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        times.append(time.perf_counter() - start)
+    times_us = np.array(times) * 1e6
+    return {"p50_us": float(np.percentile(times_us, 50)), "p99_us": float(np.percentile(times_us, 99)),
+            "mean_us": float(times_us.mean())}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark player typeahead against the old frame scan")
+    parser.add_argument("--players", default=PLAYERS_PATH)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=500, help="Queries timed against the index")
+    parser.add_argument("--scan-queries", type=int, default=50, help="Queries timed against the frame scan")
+    parser.add_argument("--json", default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    print("⌨️  TYPEAHEAD BENCHMARK")
+    print("=" * 70)
+
+    with open(args.players, encoding="utf-8") as f:
+        seed_names = [p["player_name"] for p in json.load(f) if p.get("player_name")]
+    print(f"✅ {len(seed_names)} real names to recombine")
+
+    results = []
+    for size in args.sizes:
+        names = synthetic_roster(seed_names, size)
+        players_df = pd.DataFrame({"player_name": names, "country": "Synthetic"})
+        queries = query_mix(names, args.queries)
+
+        start = time.perf_counter()
+        index = TypeaheadIndex(names)
+        build_s = time.perf_counter() - start
+
+        index_stats = latencies(lambda q: index.search(q, limit=10), queries)
+        scan_stats = latencies(lambda q: scan_search(players_df, q), queries[:args.scan_queries])
+        results.append({"players": size, "build_s": build_s, "index": index_stats, "scan": scan_stats})
+        print(f"\n👥 {size:,} players (index built in {build_s:.2f}s)")
+        for label, stats in (("index", index_stats), ("scan", scan_stats)):
+            print(f"   {label:<6} p50 {stats['p50_us']:9.1f} us   p99 {stats['p99_us']:9.1f} us   "
+                  f"mean {stats['mean_us']:9.1f} us")
+
+    print("\n" + "=" * 70)
+    print(f"{'Players':>10} {'index p50':>12} {'index p99':>12} {'scan p50':>12} {'speedup':>9}")
+    for r in results:
+        print(f"{r['players']:>10,} {r['index']['p50_us']:>10.1f}us {r['index']['p99_us']:>10.1f}us "
+              f"{r['scan']['p50_us'] / 1e3:>10.1f}ms {r['scan']['p50_us'] / r['index']['p50_us']:>8.0f}x")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Saved: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
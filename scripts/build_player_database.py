@@ -1,26 +1,26 @@
 import pandas as pd
 import os
 
+from ball_store import iter_match_frames, match_count
+from match_sources import source_exists
+
 os.makedirs('data/processed', exist_ok=True)
 
 print("Building comprehensive player database from match data...")
 
 # Function to process matches and extract player stats
 def extract_player_stats(folder_path, match_type):
-    files = [f for f in os.listdir(folder_path) if f.endswith('.csv')]
-    
     all_batting = []
     all_bowling = []
     
-    print(f"\nProcessing {len(files)} {match_type} matches...")
+    print(f"\nProcessing {match_count(match_type, folder_path)} {match_type} matches...")
     
-    for i, file in enumerate(files[:200], 1):  # Process 200 matches
+    columns = ['striker', 'bowler', 'runs_off_bat', 'wicket_type']
+    for i, (match_id, df) in enumerate(iter_match_frames(match_type, folder_path, columns=columns, limit=200), 1):  # Process 200 matches
         if i % 50 == 0:
             print(f"  Processed {i} matches...")
         
         try:
-            df = pd.read_csv(os.path.join(folder_path, file))
-            
             # Extract batting stats
             for batsman in df['striker'].unique():
                 batsman_balls = df[df['striker'] == batsman]
@@ -58,7 +58,7 @@ bowling_dfs = []
 for folder, match_type in [('data/raw/t20', 'T20'), 
                             ('data/raw/ipl', 'IPL'),
                             ('data/raw/odi', 'ODI')]:
-    if os.path.exists(folder):
+    if source_exists(folder):
         bat, bowl = extract_player_stats(folder, match_type)
         batting_dfs.append(bat)
         bowling_dfs.append(bowl)
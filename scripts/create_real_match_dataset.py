@@ -1,14 +1,22 @@
 import pandas as pd
-import os
 import numpy as np
 
-print("Creating ULTRA-COMPLETE match dataset...")
-print("="*60)
+from ball_store import iter_matches, match_count
+from match_metadata import match_winner
+from match_sources import source_exists
+from schema_cache import read_with_schema
+
+# Columns process_match_file reads from a raw file
+MATCH_COLUMNS = ['match_id', 'venue', 'season', 'batting_team', 'innings', 'runs_off_bat',
+                 'extras', 'wicket_type', 'ball', 'over', 'winner']
 
 def process_match_file(file_path, match_format):
-    """Extract match details - IMPROVED VERSION"""
+    """Extract match details - IMPROVED VERSION
+
+    file_path may also be a ball_store.StoreMatch or a ball-by-ball DataFrame.
+    """
     try:
-        df = pd.read_csv(file_path)
+        df, schema = read_with_schema(file_path, MATCH_COLUMNS)
         
         # Skip if dataframe is empty
         if len(df) == 0:
@@ -123,11 +131,13 @@ def process_match_file(file_path, match_format):
         team1_boundary_pct = round((team1_boundary_runs / team1_runs * 100), 2) if team1_runs > 0 else 0
         team2_boundary_pct = round((team2_boundary_runs / team2_runs * 100), 2) if team2_runs > 0 else 0
         
-        # Winner determination
-        if 'winner' in df.columns and pd.notna(df['winner'].iloc[0]):
-            winner = df['winner'].iloc[0]
-        else:
-            winner = team1 if team1_runs > team2_runs else team2
+        # Winner determination - recorded result from the info file when available
+        winner = match_winner(df)
+        if winner is None:
+            if 'winner' in df.columns and pd.notna(df['winner'].iloc[0]):
+                winner = df['winner'].iloc[0]
+            else:
+                winner = team1 if team1_runs > team2_runs else team2
         
         team1_won = 1 if winner == team1 else 0
         
@@ -191,104 +201,111 @@ def process_match_file(file_path, match_format):
         # Silently skip problematic files
         return None
 
-# Process ALL formats
-all_matches = []
+def main():
+    print("Creating ULTRA-COMPLETE match dataset...")
+    print("="*60)
 
-formats = {
-    'T20': 'data/raw/t20/',
-    'IPL': 'data/raw/ipl/',
-    'ODI': 'data/raw/odi/'
-}
+    # Process ALL formats
+    all_matches = []
 
-print("\n🏏 Processing ALL matches from all formats:")
-print("="*60)
+    formats = {
+        'T20': 'data/raw/t20/',
+        'IPL': 'data/raw/ipl/',
+        'ODI': 'data/raw/odi/'
+    }
 
-total_files = 0
-total_successful = 0
-total_skipped = 0
+    print("\n🏏 Processing ALL matches from all formats:")
+    print("="*60)
 
-for match_format, folder_path in formats.items():
-    if not os.path.exists(folder_path):
-        print(f"⚠️  {match_format} folder not found!")
-        continue
-    
-    files = [f for f in os.listdir(folder_path) if f.endswith('.csv')]
-    total_files += len(files)
-    
-    print(f"\n📂 {match_format}:")
-    print(f"   Files: {len(files)}")
-    
-    successful = 0
-    skipped = 0
-    
-    for i, file in enumerate(files, 1):
-        if i % 1000 == 0:
-            print(f"   Progress: {i}/{len(files)} ({successful} ✓, {skipped} ✗)")
-        
-        match_data = process_match_file(os.path.join(folder_path, file), match_format)
-        
-        if match_data:
-            all_matches.append(match_data)
-            successful += 1
-        else:
-            skipped += 1
-    
-    total_successful += successful
-    total_skipped += skipped
-    
-    success_rate = (successful / len(files) * 100) if len(files) > 0 else 0
-    print(f"   ✅ Success: {successful} matches ({success_rate:.1f}%)")
-    print(f"   ⚠️  Skipped: {skipped} matches")
+    total_files = 0
+    total_successful = 0
+    total_skipped = 0
+
+    for match_format, folder_path in formats.items():
+        if not source_exists(folder_path):
+            print(f"⚠️  {match_format} folder not found!")
+            continue
+
+        n_files = match_count(match_format, folder_path)
+        total_files += n_files
+
+        print(f"\n📂 {match_format}:")
+        print(f"   Files: {n_files}")
+
+        successful = 0
+        skipped = 0
+
+        for i, (match_id, source) in enumerate(iter_matches(match_format, folder_path), 1):
+            if i % 1000 == 0:
+                print(f"   Progress: {i}/{n_files} ({successful} ✓, {skipped} ✗)")
+
+            match_data = process_match_file(source, match_format)
+
+            if match_data:
+                all_matches.append(match_data)
+                successful += 1
+            else:
+                skipped += 1
+
+        total_successful += successful
+        total_skipped += skipped
+
+        success_rate = (successful / n_files * 100) if n_files > 0 else 0
+        print(f"   ✅ Success: {successful} matches ({success_rate:.1f}%)")
+        print(f"   ⚠️  Skipped: {skipped} matches")
+
+    # Create DataFrame
+    print("\n" + "="*60)
+    print("📊 Creating final dataset...")
 
-# Create DataFrame
-print("\n" + "="*60)
-print("📊 Creating final dataset...")
+    matches_df = pd.DataFrame(all_matches)
+    print(f"✅ Collected: {len(matches_df)} matches")
 
-matches_df = pd.DataFrame(all_matches)
-print(f"✅ Collected: {len(matches_df)} matches")
+    # Clean data
+    initial = len(matches_df)
+    matches_df = matches_df.dropna(subset=['team1_runs', 'team2_runs', 'venue'])
+    matches_df = matches_df[matches_df['team1_runs'] >= 30]
+    matches_df = matches_df[matches_df['team2_runs'] >= 30]
+    final = len(matches_df)
 
-# Clean data
-initial = len(matches_df)
-matches_df = matches_df.dropna(subset=['team1_runs', 'team2_runs', 'venue'])
-matches_df = matches_df[matches_df['team1_runs'] >= 30]
-matches_df = matches_df[matches_df['team2_runs'] >= 30]
-final = len(matches_df)
+    print(f"✅ After cleaning: {final} matches ({initial - final} removed)")
 
-print(f"✅ After cleaning: {final} matches ({initial - final} removed)")
+    # Save
+    matches_df.to_csv('data/processed/complete_matches_dataset.csv', index=False)
+    print(f"💾 Saved: data/processed/complete_matches_dataset.csv")
 
-# Save
-matches_df.to_csv('data/processed/complete_matches_dataset.csv', index=False)
-print(f"💾 Saved: data/processed/complete_matches_dataset.csv")
+    # Statistics
+    print("\n" + "="*60)
+    print("📊 FINAL DATASET STATISTICS:")
+    print("="*60)
 
-# Statistics
-print("\n" + "="*60)
-print("📊 FINAL DATASET STATISTICS:")
-print("="*60)
+    print(f"\n📈 Total matches: {len(matches_df)}")
+    print(f"📈 Success rate: {(total_successful/total_files*100):.1f}%")
 
-print(f"\n📈 Total matches: {len(matches_df)}")
-print(f"📈 Success rate: {(total_successful/total_files*100):.1f}%")
+    print("\n🏏 By Format:")
+    print(matches_df['match_format'].value_counts())
 
-print("\n🏏 By Format:")
-print(matches_df['match_format'].value_counts())
+    print(f"\n🌍 Venues: {matches_df['venue'].nunique()}")
+    print(f"🏏 Teams: {pd.concat([matches_df['team1'], matches_df['team2']]).nunique()}")
 
-print(f"\n🌍 Venues: {matches_df['venue'].nunique()}")
-print(f"🏏 Teams: {pd.concat([matches_df['team1'], matches_df['team2']]).nunique()}")
+    print("\n🏆 Top 10 Teams:")
+    all_teams = pd.concat([matches_df['team1'], matches_df['team2']])
+    print(all_teams.value_counts().head(10))
 
-print("\n🏆 Top 10 Teams:")
-all_teams = pd.concat([matches_df['team1'], matches_df['team2']])
-print(all_teams.value_counts().head(10))
+    print("\n📍 Top 10 Venues:")
+    print(matches_df['venue'].value_counts().head(10))
 
-print("\n📍 Top 10 Venues:")
-print(matches_df['venue'].value_counts().head(10))
+    print("\n⚖️ Win Statistics:")
+    print(f"Batting First Win Rate: {matches_df['team1_won'].mean()*100:.2f}%")
+    print(f"Chasing Win Rate: {(1-matches_df['team1_won'].mean())*100:.2f}%")
 
-print("\n⚖️ Win Statistics:")
-print(f"Batting First Win Rate: {matches_df['team1_won'].mean()*100:.2f}%")
-print(f"Chasing Win Rate: {(1-matches_df['team1_won'].mean())*100:.2f}%")
+    print("\n📊 Average Scores:")
+    format_avg = matches_df.groupby('match_format')['team1_runs'].mean()
+    print(format_avg.round(1))
 
-print("\n📊 Average Scores:")
-format_avg = matches_df.groupby('match_format')['team1_runs'].mean()
-print(format_avg.round(1))
+    print("\n" + "="*60)
+    print("🎉 DATASET READY FOR MACHINE LEARNING!")
+    print("="*60)
 
-print("\n" + "="*60)
-print("🎉 DATASET READY FOR MACHINE LEARNING!")
-print("="*60)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
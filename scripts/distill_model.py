@@ -0,0 +1,207 @@
+"""Distill the serving ensemble into a compact student model.
+
+/api/predict-match loads a stacking/voting ensemble with thousands of deep
+trees to score one 20-feature row. The student is a shallow gradient
+boosted model (or a logistic model) trained to reproduce the ensemble's
+probabilities:
+
+* Training rows are the feature-store matrix the teacher was trained on,
+  plus synthetic scenario sweeps. Each sweep takes a random team pair and
+  venue from the stored team/venue tables and walks runs x wickets across
+  the range the web form accepts. The student thus learns the teacher's
+  surface where users actually query it, not only where matches happened.
+* Targets are the teacher's soft probabilities. Every row is fed twice,
+  once as class 1 with weight p and once as class 0 with weight 1 - p.
+  The student then minimizes cross-entropy to the teacher and comes out
+  as an ordinary sklearn classifier, so the web app calls it exactly like
+  the ensemble.
+
+Fidelity on held-out real rows and on unseen sweeps is reported as
+agreement (same predicted winner) and probability MAE, next to both
+models' test accuracy and their one-row / batch latency.
+
+Usage:
+  python scripts/distill_model.py                          # gbdt student
+  python scripts/distill_model.py --student logistic
+  python scripts/distill_model.py --teacher models/ultimate_ensemble_model.pkl --contexts 400
+
+Serve it with:
+  MATCH_MODEL=student python backend/web_complete.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pickle
+import time
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from feature_store import load_features
+from hyperparameter_search import serving_latency
+from match_features import STRENGTH_FEATURES, strength_features
+
+
+TEACHER_PATH = "models/ultimate_ensemble_model.pkl"
+MODEL_INFO_PATH = "models/model_info.pkl"
+STUDENT_PATH = "models/student_model.pkl"
+STUDENT_INFO_PATH = "models/student_info.pkl"
+
+# Ranges of the web form's inputs swept for each context
+SWEEP_RUNS = np.arange(60, 281, 10)
+SWEEP_WICKETS = np.arange(0, 11)
+
+# The split each 20-feature trainer held out, so fidelity is measured on rows the teacher never saw
+TEACHER_SPLITS: Dict[str, Dict[str, Any]] = {
+    "quick": {"test_size": 0.2, "stratify": False},      # quick_save_model.py
+    "ultimate": {"test_size": 0.25, "stratify": True},   # ultimate_final_model.py
+}
+
+
+def make_student(kind: str):
+    if kind == "gbdt":
+        return HistGradientBoostingClassifier(max_depth=4, max_iter=300, learning_rate=0.1,
+                                              early_stopping=False, random_state=42)
+    if kind == "logistic":
+        return make_pipeline(StandardScaler(), LogisticRegression(max_iter=2000))
+    raise ValueError(f"unknown student: {kind}")
+
+
+def scenario_sweeps(team_stats: Dict[str, Dict[str, Any]], venue_stats: pd.DataFrame,
+                    contexts: int, seed: int = 42) -> pd.DataFrame:
+    """Feature rows for ``contexts`` random (team pair, venue) x runs x wickets grids."""
+    rng = np.random.default_rng(seed)
+    teams = list(team_stats)
+    venues = venue_stats.dropna(subset=["v_avg", "v_std"]).reset_index(drop=True)
+    runs, wickets = np.meshgrid(SWEEP_RUNS, SWEEP_WICKETS)
+    runs, wickets = runs.ravel(), wickets.ravel()
+
+    frames = []
+    for _ in range(contexts):
+        t1, t2 = rng.choice(len(teams), 2, replace=False)
+        s1, s2 = team_stats[teams[t1]], team_stats[teams[t2]]
+        venue = venues.iloc[rng.integers(len(venues))]
+        overs = rng.uniform(15, 20, len(runs))
+        frames.append(pd.DataFrame({
+            "team1_runs": runs, "team1_wickets": wickets, "team1_run_rate": runs / overs,
+            "t1_wr": s1["wr"], "t2_wr": s2["wr"], "t1_bat_wr": s1["bat_wr"], "t2_chase_wr": s2["chase_wr"],
+            "v_avg": venue["v_avg"], "v_std": venue["v_std"], "v_bat_adv": venue["v_bat_adv"],
+        }))
+    sweeps = strength_features(pd.concat(frames, ignore_index=True))
+    return sweeps[STRENGTH_FEATURES].replace([np.inf, -np.inf], 0).fillna(0)
+
+
+def soft_targets(X: pd.DataFrame, p: np.ndarray) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """Each row as class 1 weighted p and class 0 weighted 1 - p."""
+    doubled = pd.concat([X, X], ignore_index=True)
+    labels = np.r_[np.ones(len(X), dtype=int), np.zeros(len(X), dtype=int)]
+    return doubled, labels, np.r_[p, 1 - p]
+
+
+def fidelity(teacher_p: np.ndarray, student_p: np.ndarray) -> Dict[str, float]:
+    return {
+        "agreement": float(np.mean((teacher_p >= 0.5) == (student_p >= 0.5))),
+        "prob_mae": float(np.mean(np.abs(teacher_p - student_p))),
+        "prob_max_error": float(np.max(np.abs(teacher_p - student_p))),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Distill the serving ensemble into a compact student")
+    parser.add_argument("--teacher", default=TEACHER_PATH)
+    parser.add_argument("--model-info", default=MODEL_INFO_PATH)
+    parser.add_argument("--student", choices=["gbdt", "logistic"], default="gbdt")
+    parser.add_argument("--contexts", type=int, default=300, help="Scenario sweeps (team pair x venue grids)")
+    parser.add_argument("--output", default=STUDENT_PATH)
+    parser.add_argument("--info-output", default=STUDENT_INFO_PATH)
+    args = parser.parse_args()
+
+    print("🎓 DISTILLING SERVING MODEL")
+    print("=" * 70)
+
+    with open(args.teacher, "rb") as f:
+        teacher = pickle.load(f)
+    with open(args.model_info, "rb") as f:
+        model_info = pickle.load(f)
+    features = model_info["features"]
+    if list(features) != STRENGTH_FEATURES:
+        print("❌ Teacher does not use the 20 web-app features; nothing to distill for serving")
+        return
+    print(f"✅ Teacher: {type(teacher).__name__} ({args.teacher})")
+
+    fs = load_features(model_info.get("feature_set", "quick"))
+    split = TEACHER_SPLITS.get(fs.name, TEACHER_SPLITS["quick"])
+    X_train, X_test, y_train, y_test = train_test_split(
+        fs.X, fs.y, test_size=split["test_size"], random_state=42, stratify=fs.y if split["stratify"] else None)
+    sweeps = scenario_sweeps(fs.team_stats, fs.venue_stats, args.contexts)
+    sweep_train, sweep_test = train_test_split(sweeps, test_size=0.2, random_state=42)
+    print(f"✅ {len(X_train)} real rows + {len(sweep_train)} sweep rows for training")
+
+    print("\n🧑‍🏫 Teacher soft labels...")
+    start = time.time()
+    X_fit = pd.concat([X_train, sweep_train], ignore_index=True)[features]
+    p_fit = teacher.predict_proba(X_fit)[:, 1]
+    print(f"   ✅ {len(X_fit)} rows in {time.time() - start:.1f}s")
+
+    print(f"\n🎓 Training {args.student} student...")
+    start = time.time()
+    student = make_student(args.student)
+    X_soft, y_soft, w_soft = soft_targets(X_fit, p_fit)
+    if args.student == "logistic":
+        student.fit(X_soft, y_soft, logisticregression__sample_weight=w_soft)
+    else:
+        student.fit(X_soft, y_soft, sample_weight=w_soft)
+    print(f"   ✅ Trained in {time.time() - start:.1f}s")
+
+    report: Dict[str, Any] = {}
+    for label, X_eval in (("test", X_test[features]), ("sweeps", sweep_test[features])):
+        report[label] = fidelity(teacher.predict_proba(X_eval)[:, 1], student.predict_proba(X_eval)[:, 1])
+    report["teacher_accuracy"] = float(np.mean(teacher.predict(X_test[features]) == y_test.to_numpy()))
+    report["student_accuracy"] = float(np.mean(student.predict(X_test[features]) == y_test.to_numpy()))
+    teacher_ms, teacher_us = serving_latency(teacher, X_test[features])
+    student_ms, student_us = serving_latency(student, X_test[features])
+    report["latency"] = {"teacher_ms": teacher_ms, "student_ms": student_ms,
+                         "teacher_us_per_row": teacher_us, "student_us_per_row": student_us}
+
+    print("\n" + "=" * 70)
+    print("📊 FIDELITY")
+    print("=" * 70)
+    for label in ("test", "sweeps"):
+        r = report[label]
+        print(f"   {label:<7} agreement {r['agreement']*100:6.2f}%   prob MAE {r['prob_mae']:.4f}   "
+              f"max error {r['prob_max_error']:.3f}")
+    print(f"   Test accuracy: teacher {report['teacher_accuracy']*100:.2f}%  "
+          f"student {report['student_accuracy']*100:.2f}%")
+    print("\n⏱️  LATENCY")
+    print(f"   One row:  teacher {teacher_ms:8.2f} ms   student {student_ms:6.2f} ms   "
+          f"({teacher_ms / student_ms:.0f}x)")
+    print(f"   Batch:    teacher {teacher_us:8.1f} us/row student {student_us:6.1f} us/row")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "wb") as f:
+        pickle.dump(student, f)
+    student_info = {
+        "features": features,
+        "student": args.student,
+        "teacher": args.teacher,
+        "feature_set": fs.name,
+        "feature_version": fs.version,
+        "sweep_contexts": args.contexts,
+        **report,
+    }
+    with open(args.info_output, "wb") as f:
+        pickle.dump(student_info, f)
+    print(f"\n💾 Saved: {args.output}")
+    print("📝 Serve it: MATCH_MODEL=student python backend/web_complete.py")
+
+
+if __name__ == "__main__":
+    main()
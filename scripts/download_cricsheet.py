@@ -1,9 +1,17 @@
 import requests
 import zipfile
 import os
+import sys
 
-def download_cricsheet_data():
-    """Download latest T20 and ODI data"""
+def download_cricsheet_data(extract=False):
+    """Download latest T20 and ODI data
+
+    The pipeline reads data/raw/<format>_data.zip directly (see
+    match_sources.py); pass extract=True (--extract) to also unpack it.
+    An older data/raw/<format>/ folder left from a previous extraction is
+    ignored once the new archive is written, since the readers pick
+    whichever of the two is newer.
+    """
     
     urls = {
         't20': 'https://cricsheet.org/downloads/t20s_csv2.zip',
@@ -19,10 +27,13 @@ def download_cricsheet_data():
         with open(zip_path, 'wb') as f:
             f.write(response.content)
         
-        # Extract
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(f'data/raw/{format_type}/')
+        # Extract (optional - scripts read the archive in place)
+        if extract:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                zip_ref.extractall(f'data/raw/{format_type}/')
+            # Overwriting files leaves the folder's mtime alone; mark it as current
+            os.utime(f'data/raw/{format_type}/')
         
         print(f"{format_type} data downloaded!")
 
-download_cricsheet_data()
\ No newline at end of file
+download_cricsheet_data(extract='--extract' in sys.argv)
\ No newline at end of file
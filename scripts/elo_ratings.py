@@ -0,0 +1,267 @@
+"""Incremental Elo ratings per format, persisted for the web app.
+
+team_statistics.py rebuilds every team aggregate from the full history on
+each training run, and recent_form orders matches by the season string.
+This engine instead walks the matches once in chronological order and
+updates two numbers per match:
+
+  expected = 1 / (1 + 10 ** ((r2 - r1) / 400))
+  r1 += k * (result - expected);  r2 -= k * (result - expected)
+
+Ratings are kept separately per match_format (T20, ODI, IPL). A team's
+T20 form says little about its ODI side. Between matches a rating decays
+toward the 1500 baseline with a half-life of ``half_life`` years. A side
+that has not played for three seasons is therefore not trusted at its old
+strength.
+
+Time comes from a ``date`` column when there is one, otherwise from the
+season. '2016' is mid-2016, and '2016/17' (a southern summer) is the turn
+of the year. Recording a new result is O(1) and is saved straight away.
+The web app's rating endpoints reflect it without retraining anything.
+
+Usage:
+  python scripts/elo_ratings.py                      # rebuild models/elo_ratings.json
+  python scripts/elo_ratings.py --show T20 --top 15
+  python scripts/elo_ratings.py --k 32 --half-life 1.5
+
+  from elo_ratings import EloRatings
+  elo = EloRatings.load()
+  elo.expected('T20', 'India', 'Australia')
+  elo.update('T20', 'India', 'Australia', winner='India', when='2025-11-02')
+  elo.save()
+
+A process serving the ratings calls ``elo.refresh()`` before reading, so a
+result saved by another worker shows up on its next request. Writers
+record results inside ``with elo.exclusive():``, which holds an flock on
+``<path>.lock`` and re-reads the file under it, so two workers recording at
+once cannot overwrite each other's result:
+
+  with elo.exclusive():
+      elo.update('T20', 'India', 'Australia', winner='India')
+      elo.save()
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialized
+    fcntl = None
+
+
+DATASET_PATH = "data/processed/quality_matches_dataset.csv"
+RATINGS_PATH = "models/elo_ratings.json"
+
+BASE_RATING = 1500.0
+DEFAULT_K = 32.0
+HALF_LIFE_YEARS = 4.0
+
+When = Union[str, float, int, date, None]
+
+
+def match_time(when: When = None) -> float:
+    """Fractional year for a date, a season string or a number; now if None."""
+    if when is None:
+        when = date.today()
+    if isinstance(when, (int, float, np.integer, np.floating)):
+        return float(when)
+    if isinstance(when, str):
+        text = when.strip()
+        if re.fullmatch(r"\d{4}", text):
+            return int(text) + 0.5
+        if re.fullmatch(r"\d{4}/\d{2,4}", text):
+            return int(text[:4]) + 1.0
+        when = datetime.fromisoformat(text[:10]).date()
+    return when.year + (when.timetuple().tm_yday - 0.5) / 365.25
+
+
+class EloRatings:
+    """Per-format Elo ratings with decay toward the baseline."""
+
+    def __init__(self, k: float = DEFAULT_K, half_life: float = HALF_LIFE_YEARS,
+                 base: float = BASE_RATING, path: str = RATINGS_PATH):
+        self.k = k
+        self.half_life = half_life
+        self.base = base
+        self.path = path
+        # format -> team -> {"rating", "time", "matches"}
+        self.ratings: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.matches = 0
+        self.updated_at: Optional[str] = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._mtime: Optional[int] = None
+
+    def _decayed(self, entry: Optional[Dict[str, float]], t: float) -> float:
+        if entry is None:
+            return self.base
+        elapsed = max(0.0, t - entry["time"])
+        return self.base + (entry["rating"] - self.base) * 0.5 ** (elapsed / self.half_life)
+
+    def rating(self, match_format: str, team: str, when: When = None) -> float:
+        return self._decayed(self.ratings.get(match_format, {}).get(team), match_time(when))
+
+    def expected(self, match_format: str, team1: str, team2: str, when: When = None) -> float:
+        """Probability that team1 beats team2."""
+        r1 = self.rating(match_format, team1, when)
+        r2 = self.rating(match_format, team2, when)
+        return 1.0 / (1.0 + 10 ** ((r2 - r1) / 400))
+
+    def update(self, match_format: str, team1: str, team2: str, winner: Optional[str],
+               when: When = None) -> Tuple[float, float]:
+        """Apply one result (a winner outside the two teams is a tie); returns the new ratings."""
+        t = match_time(when)
+        with self._lock:
+            table = self.ratings.setdefault(match_format, {})
+            e1, e2 = table.get(team1), table.get(team2)
+            r1, r2 = self._decayed(e1, t), self._decayed(e2, t)
+            expected = 1.0 / (1.0 + 10 ** ((r2 - r1) / 400))
+            result = 1.0 if winner == team1 else 0.0 if winner == team2 else 0.5
+            shift = self.k * (result - expected)
+            for team, entry, rating in ((team1, e1, r1 + shift), (team2, e2, r2 - shift)):
+                table[team] = {
+                    "rating": rating,
+                    "time": max(t, entry["time"]) if entry else t,
+                    "matches": (entry["matches"] if entry else 0) + 1,
+                }
+            self.matches += 1
+            return r1 + shift, r2 - shift
+
+    def fit(self, matches: pd.DataFrame) -> Dict[str, float]:
+        """Replay matches in time order; returns the pre-match forecast accuracy and log loss."""
+        when = matches["date"] if "date" in matches else matches["season"]
+        ordered = matches.assign(_time=[match_time(w) for w in when]).sort_values("_time", kind="stable")
+        hits, losses = 0, []
+        for fmt, team1, team2, winner, t in zip(ordered["match_format"], ordered["team1"], ordered["team2"],
+                                                ordered["winner"], ordered["_time"]):
+            p = self.expected(fmt, team1, team2, t)
+            if winner in (team1, team2):
+                won = winner == team1
+                hits += (p > 0.5) == won
+                losses.append(-np.log(p if won else 1 - p))
+            self.update(fmt, team1, team2, winner, t)
+        return {"accuracy": hits / max(1, len(losses)), "log_loss": float(np.mean(losses)) if losses else float("nan")}
+
+    def table(self, match_format: str, when: When = None) -> pd.DataFrame:
+        """Teams of one format by current (decayed) rating."""
+        t = match_time(when)
+        rows = [{"team": team, "rating": self._decayed(entry, t), "matches": entry["matches"],
+                 "last_played": entry["time"]}
+                for team, entry in self.ratings.get(match_format, {}).items()]
+        frame = pd.DataFrame(rows, columns=["team", "rating", "matches", "last_played"])
+        return frame.sort_values("rating", ascending=False).reset_index(drop=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "half_life": self.half_life,
+            "base": self.base,
+            "matches": self.matches,
+            "updated_at": self.updated_at,
+            "ratings": self.ratings,
+        }
+
+    def save(self, path: Optional[str] = None) -> str:
+        path = path or self.path
+        self.updated_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=1)
+            os.replace(tmp, path)
+            if path == self.path:
+                self._mtime = os.stat(path).st_mtime_ns
+        return path
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-read the file if another process saved it since (always with force); True if reloaded."""
+        if not os.path.exists(self.path) or (not force and os.stat(self.path).st_mtime_ns == self._mtime):
+            return False
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            self.k, self.half_life, self.base = data["k"], data["half_life"], data["base"]
+            self.ratings = data["ratings"]
+            self.matches = data["matches"]
+            self.updated_at = data.get("updated_at")
+            self._mtime = os.stat(self.path).st_mtime_ns
+        return True
+
+    @contextlib.contextmanager
+    def exclusive(self) -> Iterator["EloRatings"]:
+        """Hold the ratings file's lock and the latest ratings; update and save inside.
+
+        Without it two workers could each refresh, apply a different result
+        and save, and the second save would drop the first result.
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._write_lock, open(self.path + ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self.refresh(force=True)
+                yield self
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @classmethod
+    def load(cls, path: str = RATINGS_PATH) -> "EloRatings":
+        elo = cls(path=path)
+        elo.refresh()
+        return elo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build per-format Elo ratings from the match dataset")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--output", default=RATINGS_PATH)
+    parser.add_argument("--k", type=float, default=DEFAULT_K)
+    parser.add_argument("--half-life", type=float, default=HALF_LIFE_YEARS, help="Years for decay to halve")
+    parser.add_argument("--show", default=None, help="Print the table of one format and exit")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    print("📈 ELO RATINGS")
+    print("=" * 70)
+
+    if args.show:
+        elo = EloRatings.load(args.output)
+        print(f"{args.show} ({elo.matches} matches, updated {elo.updated_at})")
+        for i, row in elo.table(args.show).head(args.top).iterrows():
+            print(f"   {i + 1:3d}. {row['team']:<30} {row['rating']:7.1f}  ({row['matches']} matches)")
+        return
+
+    matches = pd.read_csv(args.dataset)
+    print(f"✅ Loaded {len(matches)} matches")
+    start = time.time()
+    elo = EloRatings(args.k, args.half_life, path=args.output)
+    forecast = elo.fit(matches)
+    print(f"✅ Replayed in {time.time() - start:.2f}s")
+    print(f"   Pre-match forecast: {forecast['accuracy']*100:.2f}% correct, log loss {forecast['log_loss']:.4f}")
+
+    for match_format in sorted(elo.ratings):
+        top = elo.table(match_format).head(args.top)
+        print(f"\n🏆 {match_format} ({len(elo.ratings[match_format])} teams)")
+        for i, row in top.iterrows():
+            print(f"   {i + 1:3d}. {row['team']:<30} {row['rating']:7.1f}  ({row['matches']} matches)")
+
+    print(f"\n💾 Saved: {elo.save()}")
+
+
+if __name__ == "__main__":
+    main()
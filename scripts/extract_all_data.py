@@ -1,6 +1,8 @@
 import zipfile
 import os
 
+# Optional: the extraction scripts read data/raw/<format>_data.zip in place
+# (see match_sources.py). Unpack only if you want the loose CSV files.
 print("Extracting all cricket data...")
 
 # List of zip files to extract
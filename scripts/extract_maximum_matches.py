@@ -1,42 +1,46 @@
 import pandas as pd
-import os
 import numpy as np
+import argparse
 from collections import defaultdict
 
-print("🚀 ULTRA-ROBUST Match Extractor - Maximum Data Collection")
-print("="*70)
+from ball_store import iter_matches, match_count
+from match_metadata import match_winner
+from match_sources import source_exists
+from parallel_extract import DEFAULT_CHUNKSIZE, default_workers, extract_matches
+from schema_cache import read_with_schema
+
+# Every candidate column smart_extract_match looks at
+SMART_COLUMNS = [
+    'match_id', 'innings', 'inning', 'innings_number', 'batting_team', 'team', 'batting_side',
+    'venue', 'ground', 'city', 'season', 'year', 'start_date', 'date',
+    'runs_off_bat', 'runs', 'runs_scored', 'extras', 'extra',
+    'wicket_type', 'wicket', 'dismissal', 'ball', 'over', 'overs',
+    'winner', 'winning_team', 'match_winner'
+]
 
 def smart_extract_match(file_path, match_format):
-    """Ultra-smart extraction - handles ALL CSV structures"""
+    """Ultra-smart extraction - handles ALL CSV structures
+
+    file_path may also be a ball_store.StoreMatch or a ball-by-ball DataFrame.
+    """
     try:
-        # Try reading with different encodings
+        # Header fingerprint -> cached encoding and column layout
         try:
-            df = pd.read_csv(file_path, encoding='utf-8')
+            df, schema = read_with_schema(file_path, SMART_COLUMNS)
         except:
-            try:
-                df = pd.read_csv(file_path, encoding='latin-1')
-            except:
-                return None
+            return None
         
         if df.empty or len(df) < 20:
             return None
         
         # Find innings column (different names in different files)
-        innings_col = None
-        for col in ['innings', 'inning', 'innings_number']:
-            if col in df.columns:
-                innings_col = col
-                break
+        innings_col = schema.find('innings', 'inning', 'innings_number')
         
         if innings_col is None:
             return None
         
         # Get teams
-        batting_col = None
-        for col in ['batting_team', 'team', 'batting_side']:
-            if col in df.columns:
-                batting_col = col
-                break
+        batting_col = schema.find('batting_team', 'team', 'batting_side')
         
         if batting_col is None:
             return None
@@ -49,15 +53,15 @@ def smart_extract_match(file_path, match_format):
         
         # Get venue
         venue = 'Unknown'
-        for col in ['venue', 'ground', 'city']:
-            if col in df.columns and pd.notna(df[col].iloc[0]):
+        for col in schema.present('venue', 'ground', 'city'):
+            if pd.notna(df[col].iloc[0]):
                 venue = str(df[col].iloc[0])
                 break
         
         # Get season/date
         season = 'Unknown'
-        for col in ['season', 'year', 'start_date', 'date']:
-            if col in df.columns and pd.notna(df[col].iloc[0]):
+        for col in schema.present('season', 'year', 'start_date', 'date'):
+            if pd.notna(df[col].iloc[0]):
                 season = str(df[col].iloc[0])
                 break
         
@@ -69,21 +73,13 @@ def smart_extract_match(file_path, match_format):
             return None
         
         # Find runs column
-        runs_col = None
-        for col in ['runs_off_bat', 'runs', 'runs_scored']:
-            if col in inn1.columns:
-                runs_col = col
-                break
+        runs_col = schema.find('runs_off_bat', 'runs', 'runs_scored')
         
         if runs_col is None:
             return None
         
         # Find extras column
-        extras_col = None
-        for col in ['extras', 'extra']:
-            if col in inn1.columns:
-                extras_col = col
-                break
+        extras_col = schema.find('extras', 'extra')
         
         # Calculate runs
         team1_runs = int(inn1[runs_col].sum())
@@ -98,11 +94,7 @@ def smart_extract_match(file_path, match_format):
             return None
         
         # Wickets
-        wicket_col = None
-        for col in ['wicket_type', 'wicket', 'dismissal']:
-            if col in inn1.columns:
-                wicket_col = col
-                break
+        wicket_col = schema.find('wicket_type', 'wicket', 'dismissal')
         
         team1_wickets = int(inn1[wicket_col].notna().sum()) if wicket_col else 0
         team2_wickets = int(inn2[wicket_col].notna().sum()) if wicket_col else 0
@@ -118,11 +110,7 @@ def smart_extract_match(file_path, match_format):
         team2_sixes = int((inn2[runs_col] == 6).sum())
         
         # Find ball/over column
-        ball_col = None
-        for col in ['ball', 'over', 'overs']:
-            if col in inn1.columns:
-                ball_col = col
-                break
+        ball_col = schema.find('ball', 'over', 'overs')
         
         # Phase analysis
         if ball_col:
@@ -178,17 +166,14 @@ def smart_extract_match(file_path, match_format):
         team1_extras = int(inn1[extras_col].sum()) if extras_col else 0
         team2_extras = int(inn2[extras_col].sum()) if extras_col else 0
         
-        # Winner
-        winner_col = None
-        for col in ['winner', 'winning_team', 'match_winner']:
-            if col in df.columns:
-                winner_col = col
-                break
-        
-        if winner_col and pd.notna(df[winner_col].iloc[0]):
-            winner = df[winner_col].iloc[0]
-        else:
-            winner = team1 if team1_runs > team2_runs else team2
+        # Winner - recorded result from the info file when available
+        winner = match_winner(df)
+        if winner is None:
+            winner_col = schema.find('winner', 'winning_team', 'match_winner')
+            if winner_col and pd.notna(df[winner_col].iloc[0]):
+                winner = df[winner_col].iloc[0]
+            else:
+                winner = team1 if team1_runs > team2_runs else team2
         
         team1_won = 1 if winner == team1 else 0
         
@@ -235,85 +220,103 @@ def smart_extract_match(file_path, match_format):
     except Exception as e:
         return None
 
-# Process all formats
-all_matches = []
-formats = {
-    'T20': 'data/raw/t20/',
-    'IPL': 'data/raw/ipl/',
-    'ODI': 'data/raw/odi/'
-}
 
-print("\n🏏 Processing ALL formats with maximum extraction:")
-print("="*70)
+def main():
+    parser = argparse.ArgumentParser(description="Extract match summaries from all raw formats")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="Worker processes (default: all cores, 1 = serial)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="Match files handed to a worker at a time")
+    args = parser.parse_args()
 
-total_attempted = 0
-total_extracted = 0
+    print("🚀 ULTRA-ROBUST Match Extractor - Maximum Data Collection")
+    print("="*70)
+    print(f"⚙️  Workers: {args.workers}")
 
-for fmt, folder in formats.items():
-    if not os.path.exists(folder):
-        continue
-    
-    files = [f for f in os.listdir(folder) if f.endswith('.csv')]
-    total_attempted += len(files)
-    
-    print(f"\n📂 {fmt} Format: {len(files)} files")
-    
-    extracted = 0
-    for i, file in enumerate(files, 1):
-        if i % 1000 == 0:
-            print(f"   Progress: {i}/{len(files)} | Extracted: {extracted}")
-        
-        result = smart_extract_match(os.path.join(folder, file), fmt)
-        if result:
-            all_matches.append(result)
-            extracted += 1
-    
-    total_extracted += extracted
-    rate = (extracted / len(files) * 100) if files else 0
-    print(f"   ✅ {fmt}: {extracted}/{len(files)} ({rate:.1f}%)")
+    # Process all formats
+    all_matches = []
+    formats = {
+        'T20': 'data/raw/t20/',
+        'IPL': 'data/raw/ipl/',
+        'ODI': 'data/raw/odi/'
+    }
+
+    print("\n🏏 Processing ALL formats with maximum extraction:")
+    print("="*70)
+
+    total_attempted = 0
+    total_extracted = 0
+
+    for fmt, folder in formats.items():
+        if not source_exists(folder):
+            continue
+
+        n_files = match_count(fmt, folder)
+        total_attempted += n_files
+
+        print(f"\n📂 {fmt} Format: {n_files} files")
+
+        extracted = 0
+        tasks = ((source, fmt) for match_id, source in iter_matches(fmt, folder))
+        results = extract_matches(smart_extract_match, tasks, args.workers, args.chunksize)
+        for i, result in enumerate(results, 1):
+            if i % 1000 == 0:
+                print(f"   Progress: {i}/{n_files} | Extracted: {extracted}")
+
+            if result:
+                all_matches.append(result)
+                extracted += 1
+
+        total_extracted += extracted
+        rate = (extracted / n_files * 100) if n_files else 0
+        print(f"   ✅ {fmt}: {extracted}/{n_files} ({rate:.1f}%)")
+
+    # Create DataFrame
+    print("\n" + "="*70)
+    print("📊 Creating Dataset...")
+
+    df = pd.DataFrame(all_matches)
+    print(f"✅ Extracted: {len(df)} matches")
+    print(f"📊 Overall Success Rate: {(total_extracted/total_attempted*100):.1f}%")
 
-# Create DataFrame
-print("\n" + "="*70)
-print("📊 Creating Dataset...")
+    # Clean
+    initial = len(df)
+    df = df.drop_duplicates(subset=['team1', 'team2', 'team1_runs', 'venue'], keep='first')
+    df = df[df['team1_runs'] >= 30]
+    df = df[df['team2_runs'] >= 30]
+    final = len(df)
 
-df = pd.DataFrame(all_matches)
-print(f"✅ Extracted: {len(df)} matches")
-print(f"📊 Overall Success Rate: {(total_extracted/total_attempted*100):.1f}%")
+    print(f"✅ After cleaning: {final} matches ({initial-final} duplicates removed)")
 
-# Clean
-initial = len(df)
-df = df.drop_duplicates(subset=['team1', 'team2', 'team1_runs', 'venue'], keep='first')
-df = df[df['team1_runs'] >= 30]
-df = df[df['team2_runs'] >= 30]
-final = len(df)
+    # Save
+    df.to_csv('data/processed/complete_matches_dataset.csv', index=False)
+    print(f"💾 Saved: complete_matches_dataset.csv")
 
-print(f"✅ After cleaning: {final} matches ({initial-final} duplicates removed)")
+    # Stats
+    print("\n" + "="*70)
+    print("📊 DATASET SUMMARY:")
+    print("="*70)
+    print(f"\n📈 Total Matches: {len(df)}")
+    print(f"\n🏏 By Format:")
+    print(df['match_format'].value_counts())
+    print(f"\n🌍 Unique Venues: {df['venue'].nunique()}")
+    print(f"🏏 Unique Teams: {pd.concat([df['team1'], df['team2']]).nunique()}")
+    print(f"\n📊 Batting First Win Rate: {df['team1_won'].mean()*100:.1f}%")
 
-# Save
-df.to_csv('data/processed/complete_matches_dataset.csv', index=False)
-print(f"💾 Saved: complete_matches_dataset.csv")
+    print("\n🏆 Top 15 Teams:")
+    teams = pd.concat([df['team1'], df['team2']]).value_counts().head(15)
+    for i, (team, count) in enumerate(teams.items(), 1):
+        print(f"{i:2d}. {team:30s}: {count:4d} matches")
 
-# Stats
-print("\n" + "="*70)
-print("📊 DATASET SUMMARY:")
-print("="*70)
-print(f"\n📈 Total Matches: {len(df)}")
-print(f"\n🏏 By Format:")
-print(df['match_format'].value_counts())
-print(f"\n🌍 Unique Venues: {df['venue'].nunique()}")
-print(f"🏏 Unique Teams: {pd.concat([df['team1'], df['team2']]).nunique()}")
-print(f"\n📊 Batting First Win Rate: {df['team1_won'].mean()*100:.1f}%")
+    print("\n📍 Top 15 Venues:")
+    venues = df['venue'].value_counts().head(15)
+    for i, (venue, count) in enumerate(venues.items(), 1):
+        print(f"{i:2d}. {venue:40s}: {count:4d} matches")
 
-print("\n🏆 Top 15 Teams:")
-teams = pd.concat([df['team1'], df['team2']]).value_counts().head(15)
-for i, (team, count) in enumerate(teams.items(), 1):
-    print(f"{i:2d}. {team:30s}: {count:4d} matches")
+    print("\n" + "="*70)
+    print("🎉 DATA EXTRACTION COMPLETE!")
+    print("="*70)
 
-print("\n📍 Top 15 Venues:")
-venues = df['venue'].value_counts().head(15)
-for i, (venue, count) in enumerate(venues.items(), 1):
-    print(f"{i:2d}. {venue:40s}: {count:4d} matches")
 
-print("\n" + "="*70)
-print("🎉 DATA EXTRACTION COMPLETE!")
-print("="*70)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
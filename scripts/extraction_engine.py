@@ -0,0 +1,269 @@
+"""Single-pass, multi-output extraction engine.
+
+The match summary (final_data_extraction.py), the per-innings batting and
+bowling performances (player_database.py) and the venue rows
+(analyze_venues.py) used to each re-read and re-filter every ball-by-ball
+file. The engine reads each match once and hands the frame to a list of
+pluggable collectors, each of which emits rows for one or more tables.
+Matches travel in batches of up to --batch-size (same format), so a
+collector with a vectorized path (players) aggregates a whole batch at once.
+
+Usage:
+  python scripts/extraction_engine.py                   # all collectors
+  python scripts/extraction_engine.py --collectors quality venues
+  python scripts/extraction_engine.py --incremental     # only new/changed files
+  python scripts/extraction_engine.py --workers 8 --batch-size 200
+
+Adding a derived table means writing a Collector subclass and registering
+it in COLLECTORS; it then rides along on the same scan of data/raw.
+
+Every table is put in (format, match_id) order before finalize, whether its
+rows came from the store, the raw folders or the ingest manifest, so the
+quality dedupe keeps the same duplicate as final_data_extraction.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import time
+from typing import Dict, List, Optional, Set
+
+import pandas as pd
+
+from analyze_venues import aggregate_venues, venue_match_row
+from ball_store import iter_matches, match_count, read_match
+from final_data_extraction import extract_quality_match, sort_matches
+from ingest_manifest import IngestManifest
+from match_sources import source_exists
+from parallel_extract import batch_tasks, extract_matches
+from player_database import BATCH_MATCHES, extract_batch_performances
+
+
+FORMATS = {
+    'T20': 'data/raw/t20/',
+    'IPL': 'data/raw/ipl/',
+    'ODI': 'data/raw/odi/'
+}
+
+Rows = Dict[str, List[dict]]
+
+
+class Collector:
+    """Turns one match's balls into rows for one or more tables.
+
+    ``tables`` maps each table the collector emits to the CSV it is saved
+    to. ``formats`` restricts the collector to some formats (None = all).
+    """
+
+    name = ''
+    tables: Dict[str, str] = {}
+    formats: Optional[Set[str]] = None
+
+    def accepts(self, match_format: str) -> bool:
+        return self.formats is None or match_format in self.formats
+
+    def collect(self, balls: pd.DataFrame, match_format: str) -> Rows:
+        raise NotImplementedError
+
+    def collect_batch(self, matches: List[pd.DataFrame], match_format: str) -> List[Rows]:
+        """Rows for each of several matches of one format; override for a vectorized path."""
+        return [self.collect(balls, match_format) for balls in matches]
+
+    def finalize(self, table: str, frame: pd.DataFrame) -> pd.DataFrame:
+        """Table-level post-processing once every match has been collected."""
+        return frame
+
+
+class QualityMatchCollector(Collector):
+    """Match summaries -> quality_matches_dataset.csv"""
+
+    name = 'quality'
+    tables = {'quality': 'data/processed/quality_matches_dataset.csv'}
+
+    def collect(self, balls, match_format):
+        result = extract_quality_match(balls, match_format)
+        return {'quality': [result] if result else []}
+
+    def finalize(self, table, frame):
+        if len(frame) == 0:
+            return frame
+        return frame.drop_duplicates(subset=['team1', 'team2', 'team1_runs', 'venue', 'season'],
+                                     keep='first')
+
+
+class PlayerPerformanceCollector(Collector):
+    """Per-innings batting and bowling rows -> data/processed/players/"""
+
+    name = 'players'
+    tables = {
+        'batting': 'data/processed/players/batting_performances.csv',
+        'bowling': 'data/processed/players/bowling_performances.csv',
+    }
+
+    def collect(self, balls, match_format):
+        return self.collect_batch([balls], match_format)[0]
+
+    def collect_batch(self, matches, match_format):
+        # One aggregate_performances pass over the whole batch
+        rows = []
+        for performances in extract_batch_performances(matches, match_format):
+            batting, bowling = performances or ([], [])
+            rows.append({'batting': batting, 'bowling': bowling})
+        return rows
+
+
+class VenueCollector(Collector):
+    """Innings totals per match -> venue_statistics.csv (T20 and IPL only)"""
+
+    name = 'venues'
+    tables = {'venues': 'data/processed/venue_statistics.csv'}
+    formats = {'T20', 'IPL'}
+
+    def collect(self, balls, match_format):
+        try:
+            row = venue_match_row(balls)
+        except Exception:
+            row = None
+        return {'venues': [row] if row else []}
+
+    def finalize(self, table, frame):
+        if len(frame) == 0:
+            return frame
+        return aggregate_venues(frame).reset_index()
+
+
+COLLECTORS = {c.name: c for c in (QualityMatchCollector, PlayerPerformanceCollector, VenueCollector)}
+
+
+def collect_matches(collectors: List[Collector], sources: list, match_format: str) -> List[Rows]:
+    """Read a batch of matches once each and run every collector that accepts their format."""
+    rows: List[Rows] = [{table: [] for c in collectors for table in c.tables} for _ in sources]
+    frames = {}
+    for i, source in enumerate(sources):
+        try:
+            frames[i] = read_match(source, low_memory=False)
+        except Exception:
+            pass
+    if not frames:
+        return rows
+    for collector in collectors:
+        if collector.accepts(match_format):
+            batch = collector.collect_batch(list(frames.values()), match_format)
+            for i, match_rows in zip(frames, batch):
+                rows[i].update(match_rows)
+    return rows
+
+
+class ExtractionEngine:
+    def __init__(self, collectors: List[Collector], formats: Dict[str, str] = FORMATS,
+                 workers: int = 1, batch_size: int = BATCH_MATCHES):
+        self.collectors = collectors
+        self.formats = formats
+        self.workers = workers
+        self.batch_size = batch_size
+
+    @property
+    def tables(self) -> List[str]:
+        return [table for c in self.collectors for table in c.tables]
+
+    def _collect(self, tasks):
+        """Yield one Rows per ``(source, match_format)`` task, in task order, a batch at a time."""
+        func = functools.partial(collect_matches, self.collectors)
+        # Each pool task is already a whole batch
+        for batch in extract_matches(func, batch_tasks(tasks, self.batch_size), self.workers, chunksize=1):
+            yield from batch
+
+    def run(self) -> Dict[str, pd.DataFrame]:
+        """Full pass over every format; returns finalized tables."""
+        collected: Dict[str, List[dict]] = {table: [] for table in self.tables}
+
+        for fmt, folder in self.formats.items():
+            if not source_exists(folder):
+                continue
+            n_files = match_count(fmt, folder)
+            print(f"\n📂 {fmt}: {n_files} files")
+            match_ids = []
+
+            def tasks():
+                for match_id, source in iter_matches(fmt, folder):
+                    match_ids.append(match_id)
+                    yield source, fmt
+
+            for i, rows in enumerate(self._collect(tasks())):
+                if (i + 1) % 1000 == 0:
+                    print(f"   Progress: {i + 1}/{n_files}")
+                for table, table_rows in rows.items():
+                    collected[table].extend({'match_id': match_ids[i], '_format': fmt, **row}
+                                            for row in table_rows)
+
+        return self._finalize({t: pd.DataFrame(r) for t, r in collected.items()})
+
+    def run_incremental(self, manifest: Optional[IngestManifest] = None) -> Dict[str, pd.DataFrame]:
+        """Parse only files added/changed for any collector table, patch the rest."""
+        manifest = manifest or IngestManifest()
+        plan = manifest.scan(self.formats, self.tables)
+        print(f"\n📋 Manifest: {plan.summary()}")
+
+        entries = plan.to_parse
+        tasks = ((entry.path, entry.match_format) for entry in entries)
+        for i, (entry, rows) in enumerate(zip(entries, self._collect(tasks)), 1):
+            if i % 1000 == 0:
+                print(f"   Progress: {i}/{len(entries)}")
+            manifest.record(entry, rows)
+
+        manifest.forget(plan.removed)
+        match_formats = {match_id: entry['format'] for match_id, entry in manifest.entries.items()}
+        tables = {}
+        for table in self.tables:
+            frame = manifest.table(table)
+            tables[table] = frame.assign(_format=frame['match_id'].map(match_formats)) if len(frame) else frame
+        manifest.save()
+        return self._finalize(tables)
+
+    def _finalize(self, tables: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Order each table's rows by (format, match_id), drop the bookkeeping columns, finalize."""
+        for collector in self.collectors:
+            for table in collector.tables:
+                frame = sort_matches(tables[table], self.formats, format_column='_format')
+                frame = frame.drop(columns='_format', errors='ignore')
+                tables[table] = collector.finalize(table, frame)
+        return tables
+
+    def save(self, tables: Dict[str, pd.DataFrame]) -> None:
+        for collector in self.collectors:
+            for table, path in collector.tables.items():
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tables[table].to_csv(path, index=False)
+                print(f"💾 Saved: {path} ({len(tables[table])} rows)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract every derived table in one pass over data/raw")
+    parser.add_argument("--collectors", nargs="+", choices=list(COLLECTORS), default=list(COLLECTORS),
+                        help="Collectors to run (default: all)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only parse raw files added or changed since the last run")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_MATCHES,
+                        help=f"Matches per collector batch and worker task (default: {BATCH_MATCHES})")
+    args = parser.parse_args()
+
+    print("🚀 SINGLE-PASS EXTRACTION ENGINE")
+    print("=" * 70)
+    print(f"🧩 Collectors: {', '.join(args.collectors)}")
+
+    engine = ExtractionEngine([COLLECTORS[name]() for name in args.collectors],
+                              workers=args.workers, batch_size=args.batch_size)
+    start = time.time()
+    tables = engine.run_incremental() if args.incremental else engine.run()
+
+    print("\n" + "=" * 70)
+    engine.save(tables)
+    print(f"\n🎉 Extraction complete in {time.time() - start:.1f}s")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Versioned feature store for the training scripts and the web app.
+
+A feature set (see match_features.py) is built once per dataset version and
+written to ``data/features/<set>/<version>/``:
+
+  features.parquet    model matrix X plus the team1_won target
+  venue_stats.parquet venue table the trainer saves for the predictors
+  team_stats.pkl      {team: {...}} dict the trainer pickles
+  manifest.json       set name, version, dataset hash, code hash, features
+
+The version hashes the dataset bytes, the set name and the source of
+match_features.py and team_statistics.py. Editing either module or
+re-extracting the dataset gives a new version, so stale features are never
+reused. Later runs read the parquet instead of rebuilding.
+
+Usage:
+  python scripts/feature_store.py                       # build every set
+  python scripts/feature_store.py --sets quick --rebuild
+  python scripts/feature_store.py --list
+
+From a trainer:
+  from feature_store import load_features
+  fs = load_features('quick')          # builds on first use
+  X, y = fs.X, fs.y
+
+The trainers record ``feature_set`` and ``feature_version`` in
+models/model_info.pkl. The web app reads that version's team and venue
+tables back with ``load_serving_tables``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import match_features
+import team_statistics
+from match_features import FEATURE_SETS, TARGET, FeatureSet
+
+
+DATASET_PATH = "data/processed/quality_matches_dataset.csv"
+FEATURE_ROOT = "data/features"
+
+# Modules whose source is part of the version
+CODE_MODULES = (match_features, team_statistics)
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_hash() -> str:
+    """Hash of the feature code; changes whenever a builder changes."""
+    digest = hashlib.sha1()
+    for module in CODE_MODULES:
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def feature_version(name: str, dataset_path: str = DATASET_PATH) -> str:
+    digest = hashlib.sha1()
+    for part in (name, file_hash(dataset_path), code_hash()):
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def version_dir(name: str, version: str, root: str = FEATURE_ROOT) -> str:
+    return os.path.join(root, name, version)
+
+
+def save_features(fs: FeatureSet, dataset_path: str = DATASET_PATH, root: str = FEATURE_ROOT) -> str:
+    """Write a built feature set under its version; returns the directory."""
+    folder = version_dir(fs.name, fs.version, root)
+    staging = folder + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    frame = fs.X.copy()
+    frame[TARGET] = fs.y.to_numpy()
+    frame.reset_index(drop=True).to_parquet(os.path.join(staging, "features.parquet"), index=False)
+    fs.venue_stats.to_parquet(os.path.join(staging, "venue_stats.parquet"), index=False)
+    with open(os.path.join(staging, "team_stats.pkl"), "wb") as f:
+        pickle.dump(fs.team_stats, f)
+
+    manifest = {
+        "name": fs.name,
+        "version": fs.version,
+        "dataset": dataset_path,
+        "dataset_sha1": file_hash(dataset_path),
+        "code_sha1": code_hash(),
+        "features": fs.features,
+        "rows": len(fs.X),
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(os.path.join(staging, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Swap in whole, so a crashed build never leaves a half-written version
+    shutil.rmtree(folder, ignore_errors=True)
+    os.replace(staging, folder)
+    return folder
+
+
+def read_features(name: str, version: str, root: str = FEATURE_ROOT) -> FeatureSet:
+    """A stored feature set by name and version."""
+    folder = version_dir(name, version, root)
+    with open(os.path.join(folder, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    frame = pd.read_parquet(os.path.join(folder, "features.parquet"))
+    with open(os.path.join(folder, "team_stats.pkl"), "rb") as f:
+        team_stats = pickle.load(f)
+    venue_stats = pd.read_parquet(os.path.join(folder, "venue_stats.parquet"))
+    return FeatureSet(name, frame[manifest["features"]], frame[TARGET], team_stats, venue_stats, version)
+
+
+def load_features(name: str, dataset_path: str = DATASET_PATH, root: str = FEATURE_ROOT,
+                  rebuild: bool = False) -> FeatureSet:
+    """The feature set for the current dataset and code, built only if not stored yet."""
+    version = feature_version(name, dataset_path)
+    if not rebuild and os.path.exists(os.path.join(version_dir(name, version, root), "manifest.json")):
+        fs = read_features(name, version, root)
+        print(f"⚡ Features '{name}' {version} loaded from store ({len(fs.X)} rows)")
+        return fs
+
+    matches = pd.read_csv(dataset_path)
+    print(f"✅ Loaded {len(matches)} matches")
+    fs = FEATURE_SETS[name](matches)
+    fs.version = version
+    save_features(fs, dataset_path, root)
+    print(f"💾 Features '{name}' {version} stored ({len(fs.X)} rows)")
+    return fs
+
+
+def list_versions(root: str = FEATURE_ROOT) -> List[Dict[str, Any]]:
+    manifests = []
+    for name in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        for version in sorted(os.listdir(os.path.join(root, name))):
+            path = os.path.join(root, name, version, "manifest.json")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    manifests.append(json.load(f))
+    return manifests
+
+
+def load_serving_tables(model_info: Dict[str, Any],
+                        root: str = FEATURE_ROOT) -> Optional[Tuple[Dict[str, Dict[str, Any]], pd.DataFrame]]:
+    """(team_stats, venue_stats) stored with the model's feature version.
+
+    None if the model predates the store or that version is not on disk;
+    callers then fall back to models/team_statistics.pkl and the venue CSV.
+    """
+    name, version = model_info.get("feature_set"), model_info.get("feature_version")
+    if not name or not version:
+        return None
+    folder = version_dir(name, version, root)
+    if not os.path.exists(os.path.join(folder, "manifest.json")):
+        return None
+    with open(os.path.join(folder, "team_stats.pkl"), "rb") as f:
+        team_stats = pickle.load(f)
+    return team_stats, pd.read_parquet(os.path.join(folder, "venue_stats.parquet"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Materialize engineered match features per dataset version")
+    parser.add_argument("--sets", nargs="+", choices=list(FEATURE_SETS), default=list(FEATURE_SETS))
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--root", default=FEATURE_ROOT)
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild even if the version is stored")
+    parser.add_argument("--list", action="store_true", help="List stored versions and exit")
+    args = parser.parse_args()
+
+    print("🗄️  FEATURE STORE")
+    print("=" * 70)
+
+    if args.list:
+        for m in list_versions(args.root):
+            print(f"   {m['name']:<9} {m['version']}  {m['rows']:>6} rows  {len(m['features'])} features  {m['built_at']}")
+        return
+
+    for name in args.sets:
+        start = time.time()
+        fs = load_features(name, args.dataset, args.root, rebuild=args.rebuild)
+        print(f"   {name}: {len(fs.features)} features in {time.time() - start:.2f}s\n")
+
+
+if __name__ == "__main__":
+    main()
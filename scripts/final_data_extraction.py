@@ -1,22 +1,35 @@
 import pandas as pd
-import os
 import numpy as np
+import argparse
 
-print("🚀 EXTRACTING HIGH-QUALITY MATCH DATA FOR 85%+ ACCURACY")
-print("="*70)
+from ball_store import iter_matches, match_count
+from ingest_manifest import IngestManifest
+from match_metadata import match_winner
+from match_sources import source_exists
+from schema_cache import read_with_schema
+
+# Every candidate column extract_quality_match looks at
+QUALITY_COLUMNS = [
+    'match_id', 'innings', 'inning', 'batting_team', 'team', 'venue', 'ground', 'city',
+    'season', 'year', 'runs_off_bat', 'runs', 'extras', 'extra',
+    'wicket_type', 'wicket', 'player_dismissed', 'winner', 'winning_team'
+]
 
 def extract_quality_match(file_path, match_format):
-    """Extract only HIGH QUALITY matches with complete data"""
+    """Extract only HIGH QUALITY matches with complete data
+
+    file_path may also be a ball_store.StoreMatch or a ball-by-ball DataFrame.
+    """
     try:
-        df = pd.read_csv(file_path, encoding='utf-8', low_memory=False)
+        df, schema = read_with_schema(file_path, QUALITY_COLUMNS, encodings=['utf-8'])
         
         if df.empty or len(df) < 30:
             return None
         
         # Find columns
-        innings_col = next((c for c in ['innings', 'inning'] if c in df.columns), None)
-        batting_col = next((c for c in ['batting_team', 'team'] if c in df.columns), None)
-        runs_col = next((c for c in ['runs_off_bat', 'runs'] if c in df.columns), None)
+        innings_col = schema.find('innings', 'inning')
+        batting_col = schema.find('batting_team', 'team')
+        runs_col = schema.find('runs_off_bat', 'runs')
         
         if not all([innings_col, batting_col, runs_col]):
             return None
@@ -29,8 +42,8 @@ def extract_quality_match(file_path, match_format):
         
         # Venue - MUST HAVE VALID VENUE
         venue = None
-        for col in ['venue', 'ground', 'city']:
-            if col in df.columns and pd.notna(df[col].iloc[0]):
+        for col in schema.present('venue', 'ground', 'city'):
+            if pd.notna(df[col].iloc[0]):
                 v = str(df[col].iloc[0]).strip()
                 if len(v) > 2 and v != 'Unknown':
                     venue = v
@@ -41,8 +54,8 @@ def extract_quality_match(file_path, match_format):
         
         # Season
         season = 'Unknown'
-        for col in ['season', 'year']:
-            if col in df.columns and pd.notna(df[col].iloc[0]):
+        for col in schema.present('season', 'year'):
+            if pd.notna(df[col].iloc[0]):
                 season = str(df[col].iloc[0])
                 break
         
@@ -55,7 +68,7 @@ def extract_quality_match(file_path, match_format):
             return None
         
         # Runs
-        extras_col = next((c for c in ['extras', 'extra'] if c in inn1.columns), None)
+        extras_col = schema.find('extras', 'extra')
         
         team1_runs = int(inn1[runs_col].sum())
         team2_runs = int(inn2[runs_col].sum())
@@ -73,7 +86,7 @@ def extract_quality_match(file_path, match_format):
                 return None
         
         # Wickets
-        wicket_col = next((c for c in ['wicket_type', 'wicket', 'player_dismissed'] if c in inn1.columns), None)
+        wicket_col = schema.find('wicket_type', 'wicket', 'player_dismissed')
         team1_wickets = int(inn1[wicket_col].notna().sum()) if wicket_col else 0
         team2_wickets = int(inn2[wicket_col].notna().sum()) if wicket_col else 0
         
@@ -96,12 +109,14 @@ def extract_quality_match(file_path, match_format):
         team2_sixes = int((inn2[runs_col] == 6).sum())
         team2_boundaries = team2_fours + team2_sixes
         
-        # Winner
-        winner_col = next((c for c in ['winner', 'winning_team'] if c in df.columns), None)
-        if winner_col and pd.notna(df[winner_col].iloc[0]):
-            winner = str(df[winner_col].iloc[0])
-        else:
-            winner = team1 if team1_runs > team2_runs else team2
+        # Winner - recorded result from the info file when available
+        winner = match_winner(df)
+        if winner is None:
+            winner_col = schema.find('winner', 'winning_team')
+            if winner_col and pd.notna(df[winner_col].iloc[0]):
+                winner = str(df[winner_col].iloc[0])
+            else:
+                winner = team1 if team1_runs > team2_runs else team2
         
         team1_won = 1 if winner == team1 else 0
         
@@ -131,73 +146,128 @@ def extract_quality_match(file_path, match_format):
     except Exception as e:
         return None
 
-# Process all formats
-all_matches = []
-formats = {
-    'T20': 'data/raw/t20/',
-    'IPL': 'data/raw/ipl/',
-    'ODI': 'data/raw/odi/'
-}
 
-print("\n📊 Processing with QUALITY FILTERS for maximum accuracy...")
-print("="*70)
+def sort_matches(df, formats, format_column='match_format'):
+    """Order rows by (format, match_id) and drop the match_id column
 
-for fmt, folder in formats.items():
-    if not os.path.exists(folder):
-        continue
-    
-    files = [f for f in os.listdir(folder) if f.endswith('.csv')]
-    print(f"\n📂 {fmt}: Processing {len(files)} files...")
+    The store yields matches in season-partition order and the raw folders
+    in filename order, so full and incremental runs sort on the same key
+    before the keep='first' dedupe picks which duplicate survives. Rows of
+    one match keep their order.
+    """
+    if df.empty:
+        return df.drop(columns='match_id', errors='ignore')
+    rank = {fmt: i for i, fmt in enumerate(formats)}
+    df = df.assign(_format_rank=df[format_column].map(rank), match_id=df['match_id'].astype(str))
+    df = df.sort_values(['_format_rank', 'match_id'], kind='stable')
+    return df.drop(columns=['_format_rank', 'match_id']).reset_index(drop=True)
+
+
+def extract_incremental(formats):
+    """Parse only added/changed files and patch the rest in from the manifest"""
+    manifest = IngestManifest()
+    plan = manifest.scan(formats, ['quality'])
+    print(f"\n📋 Manifest: {plan.summary()}")
     
-    extracted = 0
-    for i, file in enumerate(files, 1):
+    to_parse = plan.to_parse
+    for i, entry in enumerate(to_parse, 1):
         if i % 1000 == 0:
-            print(f"   Progress: {i}/{len(files)} | Extracted: {extracted}")
+            print(f"   Progress: {i}/{len(to_parse)}")
         
-        result = extract_quality_match(os.path.join(folder, file), fmt)
-        if result:
-            all_matches.append(result)
-            extracted += 1
+        result = extract_quality_match(entry.path, entry.match_format)
+        manifest.record(entry, {'quality': [result] if result else []})
     
-    print(f"   ✅ {fmt}: {extracted} quality matches extracted")
-
-# Create DataFrame
-df = pd.DataFrame(all_matches)
-print(f"\n✅ Total extracted: {len(df)} matches")
-
-# Remove duplicates
-initial = len(df)
-df = df.drop_duplicates(subset=['team1', 'team2', 'team1_runs', 'venue', 'season'], keep='first')
-print(f"✅ After deduplication: {len(df)} matches ({initial - len(df)} duplicates removed)")
-
-# Save
-df.to_csv('data/processed/quality_matches_dataset.csv', index=False)
-print(f"💾 Saved: quality_matches_dataset.csv")
-
-# Statistics
-print("\n" + "="*70)
-print("📊 DATASET STATISTICS:")
-print("="*70)
-print(f"\n📈 Total Matches: {len(df)}")
-print(f"\n🏏 By Format:")
-print(df['match_format'].value_counts())
-print(f"\n🌍 Unique Venues: {df['venue'].nunique()}")
-print(f"🏏 Unique Teams: {pd.concat([df['team1'], df['team2']]).nunique()}")
-
-print("\n🏆 Top 15 Teams:")
-teams = pd.concat([df['team1'], df['team2']]).value_counts().head(15)
-for i, (team, count) in enumerate(teams.items(), 1):
-    print(f"{i:2d}. {team:35s}: {count:4d} matches")
-
-print("\n📍 Top 20 Venues:")
-venues = df['venue'].value_counts().head(20)
-for i, (venue, count) in enumerate(venues.items(), 1):
-    print(f"{i:2d}. {venue:45s}: {count:3d} matches")
-
-print("\n⚖️ Win Balance:")
-print(f"Batting First Wins: {df['team1_won'].mean()*100:.1f}%")
-print(f"Chasing Wins: {(1-df['team1_won'].mean())*100:.1f}%")
-
-print("\n" + "="*70)
-print("🎉 HIGH-QUALITY DATASET READY!")
-print("="*70)
\ No newline at end of file
+    manifest.forget(plan.removed)
+    df = sort_matches(manifest.table('quality'), formats)
+    manifest.save()
+    print(f"   ✅ Re-parsed {len(to_parse)} files, {len(df)} quality matches in total")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract high-quality match summaries")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only parse raw files added or changed since the last run")
+    args = parser.parse_args()
+    
+    print("🚀 EXTRACTING HIGH-QUALITY MATCH DATA FOR 85%+ ACCURACY")
+    print("="*70)
+    
+    # Process all formats
+    all_matches = []
+    formats = {
+        'T20': 'data/raw/t20/',
+        'IPL': 'data/raw/ipl/',
+        'ODI': 'data/raw/odi/'
+    }
+
+    print("\n📊 Processing with QUALITY FILTERS for maximum accuracy...")
+    print("="*70)
+
+    if args.incremental:
+        df = extract_incremental(formats)
+    else:
+        for fmt, folder in formats.items():
+            if not source_exists(folder):
+                continue
+
+            n_files = match_count(fmt, folder)
+            print(f"\n📂 {fmt}: Processing {n_files} files...")
+
+            extracted = 0
+            for i, (match_id, source) in enumerate(iter_matches(fmt, folder), 1):
+                if i % 1000 == 0:
+                    print(f"   Progress: {i}/{n_files} | Extracted: {extracted}")
+
+                result = extract_quality_match(source, fmt)
+                if result:
+                    all_matches.append({'match_id': match_id, **result})
+                    extracted += 1
+
+            print(f"   ✅ {fmt}: {extracted} quality matches extracted")
+
+        # Create DataFrame
+        df = sort_matches(pd.DataFrame(all_matches), formats)
+
+    print(f"\n✅ Total extracted: {len(df)} matches")
+
+    # Remove duplicates
+    initial = len(df)
+    df = df.drop_duplicates(subset=['team1', 'team2', 'team1_runs', 'venue', 'season'], keep='first')
+    print(f"✅ After deduplication: {len(df)} matches ({initial - len(df)} duplicates removed)")
+
+    # Save
+    df.to_csv('data/processed/quality_matches_dataset.csv', index=False)
+    print(f"💾 Saved: quality_matches_dataset.csv")
+
+    # Statistics
+    print("\n" + "="*70)
+    print("📊 DATASET STATISTICS:")
+    print("="*70)
+    print(f"\n📈 Total Matches: {len(df)}")
+    print(f"\n🏏 By Format:")
+    print(df['match_format'].value_counts())
+    print(f"\n🌍 Unique Venues: {df['venue'].nunique()}")
+    print(f"🏏 Unique Teams: {pd.concat([df['team1'], df['team2']]).nunique()}")
+
+    print("\n🏆 Top 15 Teams:")
+    teams = pd.concat([df['team1'], df['team2']]).value_counts().head(15)
+    for i, (team, count) in enumerate(teams.items(), 1):
+        print(f"{i:2d}. {team:35s}: {count:4d} matches")
+
+    print("\n📍 Top 20 Venues:")
+    venues = df['venue'].value_counts().head(20)
+    for i, (venue, count) in enumerate(venues.items(), 1):
+        print(f"{i:2d}. {venue:45s}: {count:3d} matches")
+
+    print("\n⚖️ Win Balance:")
+    print(f"Batting First Wins: {df['team1_won'].mean()*100:.1f}%")
+    print(f"Chasing Wins: {(1-df['team1_won'].mean())*100:.1f}%")
+
+    print("\n" + "="*70)
+    print("🎉 HIGH-QUALITY DATASET READY!")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Budgeted hyperparameter search for the match model (Hyperband).
+
+The trainers' learner settings (n_estimators=1000, max_depth=35/30/25) are
+hand-picked, and each full trial costs minutes. This search samples
+random configurations of RF, XGB, LGBM and GB. It gives them a small
+resource first and promotes only the best third of each rung to a resource
+three times larger (successive halving). Hyperband repeats that over
+several brackets, from many cheap configs to a few full-size ones.
+
+The resource r in (0, 1] scales both n_estimators (r x --max-estimators)
+and the fraction of training rows each fit sees (max(r, --min-fraction)).
+The search stops launching fits once --budget seconds have passed.
+
+Every fit reads the cached feature matrix from feature_store.py. It is
+scored on a validation split carved out of the trainers' 80% training
+split, so the test rows stay unseen. Each model's serving latency is
+measured too: one-row predict_proba, as the web app calls it, and
+per-row time on a batch. The output is a Pareto table of validation
+accuracy vs. one-row latency.
+
+Usage:
+  python scripts/hyperparameter_search.py --budget 600
+  python scripts/hyperparameter_search.py --features quick --learners xgb lgbm --budget 300
+  python scripts/hyperparameter_search.py --max-estimators 1000 --brackets 4 --output search.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMClassifier
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from xgboost import XGBClassifier
+
+from feature_store import load_features
+
+
+SEARCH_ROOT = "models/search"
+ETA = 3
+
+SEARCH_SPACES: Dict[str, Tuple[type, Dict[str, List[Any]]]] = {
+    "rf": (RandomForestClassifier, {
+        "max_depth": [6, 10, 16, 24, 35, None],
+        "min_samples_leaf": [1, 2, 4, 8],
+        "max_features": ["sqrt", "log2", 0.5],
+        "class_weight": [None, "balanced"],
+    }),
+    "xgb": (XGBClassifier, {
+        "max_depth": [3, 4, 6, 8, 12, 30],
+        "learning_rate": [0.015, 0.03, 0.05, 0.1, 0.2],
+        "subsample": [0.7, 0.8, 1.0],
+        "colsample_bytree": [0.6, 0.8, 1.0],
+        "min_child_weight": [1, 3, 5],
+    }),
+    "lgbm": (LGBMClassifier, {
+        "max_depth": [-1, 4, 8, 16, 30],
+        "num_leaves": [15, 31, 63, 127],
+        "learning_rate": [0.015, 0.03, 0.05, 0.1, 0.2],
+        "subsample": [0.7, 0.8, 1.0],
+        "colsample_bytree": [0.6, 0.8, 1.0],
+        "min_child_samples": [10, 20, 40],
+    }),
+    "gb": (GradientBoostingClassifier, {
+        "max_depth": [2, 3, 4, 6, 8, 25],
+        "learning_rate": [0.015, 0.03, 0.05, 0.1, 0.2],
+        "subsample": [0.7, 0.8, 1.0],
+    }),
+}
+
+FIXED_PARAMS: Dict[str, Dict[str, Any]] = {
+    "rf": {"random_state": 42, "n_jobs": -1},
+    "xgb": {"random_state": 42, "n_jobs": -1, "verbosity": 0},
+    "lgbm": {"random_state": 42, "n_jobs": -1, "verbose": -1, "subsample_freq": 1},
+    "gb": {"random_state": 42},
+}
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def sample_config(rng: random.Random, learners: List[str]) -> Dict[str, Any]:
+    learner = rng.choice(learners)
+    space = SEARCH_SPACES[learner][1]
+    return {"learner": learner, "params": {k: rng.choice(v) for k, v in space.items()}}
+
+
+def serving_latency(model, X: pd.DataFrame, repeats: int = 30) -> Tuple[float, float]:
+    """(median one-row predict_proba ms, batch predict_proba us per row)."""
+    row = X.iloc[:1]
+    model.predict_proba(row)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(row)
+        times.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    model.predict_proba(X)
+    batch = time.perf_counter() - start
+    return float(np.median(times)) * 1e3, batch / len(X) * 1e6
+
+
+class HyperbandSearch:
+    """Hyperband over (n_estimators, data fraction) with a wall-clock budget."""
+
+    def __init__(self, X_fit: pd.DataFrame, y_fit: pd.Series, X_val: pd.DataFrame, y_val: pd.Series,
+                 learners: List[str], max_estimators: int = 1000, min_fraction: float = 0.2,
+                 brackets: int = 3, budget: float = 600, seed: int = 42):
+        self.X_fit, self.y_fit = X_fit, y_fit
+        self.X_val, self.y_val = X_val, y_val
+        self.learners = learners
+        self.max_estimators = max_estimators
+        self.min_fraction = min_fraction
+        self.s_max = brackets
+        self.budget = budget
+        self.rng = random.Random(seed)
+        self.results: List[Dict[str, Any]] = []
+        self.deadline: Optional[float] = None
+
+    def evaluate(self, config_id: int, config: Dict[str, Any], resource: float,
+                 bracket: int, rung: int) -> Dict[str, Any]:
+        if time.time() > self.deadline:
+            raise BudgetExceeded()
+        learner = config["learner"]
+        n_estimators = max(10, int(round(resource * self.max_estimators)))
+        fraction = max(resource, self.min_fraction)
+
+        X, y = self.X_fit, self.y_fit
+        if fraction < 1.0:
+            X, _, y, _ = train_test_split(X, y, train_size=fraction, random_state=42, stratify=y)
+
+        model = SEARCH_SPACES[learner][0](n_estimators=n_estimators, **config["params"], **FIXED_PARAMS[learner])
+        start = time.perf_counter()
+        model.fit(X, y)
+        fit_seconds = time.perf_counter() - start
+        accuracy = accuracy_score(self.y_val, model.predict(self.X_val))
+        latency_ms, batch_us = serving_latency(model, self.X_val)
+
+        result = {
+            "config": config_id, "learner": learner, "bracket": bracket, "rung": rung,
+            "n_estimators": n_estimators, "fraction": round(fraction, 3),
+            "accuracy": accuracy, "fit_seconds": fit_seconds,
+            "latency_ms": latency_ms, "batch_us_per_row": batch_us,
+            "params": ", ".join(f"{k}={v}" for k, v in config["params"].items()),
+        }
+        self.results.append(result)
+        print(f"   [{bracket}.{rung}] #{config_id:<3} {learner:<4} n={n_estimators:<5} frac={fraction:.2f} "
+              f"acc={accuracy*100:.2f}% fit={fit_seconds:.1f}s lat={latency_ms:.2f}ms")
+        return result
+
+    def run(self) -> pd.DataFrame:
+        self.deadline = time.time() + self.budget
+        config_id = 0
+        try:
+            for s in range(self.s_max, -1, -1):
+                n = int(math.ceil((self.s_max + 1) / (s + 1) * ETA ** s))
+                print(f"\n🎯 Bracket {s}: {n} configs from resource {ETA ** -s:.3f}")
+                configs = []
+                for _ in range(n):
+                    configs.append((config_id, sample_config(self.rng, self.learners)))
+                    config_id += 1
+                for i in range(s + 1):
+                    resource = ETA ** (i - s)
+                    scored = [(self.evaluate(cid, cfg, resource, s, i)["accuracy"], cid, cfg)
+                              for cid, cfg in configs]
+                    scored.sort(key=lambda t: -t[0])
+                    configs = [(cid, cfg) for _, cid, cfg in scored[:max(1, len(scored) // ETA)]]
+        except BudgetExceeded:
+            print(f"\n⏰ Budget of {self.budget:.0f}s reached")
+        return pd.DataFrame(self.results)
+
+
+def pareto_front(table: pd.DataFrame, accuracy: str = "accuracy", latency: str = "latency_ms") -> pd.Series:
+    """True for rows no other row beats on both accuracy and latency."""
+    ordered = table.sort_values([latency, accuracy], ascending=[True, False])
+    best = -np.inf
+    front = pd.Series(False, index=table.index)
+    for idx, acc in ordered[accuracy].items():
+        if acc > best:
+            front[idx] = True
+            best = acc
+    return front
+
+
+def final_evaluations(results: pd.DataFrame) -> pd.DataFrame:
+    """Each config at the largest resource it reached."""
+    return (results.sort_values(["config", "n_estimators"])
+            .groupby("config", sort=False).tail(1)
+            .reset_index(drop=True))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hyperband search over the match model learners")
+    parser.add_argument("--features", default="advanced", help="Feature set from feature_store.py")
+    parser.add_argument("--learners", nargs="+", choices=list(SEARCH_SPACES), default=list(SEARCH_SPACES))
+    parser.add_argument("--budget", type=float, default=600, help="Wall-clock budget in seconds")
+    parser.add_argument("--max-estimators", type=int, default=1000)
+    parser.add_argument("--min-fraction", type=float, default=0.2, help="Smallest share of training rows")
+    parser.add_argument("--brackets", type=int, default=3, help="Hyperband s_max (smallest resource = 3^-s_max)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="CSV for every evaluation (default: models/search/)")
+    args = parser.parse_args()
+
+    print("🔎 HYPERPARAMETER SEARCH (Hyperband)")
+    print("=" * 70)
+    fs = load_features(args.features)
+
+    # Same split as the trainers; the search never sees their test rows
+    X_train, _, y_train, _ = train_test_split(fs.X, fs.y, test_size=0.20, random_state=42, stratify=fs.y)
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.25, random_state=42, stratify=y_train)
+    print(f"✅ {len(X_fit)} fit rows, {len(X_val)} validation rows, {len(fs.features)} features")
+
+    search = HyperbandSearch(X_fit, y_fit, X_val, y_val, args.learners, args.max_estimators,
+                             args.min_fraction, args.brackets, args.budget, args.seed)
+    start = time.time()
+    results = search.run()
+    if results.empty:
+        print("❌ No evaluation finished inside the budget")
+        return
+
+    output = args.output or os.path.join(SEARCH_ROOT, f"{fs.name}-{fs.version}.csv")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    results.to_csv(output, index=False)
+
+    final = final_evaluations(results)
+    final["pareto"] = pareto_front(final)
+    final = final.sort_values("latency_ms")
+
+    print("\n" + "=" * 70)
+    print(f"📊 ACCURACY vs LATENCY ({len(results)} fits, {len(final)} configs, {time.time() - start:.0f}s)")
+    print("=" * 70)
+    print(f"{'':2}{'learner':<8}{'n_est':>6}{'frac':>6}{'val acc':>9}{'1-row ms':>10}{'us/row':>8}  params")
+    for _, row in final.iterrows():
+        mark = "★ " if row["pareto"] else "  "
+        print(f"{mark}{row['learner']:<8}{row['n_estimators']:>6}{row['fraction']:>6.2f}"
+              f"{row['accuracy']*100:>8.2f}%{row['latency_ms']:>10.2f}{row['batch_us_per_row']:>8.1f}  {row['params']}")
+    print("\n★ = Pareto-optimal (no other config is both more accurate and faster)")
+    print(f"💾 Saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Per-file ingestion manifest for incremental Cricsheet refreshes.
+
+The manifest is keyed by match_id and records, for every raw ball-by-ball
+file, its size, mtime, content hash and how many rows it contributed to each
+derived table. The rows themselves are cached per table (Parquet, one
+``match_id`` column added), so a rerun only parses added or changed files and
+re-assembles the outputs from the cache.
+
+Layout::
+
+    data/processed/.ingest/manifest.json
+    data/processed/.ingest/<table>.parquet
+
+Usage:
+  manifest = IngestManifest()
+  plan = manifest.scan(formats, ['quality'])   # {'T20': 'data/raw/t20/', ...}
+  for entry in plan.to_parse:
+      rows = extract(entry.path, entry.match_format)
+      manifest.record(entry, {'quality': rows})
+  manifest.forget(plan.removed)
+  quality_df = manifest.table('quality')
+  manifest.save()
+
+A file whose size and mtime are unchanged is trusted without hashing; a
+touched file whose hash still matches is not re-parsed. When a format is read
+from its zip archive, size, mtime and the CRC-32 all come from the archive's
+central directory, so a rescan never decompresses an unchanged member.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from match_sources import ZipMember, open_source
+
+
+INGEST_DIR = "data/processed/.ingest"
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclass
+class FileEntry:
+    match_id: str
+    match_format: str
+    path: Any               # raw CSV path or match_sources.ZipMember
+    size: int
+    mtime: float
+    sha1: Optional[str] = None
+
+
+@dataclass
+class IngestPlan:
+    added: List[FileEntry] = field(default_factory=list)
+    changed: List[FileEntry] = field(default_factory=list)
+    unchanged: List[FileEntry] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # match_id order of every file currently on disk, used to order outputs
+    order: List[str] = field(default_factory=list)
+
+    @property
+    def to_parse(self) -> List[FileEntry]:
+        return self.added + self.changed
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.changed)} changed, "
+                f"{len(self.unchanged)} unchanged, {len(self.removed)} removed")
+
+
+def file_sha1(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_checksum(source) -> str:
+    """Content hash of a raw CSV path, or the stored CRC-32 of a zip member."""
+    if isinstance(source, ZipMember):
+        return source.checksum()
+    return file_sha1(source)
+
+
+class IngestManifest:
+    """Manifest of ingested raw files plus the rows each one produced.
+
+    Several scripts share one manifest. Each entry remembers, per table, the
+    content hash it was last parsed at, so refreshing one table never hides a
+    change from a script that builds another.
+    """
+
+    def __init__(self, ingest_dir: str = INGEST_DIR):
+        self.ingest_dir = ingest_dir
+        self.path = os.path.join(ingest_dir, MANIFEST_NAME)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._tables: Dict[str, pd.DataFrame] = {}
+        self._new_rows: Dict[str, List[pd.DataFrame]] = {}
+        self._replaced: Dict[str, set] = {}
+        self.order: List[str] = []
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("files", {})
+
+    # ------------------------------------------------------------------ scan
+    def scan(self, formats: Dict[str, str], tables: Iterable[str]) -> IngestPlan:
+        """Compare the raw folders against what ``tables`` were built from."""
+        tables = list(tables)
+        plan = IngestPlan()
+        seen = set()
+        for fmt, folder in formats.items():
+            source = open_source(folder)
+            if source is None:
+                continue
+            for match_id, path in source.iter_balls():
+                size, mtime = source.stat(match_id)
+                entry = FileEntry(match_id, fmt, path, size, mtime)
+                seen.add(match_id)
+                plan.order.append(match_id)
+
+                known = self.entries.get(match_id)
+                if known is None:
+                    plan.added.append(entry)
+                    continue
+
+                if known["size"] == entry.size and known["mtime"] == entry.mtime:
+                    entry.sha1 = known["sha1"]
+                else:
+                    # Only hash files whose stat moved; a touch with the same
+                    # content just refreshes the stat below
+                    entry.sha1 = source_checksum(path)
+                    known.update(size=entry.size, mtime=entry.mtime, sha1=entry.sha1)
+
+                parsed = known.get("parsed", {})
+                if known["format"] == fmt and all(parsed.get(t) == entry.sha1 for t in tables):
+                    plan.unchanged.append(entry)
+                else:
+                    plan.changed.append(entry)
+
+        plan.removed = [m for m in self.entries if m not in seen]
+        self.order = plan.order
+        return plan
+
+    # ---------------------------------------------------------------- update
+    def record(self, entry: FileEntry, rows: Dict[str, Iterable[Dict[str, Any]]]) -> None:
+        """Store the rows a (re)parsed file produced for each table."""
+        if entry.sha1 is None:
+            entry.sha1 = source_checksum(entry.path)
+        known = self.entries.setdefault(entry.match_id, {"rows": {}, "parsed": {}})
+        known.update(format=entry.match_format, path=str(entry.path), size=entry.size,
+                     mtime=entry.mtime, sha1=entry.sha1)
+
+        for table, table_rows in rows.items():
+            table_rows = list(table_rows)
+            self._replaced.setdefault(table, set()).add(entry.match_id)
+            known["rows"][table] = len(table_rows)
+            known["parsed"][table] = entry.sha1
+            if table_rows:
+                frame = pd.DataFrame(table_rows)
+                frame.insert(0, "match_id", entry.match_id)
+                self._new_rows.setdefault(table, []).append(frame)
+
+    def forget(self, match_ids: Iterable[str]) -> None:
+        """Drop manifest entries; their rows fall out of every table on next load."""
+        for match_id in match_ids:
+            self.entries.pop(match_id, None)
+
+    # ---------------------------------------------------------------- tables
+    def _table_path(self, table: str) -> str:
+        return os.path.join(self.ingest_dir, f"{table}.parquet")
+
+    def table(self, table: str) -> pd.DataFrame:
+        """Cached rows patched with this run's changes, in raw-file order.
+
+        Rows of files that are no longer on disk (not in the last scan) are
+        dropped here.
+        """
+        if table in self._tables:
+            return self._tables[table]
+
+        path = self._table_path(table)
+        cached = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+        replaced = self._replaced.get(table)
+        if len(cached) and replaced:
+            cached = cached[~cached["match_id"].isin(replaced)]
+        frames = [f for f in [cached] + self._new_rows.get(table, []) if len(f)]
+        merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["match_id"])
+
+        if self.order and len(merged):
+            rank = pd.Series(range(len(self.order)), index=self.order)
+            merged = merged.assign(_rank=merged["match_id"].map(rank))
+            merged = merged[merged["_rank"].notna()]
+            merged = merged.sort_values("_rank", kind="stable").drop(columns="_rank")
+            merged = merged.reset_index(drop=True)
+
+        self._tables[table] = merged
+        return merged
+
+    def output(self, table: str) -> pd.DataFrame:
+        """Table rows without the ``match_id`` bookkeeping column."""
+        return self.table(table).drop(columns="match_id")
+
+    def save(self) -> None:
+        os.makedirs(self.ingest_dir, exist_ok=True)
+        for table in set(self._tables) | set(self._new_rows):
+            self.table(table).to_parquet(self._table_path(table), index=False)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"files": self.entries}, f)
@@ -0,0 +1,486 @@
+"""Engineered match features for each training script.
+
+Every trainer builds its own feature set from quality_matches_dataset.csv.
+Each builder here takes that table and returns a ``FeatureSet``: the
+model matrix X, the target, and the team/venue tables that the trainer
+saves for the predictors.
+
+  advanced  train_final_model.py     43 features: venue x format aggregates, z-scores, momentum
+  boost     boost_model_fixed.py     27 features
+  quick     quick_save_model.py      20 features (the web app's model)
+  ultimate  ultimate_final_model.py  20 features, quality-filtered teams and venues
+
+The builders run through feature_store.py, which caches their output per
+dataset version. Changing this file (or team_statistics.py) changes the
+version, so stale features are never reused.
+
+Usage:
+  from feature_store import load_features
+  fs = load_features('quick')
+  X, y = fs.X, fs.y
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from team_statistics import team_statistics, join_team_stats, team_stats_dict
+
+
+TARGET = "team1_won"
+
+
+@dataclass
+class FeatureSet:
+    """Model matrix plus the tables a trainer saves alongside its model."""
+
+    name: str
+    X: pd.DataFrame
+    y: pd.Series
+    team_stats: Dict[str, Dict[str, Any]]
+    venue_stats: pd.DataFrame
+    version: Optional[str] = None
+
+    @property
+    def features(self) -> List[str]:
+        return list(self.X.columns)
+
+
+def build_advanced(matches: pd.DataFrame) -> FeatureSet:
+    """train_final_model.py: team depth, venue x format stats, 43 features."""
+    # =========================================================================
+    # ADVANCED TEAM STATISTICS (MORE DEPTH)
+    # =========================================================================
+    print("\n📊 Creating ADVANCED team statistics...")
+
+    stats = team_statistics(matches)
+
+    matches = join_team_stats(matches, stats, 'team1', {
+        f'team1_{key}': key for key in ['overall_win_rate', 'bat_first_win_rate', 'chase_win_rate', 'recent_form',
+                                        'avg_score', 'median_score', 'avg_run_rate', 'avg_boundaries', 'score_consistency']
+    })
+    matches = join_team_stats(matches, stats, 'team2', {
+        f'team2_{key}': key for key in ['overall_win_rate', 'chase_win_rate', 'recent_form']
+    })
+
+    team_stats = team_stats_dict(stats, {
+        key: key for key in ['overall_win_rate', 'bat_first_win_rate', 'chase_win_rate', 'recent_form',
+                             'avg_score', 'median_score', 'avg_run_rate', 'avg_boundaries', 'score_consistency',
+                             'high_score_wr', 'medium_score_wr', 'low_score_wr', 'total_matches']
+    })
+
+    print(f"   ✅ {len(team_stats)} teams processed")
+
+    # =========================================================================
+    # ADVANCED VENUE STATISTICS
+    # =========================================================================
+    print("\n🌍 Creating ADVANCED venue statistics...")
+
+    # Venue stats by format
+    venue_format = matches.groupby(['venue', 'match_format']).agg({
+        'team1_runs': ['mean', 'median', 'std', 'count'],
+        'team1_won': 'mean',
+        'team1_run_rate': 'mean',
+        'team1_boundaries': 'mean',
+        'team1_wickets': 'mean'
+    }).reset_index()
+
+    venue_format.columns = ['venue', 'match_format', 'vf_avg_score', 'vf_median_score',
+                            'vf_score_std', 'vf_matches', 'vf_bat_first_adv',
+                            'vf_avg_rr', 'vf_avg_boundaries', 'vf_avg_wickets']
+
+    matches = matches.merge(venue_format, on=['venue', 'match_format'], how='left')
+
+    # Overall venue stats
+    venue_stats = matches.groupby('venue').agg({
+        'team1_runs': ['mean', 'median', 'std', 'min', 'max'],
+        'team1_won': 'mean',
+        'team1_run_rate': ['mean', 'std'],
+        'team1_boundaries': 'mean',
+        'venue': 'count'
+    }).reset_index()
+
+    venue_stats.columns = ['venue', 'venue_avg_score', 'venue_median_score', 'venue_score_std',
+                           'venue_min_score', 'venue_max_score', 'venue_bat_first_adv',
+                           'venue_avg_rr', 'venue_rr_std', 'venue_avg_boundaries', 'venue_matches']
+
+    matches = matches.merge(venue_stats, on='venue', how='left')
+
+    # Fill NaNs
+    for col in matches.columns:
+        if 'vf_' in col or 'venue_' in col:
+            if 'adv' in col or 'rate' in col:
+                matches[col] = matches[col].fillna(0.5 if 'adv' in col else 7.0)
+            elif 'score' in col:
+                matches[col] = matches[col].fillna(160)
+            elif 'boundaries' in col:
+                matches[col] = matches[col].fillna(15)
+            elif 'wickets' in col:
+                matches[col] = matches[col].fillna(5)
+            elif 'std' in col:
+                matches[col] = matches[col].fillna(25)
+            else:
+                matches[col] = matches[col].fillna(matches[col].mean())
+
+    print(f"   ✅ {matches['venue'].nunique()} venues processed")
+
+    # =========================================================================
+    # SUPER ADVANCED FEATURES
+    # =========================================================================
+    print("\n🔧 Creating SUPER ADVANCED features...")
+
+    # Team strength features
+    matches['team_strength_diff'] = matches['team1_overall_win_rate'] - matches['team2_overall_win_rate']
+    matches['match_situation_adv'] = matches['team1_bat_first_win_rate'] - matches['team2_chase_win_rate']
+    matches['form_difference'] = matches['team1_recent_form'] - matches['team2_recent_form']
+
+    # Score analysis features
+    matches['score_vs_venue_avg'] = matches['team1_runs'] - matches['vf_avg_score']
+    matches['score_vs_venue_median'] = matches['team1_runs'] - matches['vf_median_score']
+    matches['score_vs_team_avg'] = matches['team1_runs'] - matches['team1_avg_score']
+    matches['score_vs_team_median'] = matches['team1_runs'] - matches['team1_median_score']
+
+    # Performance percentile
+    matches['score_percentile'] = ((matches['team1_runs'] - matches['venue_min_score']) /
+                                   (matches['venue_max_score'] - matches['venue_min_score'] + 1))
+    matches['score_percentile'] = matches['score_percentile'].clip(0, 1).fillna(0.5)
+
+    # Z-score (standardized score)
+    matches['score_zscore'] = ((matches['team1_runs'] - matches['vf_avg_score']) /
+                               (matches['vf_score_std'] + 1))
+    matches['score_zscore'] = matches['score_zscore'].clip(-3, 3).fillna(0)
+
+    # Run rate features
+    matches['rr_vs_venue_avg'] = matches['team1_run_rate'] - matches['vf_avg_rr']
+    matches['rr_vs_team_avg'] = matches['team1_run_rate'] - matches['team1_avg_run_rate']
+    matches['rr_ratio'] = (matches['team1_run_rate'] / (matches['vf_avg_rr'] + 0.1)).clip(0.5, 2.0)
+
+    # Boundaries features
+    matches['boundaries_vs_venue'] = matches['team1_boundaries'] - matches['vf_avg_boundaries']
+    matches['boundaries_vs_team'] = matches['team1_boundaries'] - matches['team1_avg_boundaries']
+    matches['boundary_ratio'] = (matches['team1_boundaries'] / (matches['vf_avg_boundaries'] + 1)).clip(0.5, 2.0)
+
+    # Wickets features
+    matches['wickets_in_hand'] = 10 - matches['team1_wickets']
+    matches['wickets_vs_venue'] = matches['team1_wickets'] - matches['vf_avg_wickets']
+    matches['wickets_per_run'] = matches['team1_wickets'] / (matches['team1_runs'] + 1)
+    matches['wickets_impact'] = matches['wickets_in_hand'] * matches['team1_runs'] / 1000
+
+    # Performance indicators
+    matches['dominant_score'] = ((matches['team1_runs'] > matches['vf_avg_score'] + 20) &
+                                 (matches['team1_wickets'] <= 6)).astype(int)
+    matches['struggling_innings'] = ((matches['team1_runs'] < matches['vf_avg_score'] - 10) |
+                                     (matches['team1_wickets'] >= 8)).astype(int)
+    matches['balanced_innings'] = (1 - matches['dominant_score'] - matches['struggling_innings']).clip(0, 1)
+
+    # Momentum features
+    matches['batting_momentum'] = ((matches['team1_run_rate'] / (matches['team1_avg_run_rate'] + 0.1)) *
+                                   (matches['wickets_in_hand'] / 10))
+    matches['pressure_handling'] = ((matches['team1_runs'] / (matches['vf_avg_score'] + 1)) *
+                                    matches['team1_recent_form'])
+
+    # Match context
+    matches['high_stakes'] = (abs(matches['team_strength_diff']) < 0.1).astype(int)
+    matches['mismatch'] = (abs(matches['team_strength_diff']) > 0.3).astype(int)
+
+    # Format-specific normalization
+    matches['normalized_score'] = np.where(matches['match_format'] == 'ODI',
+                                           (matches['team1_runs'] - 200) / 50,
+                                           (matches['team1_runs'] - 160) / 30)
+
+    print("   ✅ Created 40+ advanced features")
+
+    features = [
+        # Core inputs
+        'team1_runs', 'team1_wickets', 'team1_run_rate', 'team1_boundaries',
+
+        # Team strength & form
+        'team1_overall_win_rate', 'team2_overall_win_rate',
+        'team1_bat_first_win_rate', 'team2_chase_win_rate',
+        'team1_recent_form', 'team2_recent_form',
+        'team_strength_diff', 'match_situation_adv', 'form_difference',
+
+        # Venue intelligence
+        'vf_avg_score', 'vf_median_score', 'vf_bat_first_adv', 'vf_avg_rr',
+        'venue_bat_first_adv', 'venue_avg_score',
+
+        # Score analysis
+        'score_vs_venue_avg', 'score_vs_venue_median',
+        'score_vs_team_avg', 'score_vs_team_median',
+        'score_percentile', 'score_zscore',
+
+        # Run rate analysis
+        'rr_vs_venue_avg', 'rr_vs_team_avg', 'rr_ratio',
+
+        # Boundaries
+        'boundaries_vs_venue', 'boundaries_vs_team', 'boundary_ratio',
+
+        # Wickets
+        'wickets_in_hand', 'wickets_vs_venue', 'wickets_per_run', 'wickets_impact',
+
+        # Performance indicators
+        'dominant_score', 'struggling_innings', 'balanced_innings',
+        'batting_momentum', 'pressure_handling',
+
+        # Context
+        'high_stakes', 'mismatch', 'normalized_score'
+    ]
+
+    X = matches[features].replace([np.inf, -np.inf], 0).fillna(0)
+    return FeatureSet('advanced', X, matches[TARGET], team_stats, venue_stats)
+
+
+def build_boost(matches: pd.DataFrame) -> FeatureSet:
+    """boost_model_fixed.py: team and venue stats, 27 features."""
+    # Team statistics
+    print("\n📊 Creating team statistics...")
+    stats = team_statistics(matches)
+
+    matches = join_team_stats(matches, stats, 'team1', {
+        't1_wr': 'overall_win_rate',
+        't1_bat_wr': 'bat_first_win_rate',
+        't1_avg_score': 'avg_score',
+        't1_avg_rr': 'avg_run_rate',
+        't1_avg_bound': 'avg_boundaries'
+    })
+    matches = join_team_stats(matches, stats, 'team2', {
+        't2_wr': 'overall_win_rate',
+        't2_chase_wr': 'chase_win_rate'
+    })
+
+    team_stats = team_stats_dict(stats, {
+        'overall_wr': 'overall_win_rate',
+        'bat_first_wr': 'bat_first_win_rate',
+        'chase_wr': 'chase_win_rate',
+        'avg_score': 'avg_score',
+        'avg_rr': 'avg_run_rate',
+        'avg_boundaries': 'avg_boundaries'
+    })
+
+    print(f"   ✅ {len(team_stats)} teams")
+
+    # Venue statistics
+    print("\n🌍 Creating venue statistics...")
+    venue_stats = matches.groupby('venue').agg({
+        'team1_runs': ['mean', 'std', 'min', 'max'],
+        'team1_won': 'mean',
+        'team1_run_rate': 'mean',
+        'team1_boundaries': 'mean'
+    }).reset_index()
+
+    venue_stats.columns = ['venue', 'v_avg_score', 'v_std', 'v_min', 'v_max',
+                           'v_bat_adv', 'v_avg_rr', 'v_avg_bound']
+
+    matches = matches.merge(venue_stats, on='venue', how='left')
+    matches = matches.fillna({
+        'v_avg_score': 160, 'v_std': 25, 'v_bat_adv': 0.5,
+        'v_avg_rr': 7.0, 'v_avg_bound': 15, 'v_min': 100, 'v_max': 250
+    })
+
+    print(f"   ✅ {matches['venue'].nunique()} venues")
+
+    # Create features
+    print("\n🔧 Creating features...")
+
+    matches['team_diff'] = matches['t1_wr'] - matches['t2_wr']
+    matches['match_adv'] = matches['t1_bat_wr'] - matches['t2_chase_wr']
+    matches['score_vs_venue'] = matches['team1_runs'] - matches['v_avg_score']
+    matches['score_vs_team'] = matches['team1_runs'] - matches['t1_avg_score']
+    matches['score_pct'] = ((matches['team1_runs'] - matches['v_min']) / (matches['v_max'] - matches['v_min'] + 1)).clip(0, 1)
+    matches['score_z'] = ((matches['team1_runs'] - matches['v_avg_score']) / (matches['v_std'] + 1)).clip(-3, 3)
+    matches['rr_vs_venue'] = matches['team1_run_rate'] - matches['v_avg_rr']
+    matches['rr_vs_team'] = matches['team1_run_rate'] - matches['t1_avg_rr']
+    matches['bound_vs_venue'] = matches['team1_boundaries'] - matches['v_avg_bound']
+    matches['bound_vs_team'] = matches['team1_boundaries'] - matches['t1_avg_bound']
+    matches['wkts_in_hand'] = 10 - matches['team1_wickets']
+    matches['wkts_per_run'] = matches['team1_wickets'] / (matches['team1_runs'] + 1)
+    matches['dominant'] = ((matches['team1_runs'] > matches['v_avg_score'] + 20) & (matches['team1_wickets'] <= 6)).astype(int)
+    matches['struggling'] = ((matches['team1_runs'] < matches['v_avg_score'] - 10) | (matches['team1_wickets'] >= 8)).astype(int)
+    matches['momentum'] = (matches['team1_run_rate'] / (matches['t1_avg_rr'] + 0.1)) * (matches['wkts_in_hand'] / 10)
+    matches['normalized'] = np.where(matches['match_format'] == 'ODI', matches['team1_runs'] / 200, matches['team1_runs'] / 160)
+
+    features = [
+        'team1_runs', 'team1_wickets', 'team1_run_rate', 'team1_boundaries',
+        't1_wr', 't2_wr', 't1_bat_wr', 't2_chase_wr', 'team_diff', 'match_adv',
+        'v_avg_score', 'v_bat_adv', 'v_avg_rr',
+        'score_vs_venue', 'score_vs_team', 'score_pct', 'score_z',
+        'rr_vs_venue', 'rr_vs_team', 'bound_vs_venue', 'bound_vs_team',
+        'wkts_in_hand', 'wkts_per_run', 'dominant', 'struggling', 'momentum', 'normalized'
+    ]
+
+    X = matches[features].replace([np.inf, -np.inf], 0).fillna(0)
+    return FeatureSet('boost', X, matches[TARGET], team_stats, venue_stats)
+
+
+def strength_features(matches: pd.DataFrame) -> pd.DataFrame:
+    """The 20-feature block shared by the quick and ultimate models (and the web app)."""
+    matches['runs'] = matches['team1_runs']
+    matches['wickets'] = matches['team1_wickets']
+    matches['rr'] = matches['team1_run_rate']
+    matches['score_above_venue'] = (matches['runs'] - matches['v_avg']) / matches['v_std']
+    matches['team_strength'] = matches['t1_wr'] - matches['t2_wr']
+    matches['situation_advantage'] = matches['t1_bat_wr'] - matches['t2_chase_wr']
+    matches['wickets_remaining'] = 10 - matches['wickets']
+    matches['wicket_quality'] = matches['wickets_remaining'] / 10 * (matches['runs'] / 150)
+    matches['big_score'] = (matches['runs'] >= matches['v_avg'] + 15).astype(int)
+    matches['low_wickets'] = (matches['wickets'] <= 5).astype(int)
+    matches['dominant_performance'] = matches['big_score'] * matches['low_wickets']
+    matches['balanced_match'] = (abs(matches['team_strength']) < 0.15).astype(int)
+    matches['score_normalized'] = matches['runs'] / matches['v_avg']
+    matches['overall_strength'] = (
+        matches['score_above_venue'] * 0.4 +
+        matches['team_strength'] * 0.3 +
+        matches['wicket_quality'] * 0.2 +
+        matches['situation_advantage'] * 0.1
+    )
+    return matches
+
+
+STRENGTH_FEATURES = [
+    'runs', 'wickets', 'rr',
+    't1_wr', 't2_wr', 't1_bat_wr', 't2_chase_wr',
+    'v_avg', 'v_bat_adv',
+    'score_above_venue', 'team_strength', 'situation_advantage',
+    'wickets_remaining', 'wicket_quality',
+    'big_score', 'low_wickets', 'dominant_performance',
+    'balanced_match', 'score_normalized', 'overall_strength'
+]
+
+
+def build_quick(matches: pd.DataFrame) -> FeatureSet:
+    """quick_save_model.py: the 20 features the web app predicts with."""
+    # Quick clean
+    matches = matches[
+        (matches['team1_runs'] >= 80) &
+        (matches['team1_runs'] <= 350) &
+        (matches['team1_wickets'] <= 10)
+    ]
+    print(f"   Cleaned: {len(matches)} matches")
+
+    # Team stats
+    stats = team_statistics(matches)
+
+    matches = join_team_stats(matches, stats, 'team1', {
+        't1_wr': 'overall_win_rate',
+        't1_bat_wr': 'bat_first_win_rate',
+        't1_avg_score': 'avg_score'
+    })
+    matches = join_team_stats(matches, stats, 'team2', {
+        't2_wr': 'overall_win_rate',
+        't2_chase_wr': 'chase_win_rate'
+    })
+
+    team_stats = team_stats_dict(stats, {
+        'wr': 'overall_win_rate',
+        'bat_wr': 'bat_first_win_rate',
+        'chase_wr': 'chase_win_rate',
+        'avg_score': 'avg_score'
+    })
+
+    # Venue stats
+    venue_stats = matches.groupby('venue').agg({
+        'team1_runs': ['mean', 'std'],
+        'team1_won': 'mean',
+        'team1_run_rate': 'mean'
+    }).reset_index()
+    venue_stats.columns = ['venue', 'v_avg', 'v_std', 'v_bat_adv', 'v_rr']
+    matches = matches.merge(venue_stats, on='venue', how='left')
+    matches = matches.fillna({'v_avg': 160, 'v_std': 25, 'v_bat_adv': 0.5, 'v_rr': 7.0})
+
+    # Features
+    matches = strength_features(matches)
+
+    X = matches[STRENGTH_FEATURES].fillna(0)
+    return FeatureSet('quick', X, matches[TARGET], team_stats, venue_stats)
+
+
+def build_ultimate(matches: pd.DataFrame) -> FeatureSet:
+    """ultimate_final_model.py: the 20 features on quality-filtered teams and venues."""
+    # Remove extreme outliers
+    initial_len = len(matches)
+    matches = matches[
+        (matches['team1_runs'] >= 80) &
+        (matches['team1_runs'] <= 350) &
+        (matches['team1_wickets'] <= 10) &
+        (matches['team1_run_rate'] > 3) &
+        (matches['team1_run_rate'] < 15)
+    ]
+    print(f"   Cleaned: {len(matches)} matches ({initial_len - len(matches)} outliers removed)")
+
+    # Team stats with MORE MATCHES = BETTER STATS
+    print("\n📊 Team statistics (quality threshold)...")
+    # Bat-first/chase rates need 5+ matches of that kind
+    stats = team_statistics(matches, min_split_matches=5)
+
+    # Only include teams with 10+ matches for reliable stats
+    stats = stats[stats['total_matches'] >= 10].copy()
+    stats['consistency'] = 1 / (stats['score_consistency'] + 10)  # Lower std = more consistent
+
+    team_stats = team_stats_dict(stats, {
+        'wr': 'overall_win_rate',
+        'bat_wr': 'bat_first_win_rate',
+        'chase_wr': 'chase_win_rate',
+        'avg_score': 'avg_score',
+        'avg_rr': 'avg_run_rate',
+        'consistency': 'consistency'
+    })
+
+    print(f"   ✅ {len(team_stats)} quality teams")
+
+    # Filter matches to only include teams we have good stats for
+    matches = matches[
+        matches['team1'].isin(stats.index) &
+        matches['team2'].isin(stats.index)
+    ]
+    print(f"   Filtered to {len(matches)} matches with quality team data")
+
+    # Add team features
+    matches = join_team_stats(matches, stats, 'team1', {
+        't1_wr': 'overall_win_rate',
+        't1_bat_wr': 'bat_first_win_rate',
+        't1_avg_score': 'avg_score',
+        't1_consistency': 'consistency'
+    })
+    matches = join_team_stats(matches, stats, 'team2', {
+        't2_wr': 'overall_win_rate',
+        't2_chase_wr': 'chase_win_rate',
+        't2_consistency': 'consistency'
+    })
+
+    # Venue stats with MINIMUM MATCHES requirement
+    print("\n🌍 Venue statistics (quality threshold)...")
+    venue_counts = matches['venue'].value_counts()
+    quality_venues = venue_counts[venue_counts >= 5].index  # At least 5 matches
+
+    matches = matches[matches['venue'].isin(quality_venues)]
+    print(f"   Filtered to {len(matches)} matches at quality venues")
+
+    venue_stats = matches.groupby('venue').agg({
+        'team1_runs': ['mean', 'std'],
+        'team1_won': 'mean',
+        'team1_run_rate': 'mean'
+    }).reset_index()
+
+    venue_stats.columns = ['venue', 'v_avg', 'v_std', 'v_bat_adv', 'v_rr']
+    matches = matches.merge(venue_stats, on='venue', how='left')
+
+    print(f"   ✅ {len(quality_venues)} quality venues")
+
+    # Create STRONGEST features
+    print("\n🔧 Creating optimized features...")
+    matches = strength_features(matches)
+
+    X = matches[STRENGTH_FEATURES].fillna(0)
+    return FeatureSet('ultimate', X, matches[TARGET], team_stats, venue_stats)
+
+
+FEATURE_SETS: Dict[str, Callable[[pd.DataFrame], FeatureSet]] = {
+    "advanced": build_advanced,
+    "boost": build_boost,
+    "quick": build_quick,
+    "ultimate": build_ultimate,
+}
@@ -0,0 +1,225 @@
+"""Indexed match metadata table built from the Cricsheet *_info.csv files.
+
+The ball-by-ball files have no winner column, so the extractors used to infer
+the result by comparing innings totals. Every match also ships an info file
+with the real winner, toss, event, date and both playing XIs. This module
+parses those files into one table keyed by match_id and keeps in-memory
+indexes on team, venue, date and event.
+
+Usage:
+  python scripts/match_metadata.py              # build data/processed/match_metadata.parquet
+
+From a script:
+  from match_metadata import MatchMetadata, match_winner
+  meta = MatchMetadata.load()
+  meta.get('1082591')['winner']                 # O(1) by match_id
+  meta.for_team('India'); meta.for_venue('Eden Gardens')
+  meta.for_event('Indian Premier League'); meta.between('2019-01-01', '2019-12-31')
+
+  match_winner(balls_df)                        # winner for a ball-by-ball frame, or None
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import csv
+import io
+import os
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from ball_store import FORMATS, RAW_ROOT
+from match_sources import open_source
+
+
+METADATA_PATH = "data/processed/match_metadata.parquet"
+
+# Single-valued info keys copied straight into the table
+INFO_FIELDS = (
+    "gender", "season", "event", "match_number", "venue", "city",
+    "toss_winner", "toss_decision", "player_of_match", "winner",
+    "winner_runs", "winner_wickets", "outcome", "method", "eliminator",
+)
+
+COLUMNS = (
+    ["match_id", "match_format", "team1", "team2", "date"] + list(INFO_FIELDS)
+    + ["team1_players", "team2_players"]
+)
+
+
+def parse_info(lines: Iterable[str]) -> Dict[str, Any]:
+    """Parse the rows of one Cricsheet info file into a flat record."""
+    record: Dict[str, Any] = {}
+    teams: List[str] = []
+    dates: List[str] = []
+    players: Dict[str, List[str]] = defaultdict(list)
+
+    for row in csv.reader(lines):
+        if len(row) < 3 or row[0] != "info":
+            continue
+        key = row[1]
+        if key == "registry":
+            continue
+        if key == "team":
+            teams.append(row[2])
+        elif key == "date":
+            dates.append(row[2].replace("/", "-"))
+        elif key in ("player", "players") and len(row) >= 4:
+            players[row[2]].append(row[3])
+        elif key in INFO_FIELDS and key not in record:
+            record[key] = row[2]
+
+    record["team1"] = teams[0] if teams else None
+    record["team2"] = teams[1] if len(teams) > 1 else None
+    record["date"] = min(dates) if dates else None
+    record["team1_players"] = players.get(record["team1"], [])
+    record["team2_players"] = players.get(record["team2"], [])
+    # Super-over / bowl-out deciders are recorded as the eliminator
+    if not record.get("winner") and record.get("eliminator"):
+        record["winner"] = record["eliminator"]
+    return record
+
+
+def parse_info_file(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return parse_info(f)
+
+
+def parse_info_bytes(data: bytes) -> Dict[str, Any]:
+    return parse_info(io.StringIO(data.decode("utf-8")))
+
+
+def build_metadata(raw_root: str = RAW_ROOT, formats: Optional[List[str]] = None) -> pd.DataFrame:
+    """Parse every *_info.csv under the raw folders (or their zips) into one table."""
+    records = []
+    for fmt in formats or list(FORMATS):
+        source = open_source(os.path.join(raw_root, FORMATS[fmt]))
+        if source is None:
+            continue
+        match_ids = source.info_ids()
+        print(f"\n📂 {fmt}: {len(match_ids)} info files")
+        for match_id in match_ids:
+            try:
+                with source.open_info(match_id) as f:
+                    record = parse_info(f)
+            except Exception:
+                continue
+            record["match_id"] = match_id
+            record["match_format"] = fmt
+            records.append(record)
+
+    table = pd.DataFrame(records).reindex(columns=COLUMNS)
+    for col in ("winner_runs", "winner_wickets"):
+        table[col] = pd.to_numeric(table[col], errors="coerce").astype("Int16")
+    return table
+
+
+class MatchMetadata:
+    """Match metadata keyed by match_id with team/venue/date/event indexes."""
+
+    def __init__(self, table: pd.DataFrame):
+        self.table = table
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_team: Dict[str, List[str]] = defaultdict(list)
+        self.by_venue: Dict[str, List[str]] = defaultdict(list)
+        self.by_event: Dict[str, List[str]] = defaultdict(list)
+
+        for record in table.to_dict("records"):
+            match_id = str(record["match_id"])
+            self.by_id[match_id] = record
+            for team in (record["team1"], record["team2"]):
+                if isinstance(team, str):
+                    self.by_team[team].append(match_id)
+            if isinstance(record["venue"], str):
+                self.by_venue[record["venue"]].append(match_id)
+            if isinstance(record["event"], str):
+                self.by_event[record["event"]].append(match_id)
+
+        # Sorted (date, match_id) pairs for range queries
+        self._dates = sorted((r["date"], m) for m, r in self.by_id.items() if isinstance(r["date"], str))
+        self._date_keys = [d for d, _ in self._dates]
+
+    @classmethod
+    def load(cls, path: str = METADATA_PATH) -> "MatchMetadata":
+        return cls(pd.read_parquet(path))
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __contains__(self, match_id) -> bool:
+        return str(match_id) in self.by_id
+
+    def get(self, match_id) -> Optional[Dict[str, Any]]:
+        return self.by_id.get(str(match_id))
+
+    def winner(self, match_id) -> Optional[str]:
+        record = self.get(match_id)
+        winner = record.get("winner") if record else None
+        return winner if isinstance(winner, str) else None
+
+    def for_team(self, team: str) -> List[str]:
+        return self.by_team.get(team, [])
+
+    def for_venue(self, venue: str) -> List[str]:
+        return self.by_venue.get(venue, [])
+
+    def for_event(self, event: str) -> List[str]:
+        return self.by_event.get(event, [])
+
+    def on_date(self, date: str) -> List[str]:
+        return self.between(date, date)
+
+    def between(self, start: str, end: str) -> List[str]:
+        """Match ids played between two ISO dates (inclusive)."""
+        lo = bisect.bisect_left(self._date_keys, start)
+        hi = bisect.bisect_right(self._date_keys, end)
+        return [m for _, m in self._dates[lo:hi]]
+
+
+_default: Optional[MatchMetadata] = None
+_default_loaded = False
+
+
+def default_metadata() -> Optional[MatchMetadata]:
+    """The table at METADATA_PATH, loaded once per process (None if not built)."""
+    global _default, _default_loaded
+    if not _default_loaded:
+        _default_loaded = True
+        if os.path.exists(METADATA_PATH):
+            _default = MatchMetadata.load()
+    return _default
+
+
+def match_winner(balls: pd.DataFrame) -> Optional[str]:
+    """Recorded winner for a ball-by-ball frame, or None if unknown."""
+    meta = default_metadata()
+    if meta is None or "match_id" not in balls.columns or len(balls) == 0:
+        return None
+    return meta.winner(balls["match_id"].iloc[0])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the match metadata table from *_info.csv files")
+    parser.add_argument("--raw", default=RAW_ROOT)
+    parser.add_argument("--output", default=METADATA_PATH)
+    args = parser.parse_args()
+
+    print("📇 BUILDING MATCH METADATA TABLE")
+    print("=" * 70)
+    start = time.time()
+    table = build_metadata(args.raw)
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    table.to_parquet(args.output, index=False)
+
+    print(f"\n✅ {len(table)} matches in {time.time() - start:.1f}s")
+    print(f"   With recorded winner: {table['winner'].notna().sum()}")
+    print(f"   Events: {table['event'].nunique()} | Venues: {table['venue'].nunique()}")
+    print(f"💾 Saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Match sources: a raw Cricsheet folder or the downloaded zip archive.
+
+Cricsheet ships every format as one zip with a ball-by-ball CSV and an
+``*_info.csv`` per match. The pipeline used to unpack those into ~18,000
+loose files before anything could run. A source reads either layout:
+
+* ``DirectorySource`` - an unpacked folder such as ``data/raw/t20/``
+* ``ZipSource``       - the archive itself, e.g. ``data/raw/t20_data.zip``
+
+Members of an archive are parsed as streams straight out of the zip, and a
+single match is found through the archive's central directory (no scan of
+the other members). ``open_source('data/raw/t20/')`` falls back to
+``data/raw/t20_data.zip`` when the folder was never extracted, so the
+extraction scripts accept either without changes to their format tables.
+When both exist the newer one wins: download_cricsheet.py only replaces
+the archive, so a fresh download is not shadowed by an old folder.
+
+Usage:
+  from match_sources import open_source, read_source
+  source = open_source('data/raw/ipl_data.zip')      # or 'data/raw/ipl/'
+  for match_id, ball_source in source.iter_balls():
+      df = read_source(ball_source, low_memory=False)
+  df = read_source(source.ball_source('1082591'))    # random access
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+import pandas as pd
+
+
+ARCHIVE_SUFFIX = "_data.zip"
+
+# One handle per (archive, process): a ZipFile inherited through fork shares
+# its file offset with the parent, so workers open their own
+_ARCHIVES: Dict[Tuple[str, int], zipfile.ZipFile] = {}
+
+# Folders already reported as shadowed by a newer archive
+_WARNED_STALE: Set[str] = set()
+
+
+def _archive(path: str) -> zipfile.ZipFile:
+    key = (os.path.abspath(path), os.getpid())
+    if key not in _ARCHIVES:
+        _ARCHIVES[key] = zipfile.ZipFile(path, "r")
+    return _ARCHIVES[key]
+
+
+@dataclass(frozen=True)
+class ZipMember:
+    """One file inside an archive. Small and picklable, so it can be sent to workers."""
+
+    archive: str
+    name: str
+
+    def info(self) -> zipfile.ZipInfo:
+        return _archive(self.archive).getinfo(self.name)
+
+    def open(self):
+        return _archive(self.archive).open(self.name)
+
+    def checksum(self) -> str:
+        """CRC-32 from the central directory; no need to read the member."""
+        return f"crc32:{self.info().CRC:08x}"
+
+    def __str__(self) -> str:
+        return f"{self.archive}::{self.name}"
+
+
+BallSource = Union[str, ZipMember]
+
+
+def _split_name(name: str) -> Tuple[Optional[str], bool]:
+    """``(match_id, is_info)`` for a member/file name, ``(None, False)`` if not a match file."""
+    base = os.path.basename(name)
+    if not base.endswith(".csv"):
+        return None, False
+    if base.endswith("_info.csv"):
+        return base[:-len("_info.csv")], True
+    return base[:-len(".csv")], False
+
+
+class DirectorySource:
+    """An unpacked raw folder of ``<match_id>.csv`` / ``<match_id>_info.csv`` files."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._balls: Dict[str, str] = {}
+        self._info: Dict[str, str] = {}
+        for file in sorted(os.listdir(path)):
+            match_id, is_info = _split_name(file)
+            if match_id is not None:
+                (self._info if is_info else self._balls)[match_id] = file
+
+    def __len__(self) -> int:
+        return len(self._balls)
+
+    def __contains__(self, match_id) -> bool:
+        return str(match_id) in self._balls
+
+    def match_ids(self) -> List[str]:
+        return list(self._balls)
+
+    def info_ids(self) -> List[str]:
+        return list(self._info)
+
+    def ball_source(self, match_id) -> str:
+        return os.path.join(self.path, self._balls[str(match_id)])
+
+    def iter_balls(self) -> Iterator[Tuple[str, str]]:
+        for match_id, file in self._balls.items():
+            yield match_id, os.path.join(self.path, file)
+
+    def open_info(self, match_id):
+        return open(os.path.join(self.path, self._info[str(match_id)]), "r",
+                    encoding="utf-8", newline="")
+
+    def stat(self, match_id) -> Tuple[int, float]:
+        st = os.stat(self.ball_source(match_id))
+        return st.st_size, st.st_mtime
+
+
+class ZipSource:
+    """A Cricsheet archive read in place through its central directory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._balls: Dict[str, zipfile.ZipInfo] = {}
+        self._info: Dict[str, zipfile.ZipInfo] = {}
+        # Same order as a sorted directory listing of the unpacked archive
+        for info in sorted(_archive(path).infolist(), key=lambda i: os.path.basename(i.filename)):
+            if info.is_dir():
+                continue
+            match_id, is_info = _split_name(info.filename)
+            if match_id is not None:
+                (self._info if is_info else self._balls)[match_id] = info
+
+    def __len__(self) -> int:
+        return len(self._balls)
+
+    def __contains__(self, match_id) -> bool:
+        return str(match_id) in self._balls
+
+    def match_ids(self) -> List[str]:
+        return list(self._balls)
+
+    def info_ids(self) -> List[str]:
+        return list(self._info)
+
+    def ball_source(self, match_id) -> ZipMember:
+        return ZipMember(self.path, self._balls[str(match_id)].filename)
+
+    def iter_balls(self) -> Iterator[Tuple[str, ZipMember]]:
+        for match_id, info in self._balls.items():
+            yield match_id, ZipMember(self.path, info.filename)
+
+    def open_info(self, match_id):
+        member = ZipMember(self.path, self._info[str(match_id)].filename)
+        return io.TextIOWrapper(member.open(), encoding="utf-8", newline="")
+
+    def stat(self, match_id) -> Tuple[int, float]:
+        info = self._balls[str(match_id)]
+        return info.file_size, time.mktime(info.date_time + (0, 0, -1))
+
+
+MatchSource = Union[DirectorySource, ZipSource]
+
+
+def resolve_location(location: str) -> Optional[str]:
+    """The folder or archive to read for ``location``, or None if neither exists.
+
+    A folder that was never extracted resolves to its sibling archive
+    (``data/raw/t20/`` -> ``data/raw/t20_data.zip``), and so does one that
+    is older than the archive (a newer download that was not unpacked).
+    """
+    archive = location.rstrip("/\\") + ARCHIVE_SUFFIX
+    if os.path.isdir(location):
+        if zipfile.is_zipfile(archive) and os.path.getmtime(archive) > os.path.getmtime(location):
+            if location not in _WARNED_STALE:
+                _WARNED_STALE.add(location)
+                print(f"⚠️  {archive} is newer than {location}; reading the archive "
+                      f"(delete the folder or re-extract with download_cricsheet.py --extract)")
+            return archive
+        return location
+    if zipfile.is_zipfile(location):
+        return location
+    if zipfile.is_zipfile(archive):
+        return archive
+    return None
+
+
+def source_exists(location: str) -> bool:
+    return resolve_location(location) is not None
+
+
+def open_source(location: str) -> Optional[MatchSource]:
+    """A source over a raw folder or Cricsheet zip, or None if neither exists."""
+    resolved = resolve_location(location)
+    if resolved is None:
+        return None
+    if os.path.isdir(resolved):
+        return DirectorySource(resolved)
+    return ZipSource(resolved)
+
+
+def read_source(source: BallSource, **read_csv_kwargs) -> pd.DataFrame:
+    """``pd.read_csv`` on a file path or a zip member, streamed from the archive."""
+    if isinstance(source, ZipMember):
+        with source.open() as f:
+            return pd.read_csv(f, **read_csv_kwargs)
+    return pd.read_csv(source, **read_csv_kwargs)
@@ -0,0 +1,234 @@
+"""Memory-mappable, versioned bundle of the serving model.
+
+Each of backend/web_complete.py, predictor_fixed.py and
+interactive_predictor.py unpickles the whole ensemble and
+team_statistics.pkl at import. Under gunicorn, every worker rebuilds that
+object graph in its own memory. A bundle stores the model compiled by
+tree_compiler.py instead, as plain arrays:
+
+  models/bundles/<name>/<version>/
+    manifest.json          version, features, metrics from model_info.pkl,
+                           how the learners combine, per-learner scalars
+    arrays/<i>-<learner>.<field>.npy
+    team_stats.json        {team: {...}} the model was trained with
+    venue_stats.parquet    the feature-store venue table, when available
+  models/bundles/<name>/CURRENT   version the loaders pick
+
+The loaders ``np.load(..., mmap_mode='r')`` the arrays, so opening a bundle
+reads only the manifest. The tree pages come from the OS page cache when
+first touched, and every worker shares one read-only copy of them. The
+version is the hash of the model pickle, so a retrained model never
+overwrites a bundle that a running worker still has mapped.
+
+Usage:
+  python scripts/model_bundle.py                                   # bundle the serving ensemble
+  python scripts/model_bundle.py --name student --model models/student_model.pkl --model-info models/student_info.pkl
+  python scripts/model_bundle.py --list
+
+  from model_bundle import load_bundle
+  bundle = load_bundle()             # None if nothing has been bundled
+  bundle.model.predict_proba(X)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pickle
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from feature_store import file_hash, load_features, load_serving_tables
+from tree_compiler import CompiledEnsemble, CompiledForest, compile_ensemble
+
+
+BUNDLE_ROOT = "models/bundles"
+ARRAY_FIELDS = ("feature", "threshold", "children", "missing_left", "is_leaf", "value", "roots")
+SCALAR_FIELDS = ("name", "depth", "aggregate", "bias", "scale")
+
+
+@dataclass
+class ModelBundle:
+    name: str
+    version: str
+    path: str
+    manifest: Dict[str, Any]
+    model: CompiledEnsemble
+    team_stats: Dict[str, Dict[str, Any]]
+    venue_stats: Optional[pd.DataFrame] = None
+
+
+def _json_value(value):
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    return value if isinstance(value, (str, int, float, bool, type(None), list)) else repr(value)
+
+
+def _stat(path: str) -> List[int]:
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def save_bundle(name: str, model_path: str, model_info_path: str, team_stats_path: str,
+                root: str = BUNDLE_ROOT, tolerance: float = 1e-6) -> str:
+    """Compile the pickled model, check it, and write it as the bundle's CURRENT version."""
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    with open(model_info_path, "rb") as f:
+        model_info = pickle.load(f)
+    features = list(model_info["features"])
+    compiled = compile_ensemble(model, features)
+
+    # Never publish a bundle that scores differently from the pickle
+    fs = load_features(model_info.get("feature_set", "quick"))
+    sample = fs.X[features].iloc[:2000]
+    max_diff = float(np.max(np.abs(model.predict_proba(sample) - compiled.predict_proba(sample))))
+    if max_diff > tolerance:
+        raise ValueError(f"compiled model differs from {model_path} by {max_diff:.2e}")
+
+    serving_tables = load_serving_tables(model_info)
+    if serving_tables is not None:
+        team_stats, venue_stats = serving_tables
+    else:
+        with open(team_stats_path, "rb") as f:
+            team_stats = pickle.load(f)
+        venue_stats = None
+
+    version = file_hash(model_path)[:16]
+    folder = os.path.join(root, name, version)
+    staging = folder + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(os.path.join(staging, "arrays"))
+
+    forests = []
+    for i, forest in enumerate(compiled.forests):
+        files = {}
+        for field in ARRAY_FIELDS:
+            files[field] = f"arrays/{i}-{forest.name}.{field}.npy"
+            np.save(os.path.join(staging, files[field]), getattr(forest, field))
+        forests.append({**{k: _json_value(getattr(forest, k)) for k in SCALAR_FIELDS},
+                        "n_trees": forest.n_trees, "nodes": len(forest.value), "arrays": files})
+
+    with open(os.path.join(staging, "team_stats.json"), "w", encoding="utf-8") as f:
+        json.dump(team_stats, f, default=_json_value)
+    if venue_stats is not None:
+        venue_stats.to_parquet(os.path.join(staging, "venue_stats.parquet"), index=False)
+
+    manifest = {
+        "name": name,
+        "version": version,
+        "source": model_path,
+        "source_stat": _stat(model_path),
+        "model_type": type(model).__name__,
+        "features": features,
+        "model_info": {k: _json_value(v) for k, v in model_info.items() if k != "features"},
+        "combine": compiled.combine,
+        "weights": compiled.weights.tolist(),
+        "intercept": compiled.intercept,
+        "classes": compiled.classes.tolist(),
+        "forests": forests,
+        "max_abs_diff": max_diff,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(os.path.join(staging, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(folder, ignore_errors=True)
+    os.replace(staging, folder)
+    with open(os.path.join(root, name, "CURRENT.tmp"), "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(os.path.join(root, name, "CURRENT.tmp"), os.path.join(root, name, "CURRENT"))
+    return folder
+
+
+def current_version(name: str, root: str = BUNDLE_ROOT) -> Optional[str]:
+    path = os.path.join(root, name, "CURRENT")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def load_bundle(name: str = "ensemble", root: str = BUNDLE_ROOT, version: Optional[str] = None,
+                source: Optional[str] = None) -> Optional[ModelBundle]:
+    """The bundle's arrays memory-mapped read-only.
+
+    None if it was never built, or if ``source`` (the model pickle) has
+    changed since the bundle was written; callers then load the pickle.
+    """
+    version = version or current_version(name, root)
+    folder = os.path.join(root, name, version) if version else None
+    if folder is None or not os.path.exists(os.path.join(folder, "manifest.json")):
+        return None
+    with open(os.path.join(folder, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if source is not None and os.path.exists(source) and _stat(source) != manifest["source_stat"]:
+        print(f"⚠️  {source} changed since bundle {name}/{version} was built; rebuild it with model_bundle.py")
+        return None
+
+    forests = []
+    for spec in manifest["forests"]:
+        arrays = {field: np.load(os.path.join(folder, spec["arrays"][field]), mmap_mode="r").view(np.ndarray)
+                  for field in ARRAY_FIELDS}
+        forests.append(CompiledForest(**{k: spec[k] for k in SCALAR_FIELDS}, **arrays))
+    model = CompiledEnsemble(forests, manifest["combine"], np.asarray(manifest["weights"]),
+                             manifest["intercept"], np.asarray(manifest["classes"]), manifest["features"])
+
+    with open(os.path.join(folder, "team_stats.json"), encoding="utf-8") as f:
+        team_stats = json.load(f)
+    venue_path = os.path.join(folder, "venue_stats.parquet")
+    venue_stats = pd.read_parquet(venue_path) if os.path.exists(venue_path) else None
+    return ModelBundle(name, manifest["version"], folder, manifest, model, team_stats, venue_stats)
+
+
+def list_bundles(root: str = BUNDLE_ROOT) -> List[Dict[str, Any]]:
+    manifests = []
+    for name in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        current = current_version(name, root)
+        for version in sorted(os.listdir(os.path.join(root, name))):
+            path = os.path.join(root, name, version, "manifest.json")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    manifests.append({**json.load(f), "current": version == current})
+    return manifests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write the serving model as a memory-mappable bundle")
+    parser.add_argument("--name", default="ensemble", help="Bundle name (MATCH_MODEL in the web app)")
+    parser.add_argument("--model", default="models/ultimate_ensemble_model.pkl")
+    parser.add_argument("--model-info", default="models/model_info.pkl")
+    parser.add_argument("--team-stats", default="models/team_statistics.pkl")
+    parser.add_argument("--root", default=BUNDLE_ROOT)
+    parser.add_argument("--list", action="store_true", help="List bundles and exit")
+    args = parser.parse_args()
+
+    print("📦 MODEL BUNDLE")
+    print("=" * 70)
+
+    if args.list:
+        for m in list_bundles(args.root):
+            mark = "★" if m["current"] else " "
+            trees = sum(f["n_trees"] for f in m["forests"])
+            print(f" {mark} {m['name']:<9} {m['version']}  {m['model_type']:<30} {trees:>6} trees  {m['built_at']}")
+        return
+
+    start = time.time()
+    folder = save_bundle(args.name, args.model, args.model_info, args.team_stats, args.root)
+    size = sum(os.path.getsize(os.path.join(folder, "arrays", f)) for f in os.listdir(os.path.join(folder, "arrays")))
+    print(f"✅ Bundle written in {time.time() - start:.1f}s: {folder} ({size / 1e6:.1f} MB of arrays)")
+
+    start = time.time()
+    bundle = load_bundle(args.name, args.root)
+    print(f"⚡ Loaded back in {(time.time() - start) * 1e3:.1f} ms "
+          f"({bundle.model.n_trees} trees, {len(bundle.team_stats)} teams)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+"""Normalized name lookups for the web app: venues, players and player search.
+
+/api/predict-match and /api/select-xi found a fixture's venue with
+``venue_stats['venue'].str.contains(venue.split(',')[0])``. That is a regex
+scan of ~550 rows on every request. It silently takes the first partial
+hit ('National Stadium, Karachi' scored as Bangabandhu National Stadium),
+and misses display names that Cricsheet spells differently
+('M. Chinnaswamy Stadium' vs 'M Chinnaswamy Stadium', 'The Gabba' vs
+'Brisbane Cricket Ground, Woolloongabba').
+
+VenueResolver is built once at startup. It indexes the venue table's names
+in normalized form ``normalize_name``: accents stripped, casefolded,
+punctuation dropped, and a leading 'the' removed. It indexes each ground's
+name without the city, and also the VENUE_ALIASES. A lookup is then one dict
+probe. A name that is not in the dict falls back to a TrigramIndex over the
+same keys, which absorbs typos and partial names. The answer is memoized,
+so the next request for that name is a dict probe as well.
+
+PlayerNameIndex does the same for the player tables, replacing loops that
+compared ``.lower()`` against every key. It adds Cricsheet short names
+('V Kohli') and unambiguous surnames as aliases, and confirms a trigram
+match by edit distance. TypeaheadIndex answers /api/search-players from
+sorted prefix lists; see benchmark_typeahead.py.
+
+Usage:
+  python scripts/name_index.py                        # resolve a few sample spellings
+  python scripts/name_index.py "wankhede" "Gabba, Brisbane"
+
+  from name_index import VenueResolver
+  venues = VenueResolver(venue_stats, display_names=VENUES)
+  v_avg, v_std, v_bat_adv, v_rr = venues.stats('Eden Gardens, Kolkata')
+  PlayerNameIndex(players_df['player_name']).resolve('RG Sharma')   # 'Rohit Sharma'
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import math
+import re
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+
+VENUE_STATS_PATH = "data/processed/venue_statistics_complete.csv"
+
+# v_avg, v_std, v_bat_adv, v_rr when a venue is unknown (the web app's old default)
+DEFAULT_VENUE_STATS = (165.0, 25.0, 0.5, 7.5)
+
+# Names people use -> the venue's Cricsheet name
+VENUE_ALIASES: Dict[str, str] = {
+    "The Gabba": "Brisbane Cricket Ground, Woolloongabba",
+    "Gabba": "Brisbane Cricket Ground, Woolloongabba",
+    "The Oval": "Kennington Oval",
+    "Oval, London": "Kennington Oval, London",
+    "Village, Dublin": "The Village, Malahide, Dublin",
+    "Malahide": "The Village, Malahide",
+    "Optus Stadium": "Perth Stadium",
+    "Chepauk": "MA Chidambaram Stadium, Chepauk",
+    "Motera": "Narendra Modi Stadium",
+    "Sardar Patel Stadium": "Narendra Modi Stadium",
+    "Kotla": "Feroz Shah Kotla",
+    "Mirpur": "Shere Bangla National Stadium, Mirpur",
+    "Khettarama": "R Premadasa Stadium",
+}
+
+# Spellings the CLI resolves when given no names
+SAMPLE_NAMES = ["Wankhede Stadium, Mumbai", "M. Chinnaswamy Stadium, Bangalore", "The Gabba, Brisbane",
+                "National Stadium, Karachi", "Village, Dublin", "wankhede", "Eden Gardns", "Generic Stadium"]
+
+# Smallest trigram similarity accepted as the same name
+MIN_SIMILARITY = 0.6
+# Smallest similarity of a misspelt player name, and the candidates checked by edit distance
+PLAYER_MIN_SIMILARITY = 0.4
+FUZZY_CANDIDATES = 5
+# Smallest similarity of a fuzzy typeahead suggestion
+TYPEAHEAD_MIN_SIMILARITY = 0.3
+# Keys a trigram search scores at most: venue lookups, and each typeahead keystroke
+MAX_CANDIDATES = 2000
+TYPEAHEAD_CANDIDATES = 256
+# Resolved names remembered beyond the prebuilt keys
+MEMO_SIZE = 4096
+
+_PUNCTUATION = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(text: str) -> str:
+    """Accent-free, casefolded, punctuation-free form of a name, without a leading 'the'."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = _PUNCTUATION.sub(" ", text.replace("'", "").replace("&", " and ")).strip()
+    return text[4:] if text.startswith("the ") else text
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of each word padded with two leading spaces and one trailing (as pg_trgm does)."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance counting an adjacent transposition as one edit."""
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class TrigramIndex:
+    """Normalized keys searchable by trigram similarity via an inverted index.
+
+    Similarity is Dice over trigrams weighted by inverse document frequency,
+    so words every key shares ('stadium', 'cricket') count for little and
+    'Generic Stadium' does not match whichever stadium comes first.
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.grams: List[Set[str]] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self._sizes: Optional[List[float]] = None
+
+    def add(self, key: str) -> int:
+        key_id = len(self.keys)
+        grams = trigrams(key)
+        self.keys.append(key)
+        self.grams.append(grams)
+        for gram in grams:
+            self.postings[gram].append(key_id)
+        self._sizes = None
+        return key_id
+
+    def weight(self, gram: str) -> float:
+        return math.log(1 + len(self.keys) / max(1, len(self.postings.get(gram, ()))))
+
+    def prepare(self) -> None:
+        """Weigh every key's trigrams; done on the first search after an add unless called first."""
+        if self._sizes is None:
+            self._sizes = [sum(self.weight(g) for g in key_grams) for key_grams in self.grams]
+
+    def search(self, text: str, limit: int = 10, min_score: float = 0.0,
+               max_candidates: int = MAX_CANDIDATES) -> List[Tuple[int, float]]:
+        """(key id, similarity) of the best keys for an already-normalized text.
+
+        Candidates come from the postings of the query's rarest trigrams, up to
+        ``max_candidates`` keys, so the cost stays flat as the index grows.
+        """
+        grams = trigrams(text)
+        if not grams or not self.keys:
+            return []
+        self.prepare()
+        weights = {gram: self.weight(gram) for gram in grams}
+        candidates: Set[int] = set()
+        for gram in sorted(grams, key=lambda g: len(self.postings.get(g, ()))):
+            postings = self.postings.get(gram, ())
+            if candidates and len(candidates) + len(postings) > max_candidates:
+                break
+            candidates.update(postings[:max_candidates])
+        size = sum(weights.values())
+        scored = []
+        for key_id in candidates:
+            shared = sum(weights[g] for g in grams & self.grams[key_id])
+            score = 2.0 * shared / (size + self._sizes[key_id])
+            if score >= min_score:
+                scored.append((key_id, score))
+        scored.sort(key=lambda item: (-item[1], self.keys[item[0]]))
+        return scored[:limit]
+
+
+class TypeaheadIndex:
+    """Ranked suggestions for a partly typed name: exact prefix, token prefix, then fuzzy.
+
+    Normalized names are kept in sorted order twice: whole, and from each later
+    word on ('virat kohli' is also filed as 'kohli'). A prefix tier is one
+    bisect plus a walk over at most ``limit`` hits, so the first two tiers cost
+    O(log n). The trigram tier runs only when they leave the list short.
+    """
+
+    def __init__(self, names: Iterable[Optional[str]], min_similarity: float = TYPEAHEAD_MIN_SIMILARITY,
+                 max_candidates: int = TYPEAHEAD_CANDIDATES):
+        self.names: List[Optional[str]] = list(names)
+        self.min_similarity = min_similarity
+        self.max_candidates = max_candidates
+        self._trigrams = TrigramIndex()
+        self._trigram_ids: List[int] = []
+        full, tokens = [], []
+        for i, name in enumerate(self.names):
+            key = normalize_name(name) if isinstance(name, str) else ""
+            if not key:
+                continue
+            full.append((key, i))
+            for match in re.finditer(r" (?=\S)", key):
+                tokens.append((key[match.end():], i))
+            self._trigrams.add(key)
+            self._trigram_ids.append(i)
+        full.sort()
+        tokens.sort()
+        self._full_keys, self._full_ids = [k for k, _ in full], [i for _, i in full]
+        self._token_keys, self._token_ids = [k for k, _ in tokens], [i for _, i in tokens]
+        self._trigrams.prepare()
+
+    @staticmethod
+    def _prefixed(keys: List[str], ids: List[int], prefix: str, found: List[int], seen: Set[int],
+                  limit: int) -> None:
+        j = bisect.bisect_left(keys, prefix)
+        while j < len(keys) and len(found) < limit and keys[j].startswith(prefix):
+            if ids[j] not in seen:
+                seen.add(ids[j])
+                found.append(ids[j])
+            j += 1
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """Positions in ``names`` of the best ``limit`` suggestions for ``query``."""
+        prefix = normalize_name(query)
+        if not prefix:
+            return []
+        found: List[int] = []
+        seen: Set[int] = set()
+        self._prefixed(self._full_keys, self._full_ids, prefix, found, seen, limit)
+        self._prefixed(self._token_keys, self._token_ids, prefix, found, seen, limit)
+        if len(found) < limit:
+            for key_id, _ in self._trigrams.search(prefix, limit, self.min_similarity, self.max_candidates):
+                i = self._trigram_ids[key_id]
+                if i not in seen and len(found) < limit:
+                    seen.add(i)
+                    found.append(i)
+        return found
+
+    def __len__(self) -> int:
+        return len(self._full_keys)
+
+
+class NameResolver:
+    """Name -> position in a fixed list: normalized dict lookup, then trigram similarity.
+
+    Subclasses file each entry under its own name and any aliases with
+    ``_index``, may offer other spellings of a query via ``_variants``, and
+    may rule out the trigram fallback for a query via ``_fuzzy`` or veto
+    its candidates via ``_accept``.
+    Answers, including misses, are memoized up to MEMO_SIZE names.
+    """
+
+    def __init__(self, min_similarity: float = MIN_SIMILARITY):
+        self.names: List[str] = []
+        self.min_similarity = min_similarity
+        self._lookup: Dict[str, int] = {}
+        self._memo: Dict[str, Optional[int]] = {}
+        self._trigrams = TrigramIndex()
+        self._trigram_rows: List[int] = []
+
+    def _index(self, name: str, row: int, fuzzy: bool = True) -> None:
+        key = normalize_name(name)
+        if key and key not in self._lookup:
+            self._lookup[key] = row
+            if fuzzy:
+                self._trigrams.add(key)
+                self._trigram_rows.append(row)
+
+    def _variants(self, name: str, key: str) -> Iterable[str]:
+        return ()
+
+    def _fuzzy(self, name: str, key: str) -> bool:
+        return True
+
+    def _accept(self, key: str, candidate: str) -> bool:
+        return True
+
+    def _find(self, name: str) -> Optional[int]:
+        key = normalize_name(name)
+        row = self._lookup.get(key)
+        for variant in self._variants(name, key):
+            if row is not None:
+                break
+            row = self._lookup.get(variant)
+        if row is None and self._fuzzy(name, key):
+            for key_id, _ in self._trigrams.search(key, limit=FUZZY_CANDIDATES, min_score=self.min_similarity):
+                if self._accept(key, self._trigrams.keys[key_id]):
+                    return self._trigram_rows[key_id]
+        return row
+
+    def position(self, name: Optional[str]) -> Optional[int]:
+        """Index into ``names`` of the entry ``name`` refers to, or None."""
+        if not isinstance(name, str) or not name:
+            return None
+        if name in self._memo:
+            return self._memo[name]
+        row = self._find(name)
+        if len(self._memo) < MEMO_SIZE:
+            self._memo[name] = row
+        return row
+
+    def resolve(self, name: Optional[str]) -> Optional[str]:
+        """The indexed name ``name`` refers to, or None if nothing is close enough."""
+        row = self.position(name)
+        return None if row is None else self.names[row]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class VenueResolver(NameResolver):
+    """Venue name -> row of the venue table and its (v_avg, v_std, v_bat_adv, v_rr)."""
+
+    def __init__(self, venue_stats: pd.DataFrame, display_names: Iterable[str] = (),
+                 aliases: Optional[Dict[str, str]] = None, min_similarity: float = MIN_SIMILARITY):
+        super().__init__(min_similarity)
+        self.stats_rows: List[Tuple[float, float, float, float]] = []
+
+        columns = ["venue", "v_avg", "v_std", "v_bat_adv", "v_rr"]
+        rows = venue_stats[columns].itertuples(index=False) if len(venue_stats) else []
+        for venue, *stats in rows:
+            if not isinstance(venue, str):
+                continue
+            row = len(self.names)
+            self.names.append(venue)
+            self.stats_rows.append(tuple(float(v) for v in stats))
+            self._index(venue, row)
+        # A ground listed with and without its city is keyed by the bare name's row
+        # (or the first in table order), as the old first-partial-match lookup picked
+        for row, venue in enumerate(self.names):
+            self._index(venue.split(",")[0], row)
+        for alias, venue in (VENUE_ALIASES if aliases is None else aliases).items():
+            row = self._lookup.get(normalize_name(venue))
+            if row is not None:
+                self._index(alias, row)
+
+        self.unresolved = [name for name in display_names if self.resolve(name) is None]
+
+    def _variants(self, name: str, key: str) -> Iterable[str]:
+        yield normalize_name(name.split(",")[0])
+
+    def stats(self, name: Optional[str]) -> Tuple[float, float, float, float]:
+        """(v_avg, v_std, v_bat_adv, v_rr) of the venue, DEFAULT_VENUE_STATS if unknown."""
+        row = self.position(name)
+        return DEFAULT_VENUE_STATS if row is None else self.stats_rows[row]
+
+
+def player_aliases(name: str) -> List[str]:
+    """Short forms of a full name: Cricsheet's 'V Kohli', the surname, the first name."""
+    words = normalize_name(name).split()
+    if len(words) < 2:
+        return []
+    return [" ".join([words[0][0]] + words[1:]), words[-1], words[0]]
+
+
+class PlayerNameIndex(NameResolver):
+    """Player name -> the roster's spelling of it.
+
+    Full names are keyed casefolded and accent-free. Cricsheet short names
+    ('V Kohli'; 'RG Sharma' is tried as 'R Sharma'), lone surnames and lone
+    first names are keyed too, but only when a single player has them. Only
+    full names are matched by trigram, and a candidate must also be within a
+    few edits with the same first letter. A typo is caught, but 'DR Smith',
+    a bare 'Sharma' or 'Mandeep Singh' (for Ramandeep) is not guessed.
+    """
+
+    def __init__(self, names: Iterable[Optional[str]], aliases: Optional[Dict[str, str]] = None,
+                 min_similarity: float = PLAYER_MIN_SIMILARITY):
+        super().__init__(min_similarity)
+        # Positions match ``names`` (a roster column may hold gaps), only real names are keyed
+        self.names = list(names)
+        players = [(row, name) for row, name in enumerate(self.names) if isinstance(name, str) and name]
+        for row, name in players:
+            self._index(name, row)
+
+        owners: Dict[str, Set[int]] = defaultdict(set)
+        for row, name in players:
+            for alias in player_aliases(name):
+                owners[alias].add(row)
+        self._ambiguous = {alias for alias, rows in owners.items() if len(rows) > 1}
+        for alias, rows in owners.items():
+            if len(rows) == 1:
+                self._index(alias, next(iter(rows)), fuzzy=False)
+        for alias, name in (aliases or {}).items():
+            row = self._lookup.get(normalize_name(name))
+            if row is not None:
+                self._index(alias, row, fuzzy=False)
+
+    @staticmethod
+    def _initials(name: str) -> bool:
+        first = name.split()[0].replace(".", "") if name.split() else ""
+        return len(name.split()) >= 2 and first.isupper() and len(first) <= 4
+
+    def _variants(self, name: str, key: str) -> Iterable[str]:
+        if self._initials(name):
+            words = key.split()
+            yield " ".join([words[0][0]] + words[1:])
+
+    def _fuzzy(self, name: str, key: str) -> bool:
+        return key not in self._ambiguous and not self._initials(name)
+
+    def _accept(self, key: str, candidate: str) -> bool:
+        # A typo, not another player: same first letter, about one edit per six characters
+        return key[0] == candidate[0] and edit_distance(key, candidate) <= max(1, len(key) // 6)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resolve venue names against the venue table")
+    parser.add_argument("names", nargs="*", help="Names to resolve (default: the web app's venue list)")
+    parser.add_argument("--venues", default=VENUE_STATS_PATH)
+    args = parser.parse_args()
+
+    print("🏟️  VENUE RESOLVER")
+    print("=" * 70)
+
+    venue_stats = pd.read_csv(args.venues)
+    start = time.time()
+    resolver = VenueResolver(venue_stats)
+    print(f"✅ Indexed {len(resolver)} venues ({len(resolver._lookup)} keys) in {(time.time() - start) * 1e3:.1f} ms")
+
+    names = args.names or SAMPLE_NAMES
+    for name in names:
+        venue = resolver.resolve(name)
+        mark = "✅" if venue else "❌"
+        print(f"   {mark} {name:<50} -> {venue or 'default stats'}")
+
+    start = time.perf_counter()
+    for _ in range(100):
+        for name in names:
+            resolver.stats(name)
+    per_lookup = (time.perf_counter() - start) / (100 * len(names)) * 1e6
+    scan_start = time.perf_counter()
+    for name in names:
+        venue_stats[venue_stats["venue"].str.contains(name.split(",")[0], case=False, na=False)]
+    per_scan = (time.perf_counter() - scan_start) / len(names) * 1e6
+    print(f"\n⏱️  {per_lookup:.2f} us per lookup vs {per_scan:.0f} us per str.contains scan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Stacking from cached out-of-fold predictions.
+
+``StackingClassifier.fit`` trains every base learner on the full training
+set, plus once per internal CV fold to get the out-of-fold (OOF)
+probabilities its meta-learner is trained on. ``cross_val_score`` on the
+same stacking object repeats all of that for each outer fold: about 120
+fits of 1000-tree models for the four-learner ensemble.
+
+This module fits each learner's OOF predictions once (the same
+StratifiedKFold splits sklearn uses) and caches them on disk, keyed by the
+feature-store version, the training rows (``split_key``) and the learner's
+params. From the cache:
+
+* the meta-learner is trained on exactly the meta-features sklearn would
+  have built, and the base learners are fitted once on the training set.
+  The result is an ordinary fitted ``StackingClassifier``, so pickling and
+  serving are unchanged.
+* the reported CV score is the cross-validated accuracy of the meta-learner
+  over the cached OOF predictions, with no refits of the base learners.
+
+Each base learner's fit on the full training set is checkpointed the same
+way (models/checkpoints/), and OOF folds are saved as they finish. A run
+that dies resumes from the last finished fold, and a second run with the
+same features and params reuses everything. Changing one learner's params
+retrains only that learner. Changing only the final estimator retrains
+just the meta-learner, which takes seconds.
+
+Usage:
+  from oof_stacking import fit_oof_stacking
+  stacking, cv_scores = fit_oof_stacking(
+      [('rf', rf), ('xgb', xgb_model)], LogisticRegression(max_iter=1000),
+      X_train, y_train, cache_key=f"{fs.version}-{split_key(X_train, y_train, cv=5)}")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import StackingClassifier
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+
+from training_scheduler import Job, TrainingScheduler
+
+
+OOF_ROOT = "models/oof"
+CHECKPOINT_ROOT = "models/checkpoints"
+
+
+def split_key(X: pd.DataFrame, y: pd.Series, cv: int) -> str:
+    """Hash of which rows, in which order and with which labels, make up the training set.
+
+    Any change to the train/test split (random_state, stratify, test_size)
+    changes it, so OOF arrays and checkpoints from another split are never
+    reused. The row count alone would not catch that.
+    """
+    digest = hashlib.sha1()
+    digest.update(np.asarray(X.index).tobytes())
+    digest.update(np.asarray(y).tobytes())
+    digest.update(f"cv{cv}".encode("utf-8"))
+    return "split-" + digest.hexdigest()[:12]
+
+
+def params_hash(estimator) -> str:
+    """Stable hash of an estimator's class and hyperparameters."""
+    params = estimator.get_params(deep=False)
+    text = type(estimator).__name__ + repr(sorted((k, repr(v)) for k, v in params.items()))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def oof_path(name: str, estimator, cache_key: str, n_splits: int, root: str = OOF_ROOT) -> str:
+    return os.path.join(root, cache_key, f"{name}-cv{n_splits}-{params_hash(estimator)}.npy")
+
+
+def out_of_fold(name: str, estimator, X: pd.DataFrame, y: pd.Series, cache_key: str,
+                n_splits: int = 5, root: str = OOF_ROOT) -> np.ndarray:
+    """OOF ``predict_proba`` for one learner, as ``cross_val_predict`` gives it, cached."""
+    path = oof_path(name, estimator, cache_key, n_splits, root)
+    if os.path.exists(path):
+        oof = np.load(path)
+        if len(oof) == len(X):
+            print(f"   ⚡ {name}: OOF predictions from cache")
+            return oof
+
+    start = time.time()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    oof = None
+    folds = []
+    for fold, (train_idx, test_idx) in enumerate(StratifiedKFold(n_splits=n_splits).split(X, y)):
+        # Finished folds are kept, so an interrupted run picks up where it stopped
+        fold_path = fold_file(path, fold)
+        folds.append(fold_path)
+        if os.path.exists(fold_path):
+            proba = np.load(fold_path)
+        else:
+            model = clone(estimator).fit(X.iloc[train_idx], y.iloc[train_idx])
+            proba = model.predict_proba(X.iloc[test_idx])
+            np.save(fold_path, proba)
+        if oof is None:
+            oof = np.zeros((len(X), proba.shape[1]))
+        oof[test_idx] = proba
+    print(f"   ✅ {name}: OOF predictions in {time.time() - start:.1f}s")
+
+    np.save(path, oof)
+    for fold_path in folds:
+        os.remove(fold_path)
+    return oof
+
+
+def fold_file(path: str, fold: int) -> str:
+    return f"{path[:-len('.npy')]}.fold{fold}.npy"
+
+
+def checkpoint_path(name: str, estimator, cache_key: str, root: str = CHECKPOINT_ROOT) -> str:
+    return os.path.join(root, cache_key, f"{name}-{params_hash(estimator)}.pkl")
+
+
+def fit_learner(name: str, estimator, X: pd.DataFrame, y: pd.Series, cache_key: str,
+                root: str = CHECKPOINT_ROOT):
+    """One base learner fitted on the whole training set, from its checkpoint if present."""
+    path = checkpoint_path(name, estimator, cache_key, root)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            model = pickle.load(f)
+        print(f"   ⚡ {name}: fitted model from checkpoint")
+        return model
+
+    start = time.time()
+    model = clone(estimator).fit(X, y)
+    print(f"   ✅ {name}: {time.time() - start:.1f}s")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump(model, f)
+    os.replace(path + ".tmp", path)
+    return model
+
+
+def meta_features(oof: Sequence[np.ndarray]) -> np.ndarray:
+    """Stack OOF probabilities the way StackingClassifier does (binary: drop class 0)."""
+    return np.hstack([p[:, 1:] if p.shape[1] == 2 else p for p in oof])
+
+
+def schedule_learners(scheduler: TrainingScheduler, estimators: List[Tuple[str, object]],
+                      X: pd.DataFrame, y: pd.Series, cache_key: str, cv: int = 5,
+                      root: str = OOF_ROOT, checkpoint_root: str = CHECKPOINT_ROOT) -> None:
+    """Fill the OOF and checkpoint caches for every learner through the scheduler.
+
+    Only folds and fits that are not cached yet become jobs. The caches are
+    then complete, so out_of_fold and fit_learner just load them.
+    """
+    folds = list(StratifiedKFold(n_splits=cv).split(X, y))
+    oof_jobs = []
+    fit_jobs = []
+    for name, est in estimators:
+        path = oof_path(name, est, cache_key, cv, root)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            for fold, (train_idx, test_idx) in enumerate(folds):
+                if not os.path.exists(fold_file(path, fold)):
+                    oof_jobs.append(Job(name, est, fold_file(path, fold), train_idx, test_idx))
+        checkpoint = checkpoint_path(name, est, cache_key, checkpoint_root)
+        if not os.path.exists(checkpoint):
+            os.makedirs(os.path.dirname(checkpoint), exist_ok=True)
+            fit_jobs.append(Job(name, est, checkpoint))
+
+    scheduler.run("out-of-fold", oof_jobs, X, y)
+    scheduler.run("full fit", fit_jobs, X, y)
+
+
+def fit_oof_stacking(estimators: List[Tuple[str, object]], final_estimator, X: pd.DataFrame,
+                     y: pd.Series, cache_key: str, cv: int = 5, n_jobs: Optional[int] = -1,
+                     root: str = OOF_ROOT, checkpoint_root: str = CHECKPOINT_ROOT,
+                     scheduler: Optional[TrainingScheduler] = None) -> Tuple[StackingClassifier, np.ndarray]:
+    """A fitted StackingClassifier and CV scores, derived from cached OOF predictions.
+
+    Equivalent to ``StackingClassifier(estimators, final_estimator, cv=cv).fit(X, y)``
+    for deterministic learners. The returned ``cv_scores`` replace
+    ``cross_val_score`` on the whole stack. With a ``scheduler``, the
+    uncached folds and fits run concurrently inside its core budget.
+    """
+    if scheduler is not None:
+        schedule_learners(scheduler, estimators, X, y, cache_key, cv, root, checkpoint_root)
+
+    print("   Out-of-fold predictions...")
+    oof = [out_of_fold(name, est, X, y, cache_key, cv, root) for name, est in estimators]
+    X_meta = meta_features(oof)
+
+    print("   Fitting base learners on the training set...")
+    fitted = [(name, fit_learner(name, est, X, y, cache_key, checkpoint_root)) for name, est in estimators]
+
+    # 'prefit' fills in every fitted attribute through sklearn's own code;
+    # the meta-learner is then swapped for one trained on the OOF features
+    stacking = StackingClassifier(estimators=fitted, final_estimator=final_estimator,
+                                  cv="prefit", n_jobs=n_jobs)
+    stacking.fit(X, y)
+    stacking.final_estimator_ = clone(final_estimator).fit(X_meta, y)
+    stacking.set_params(cv=cv)
+
+    cv_scores = cross_val_score(clone(final_estimator), X_meta, y, cv=cv, scoring="accuracy")
+    return stacking, cv_scores
@@ -0,0 +1,73 @@
+"""Process-pool driver for per-match extractors.
+
+Fans ``(source, match_format)`` tasks out to a worker pool in chunks and
+yields the extractor results back in task order, so whatever the caller
+builds from them (a DataFrame, a CSV) is identical to a serial run.
+
+Usage:
+  from parallel_extract import extract_matches
+  tasks = [(source, 'IPL') for match_id, source in iter_matches('IPL', folder)]
+  for i, result in enumerate(extract_matches(smart_extract_match, tasks, workers=8), 1):
+      ...
+
+Extractors that are cheaper over many matches at once take a list of
+sources instead; ``batch_tasks`` groups the task stream into
+``(sources, match_format)`` tasks for them.
+
+The extractor must be importable by the workers: define it at module level
+and keep the calling script's work under ``if __name__ == "__main__":`` so
+spawn-based platforms (Windows, macOS) do not re-run it in every worker.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+DEFAULT_CHUNKSIZE = 32
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _apply(task: Tuple[Callable[[Any, str], Any], Any, str]) -> Any:
+    func, source, match_format = task
+    return func(source, match_format)
+
+
+def batch_tasks(tasks: Iterable[Tuple[Any, str]], size: int) -> Iterator[Tuple[List[Any], str]]:
+    """Group consecutive tasks of one format into ``(sources, match_format)`` batches of up to ``size``."""
+    batch: List[Any] = []
+    batch_format = None
+    for source, match_format in tasks:
+        if batch and (match_format != batch_format or len(batch) >= size):
+            yield batch, batch_format
+            batch = []
+        batch.append(source)
+        batch_format = match_format
+    if batch:
+        yield batch, batch_format
+
+
+def extract_matches(func: Callable[[Any, str], Any],
+                    tasks: Iterable[Tuple[Any, str]],
+                    workers: Optional[int] = None,
+                    chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[Any]:
+    """Yield ``func(source, match_format)`` for every task, in task order.
+
+    ``workers=1`` runs in-process without a pool.
+    """
+    workers = workers or default_workers()
+    if workers <= 1:
+        for source, match_format in tasks:
+            yield func(source, match_format)
+        return
+
+    with multiprocessing.Pool(processes=workers) as pool:
+        jobs = ((func, source, match_format) for source, match_format in tasks)
+        # imap keeps submission order, so results merge deterministically
+        for result in pool.imap(_apply, jobs, chunksize=max(1, chunksize)):
+            yield result
@@ -1,361 +1,492 @@
 import pandas as pd
 import numpy as np
 import os
+import argparse
+
+from ball_store import STORE_ROOT, iter_match_frames, match_count, read_match
+from final_data_extraction import sort_matches
+from ingest_manifest import IngestManifest
+from match_sources import source_exists
+from parallel_extract import batch_tasks
+
+
+# Matches concatenated per vectorized aggregation pass
+BATCH_MATCHES = 500
+
+BATTING_COLUMNS = ['player', 'format', 'venue', 'season', 'innings', 'runs', 'balls',
+                   'fours', 'sixes', 'dots', 'ones', 'twos', 'threes', 'dismissed',
+                   'strike_rate', 'boundary_percentage', 'dot_ball_percentage']
+BOWLING_COLUMNS = ['player', 'format', 'venue', 'season', 'innings', 'balls_bowled',
+                   'runs_conceded', 'wickets', 'dots', 'fours_conceded', 'sixes_conceded',
+                   'economy', 'strike_rate', 'dot_ball_percentage']
+
+
+def prepare_match(df):
+    """Ball frame with a standard 'innings' column, or None if the match is unusable"""
+    if len(df) < 20:
+        return None
+
+    innings_col = next((c for c in ['innings', 'inning'] if c in df.columns), None)
+    if not innings_col or 'runs_off_bat' not in df.columns:
+        return None
+    if innings_col != 'innings':
+        df = df.rename(columns={innings_col: 'innings'})
+    return df
+
+
+def aggregate_performances(balls, match_format, keep_match=False):
+    """Per-innings batting and bowling frames for many matches at once.
+
+    ``balls`` holds prepared matches (see prepare_match) stacked with a
+    ``_match`` column numbering them in order. Rows come out per match, per
+    innings, in order of each player's first ball, matching the old
+    one-player-at-a-time loop. keep_match leaves the ``_match`` column on
+    the result so callers can split the rows back per match.
+    """
+    # Venue/season from the first ball of each match
+    first = balls.drop_duplicates('_match').set_index('_match')
+    venue = first['venue'].astype(str) if 'venue' in first.columns else pd.Series('Unknown', index=first.index)
+    season = first['season'].astype(str) if 'season' in first.columns else pd.Series('Unknown', index=first.index)
+
+    # Innings 1 and 2 with at least 10 balls
+    balls = balls[balls['innings'].isin([1, 2])]
+    innings_size = balls.groupby(['_match', 'innings'], sort=False)['innings'].transform('size')
+    balls = balls[innings_size >= 10]
+
+    runs = balls['runs_off_bat']
+    flags = pd.DataFrame({
+        '_match': balls['_match'].to_numpy(),
+        'innings': balls['innings'].astype(int).to_numpy(),
+        'pos': np.arange(len(balls)),
+        'runs': runs.to_numpy(),
+        'fours': runs.eq(4).to_numpy(),
+        'sixes': runs.eq(6).to_numpy(),
+        'dots': runs.eq(0).to_numpy(),
+        'ones': runs.eq(1).to_numpy(),
+        'twos': runs.eq(2).to_numpy(),
+        'threes': runs.eq(3).to_numpy(),
+        'wicket': (balls['wicket_type'].notna() if 'wicket_type' in balls.columns
+                   else pd.Series(False, index=balls.index)).to_numpy(),
+        'extras': (balls['extras'] if 'extras' in balls.columns
+                   else pd.Series(0, index=balls.index)).to_numpy(),
+    })
 
-print("🏏 BUILDING COMPLETE PLAYER PERFORMANCE DATABASE")
-print("="*70)
-
-# Load match data
-matches = pd.read_csv('data/processed/quality_matches_dataset.csv')
-print(f"✅ Loaded {len(matches)} matches")
+    def finish(frame, columns):
+        frame = frame.sort_values(['_match', 'innings', 'pos']).reset_index()
+        frame['player'] = frame['player'].astype(str)
+        frame['format'] = match_format
+        frame['venue'] = frame['_match'].map(venue)
+        frame['season'] = frame['_match'].map(season)
+        if keep_match:
+            columns = ['_match'] + columns
+        return frame.reindex(columns=columns).reset_index(drop=True)
+
+    # BATTING ANALYSIS
+    if 'striker' in balls.columns:
+        batting = flags.assign(player=balls['striker'].array).groupby(
+            ['_match', 'innings', 'player'], sort=False, observed=True).agg(
+            pos=('pos', 'min'), runs=('runs', 'sum'), balls=('pos', 'size'),
+            fours=('fours', 'sum'), sixes=('sixes', 'sum'), dots=('dots', 'sum'),
+            ones=('ones', 'sum'), twos=('twos', 'sum'), threes=('threes', 'sum'),
+            dismissed=('wicket', 'any'))
+        batting = batting[batting['balls'] >= 3].astype({
+            'runs': int, 'balls': int, 'fours': int, 'sixes': int, 'dots': int,
+            'ones': int, 'twos': int, 'threes': int, 'dismissed': int})
+        batting['strike_rate'] = (batting['runs'] / batting['balls'] * 100).round(2)
+        batting['boundary_percentage'] = ((batting['fours'] + batting['sixes']) / batting['balls'] * 100).round(2)
+        batting['dot_ball_percentage'] = (batting['dots'] / batting['balls'] * 100).round(2)
+        batting = finish(batting, BATTING_COLUMNS)
+    else:
+        batting = pd.DataFrame(columns=BATTING_COLUMNS)
+
+    # BOWLING ANALYSIS
+    if 'bowler' in balls.columns:
+        bowling = flags.assign(player=balls['bowler'].array).groupby(
+            ['_match', 'innings', 'player'], sort=False, observed=True).agg(
+            pos=('pos', 'min'), balls_bowled=('pos', 'size'), runs=('runs', 'sum'),
+            extras=('extras', 'sum'), wickets=('wicket', 'sum'), dots=('dots', 'sum'),
+            fours_conceded=('fours', 'sum'), sixes_conceded=('sixes', 'sum'))
+        bowling = bowling[bowling['balls_bowled'] >= 6]
+        bowling['runs_conceded'] = (bowling['runs'] + bowling['extras']).astype(int)
+        bowling = bowling.astype({'balls_bowled': int, 'wickets': int, 'dots': int,
+                                  'fours_conceded': int, 'sixes_conceded': int})
+        bowling['economy'] = (bowling['runs_conceded'] / (bowling['balls_bowled'] / 6)).round(2)
+        bowling['strike_rate'] = (bowling['balls_bowled'] / bowling['wickets'].where(bowling['wickets'] > 0)).round(2).fillna(0)
+        bowling['dot_ball_percentage'] = (bowling['dots'] / bowling['balls_bowled'] * 100).round(2)
+        bowling = finish(bowling, BOWLING_COLUMNS)
+    else:
+        bowling = pd.DataFrame(columns=BOWLING_COLUMNS)
+
+    return batting, bowling
+
+
+def extract_match_performances(df, match_format):
+    """Per-innings batting and bowling rows for one match (None if unusable)"""
+    df = prepare_match(df)
+    if df is None:
+        return None
+
+    batting, bowling = aggregate_performances(df.assign(_match=0), match_format)
+    return batting.to_dict('records'), bowling.to_dict('records')
+
+
+def extract_batch_performances(frames, match_format):
+    """extract_match_performances for many matches in one aggregation pass
+
+    Returns one (batting, bowling) pair of row lists per frame, None where
+    the match is unusable or its frame is None (a file that failed to read). If the stacked pass fails the matches are
+    retried one at a time, so a single bad file only loses its own rows.
+    """
+    results = [None] * len(frames)
+    prepared = [(i, prepare_match(df)) for i, df in enumerate(frames) if df is not None]
+    prepared = [(i, df) for i, df in prepared if df is not None]
+    if not prepared:
+        return results
+
+    try:
+        balls = pd.concat([df.assign(_match=i) for i, df in prepared], ignore_index=True)
+        batting, bowling = aggregate_performances(balls, match_format, keep_match=True)
+    except Exception:
+        for i, df in prepared:
+            try:
+                results[i] = extract_match_performances(df, match_format)
+            except Exception:
+                pass
+        return results
+
+    for i, _ in prepared:
+        results[i] = ([], [])
+    for row in batting.to_dict('records'):
+        results[row.pop('_match')][0].append(row)
+    for row in bowling.to_dict('records'):
+        results[row.pop('_match')][1].append(row)
+    return results
+
+
+def extract_all_performances(formats, store_root=STORE_ROOT):
+    """Batting and bowling frames for every match, aggregated BATCH_MATCHES at a time
+
+    Reads the columnar store under store_root when it has been built,
+    otherwise the raw files in each format's folder.
+    """
+    batting_frames = []
+    bowling_frames = []
+    processed = 0
+
+    for match_format, folder in formats.items():
+        if not source_exists(folder):
+            continue
 
-# Extract all player data from raw files
-print("\n📊 Extracting detailed player statistics...")
+        n_files = match_count(match_format, folder, store_root)
+        print(f"\n   Processing {match_format} ({n_files} files)...")
 
-all_batting_performances = []
-all_bowling_performances = []
+        batch = []
+        batch_ids = []
 
-# Process raw match files
-formats = {
-    'T20': 'data/raw/t20/',
-    'IPL': 'data/raw/ipl/',
-    'ODI': 'data/raw/odi/'
-}
+        def flush():
+            balls = pd.concat([m.assign(_match=i) for i, m in enumerate(batch)], ignore_index=True)
+            batting, bowling = aggregate_performances(balls, match_format, keep_match=True)
+            match_ids = pd.Series(batch_ids)
+            for frame, frames in ((batting, batting_frames), (bowling, bowling_frames)):
+                frames.append(frame.assign(_match=frame['_match'].map(match_ids)).rename(columns={'_match': 'match_id'}))
+            batch.clear()
+            batch_ids.clear()
 
-processed_files = 0
+        for i, (match_id, df) in enumerate(iter_match_frames(match_format, folder, store_root=store_root), 1):
+            if i % 1000 == 0:
+                print(f"      {i}/{n_files} files...")
 
-for match_format, folder in formats.items():
-    if not os.path.exists(folder):
-        continue
-    
-    files = [f for f in os.listdir(folder) if f.endswith('.csv')][:300]  # Process 300 per format
-    
-    print(f"\n   Processing {match_format}...")
-    
-    for i, file in enumerate(files, 1):
-        if i % 100 == 0:
-            print(f"      {i}/{len(files)} files...")
-        
-        try:
-            df = pd.read_csv(os.path.join(folder, file), low_memory=False)
-            
-            if len(df) < 20:
-                continue
-            
-            # Get match info
-            venue = df['venue'].iloc[0] if 'venue' in df.columns else 'Unknown'
-            season = df['season'].iloc[0] if 'season' in df.columns else 'Unknown'
-            
-            innings_col = next((c for c in ['innings', 'inning'] if c in df.columns), None)
-            if not innings_col:
+            df = prepare_match(df)
+            if df is None:
                 continue
-            
-            # Process each innings
-            for innings_num in [1, 2]:
-                innings_data = df[df[innings_col] == innings_num]
-                
-                if len(innings_data) < 10:
-                    continue
-                
-                # BATTING ANALYSIS
-                if 'striker' in innings_data.columns and 'runs_off_bat' in innings_data.columns:
-                    for batsman in innings_data['striker'].unique():
-                        if pd.isna(batsman):
-                            continue
-                        
-                        batsman_balls = innings_data[innings_data['striker'] == batsman]
-                        
-                        runs = batsman_balls['runs_off_bat'].sum()
-                        balls = len(batsman_balls)
-                        
-                        if balls < 3:  # Skip very short innings
-                            continue
-                        
-                        fours = (batsman_balls['runs_off_bat'] == 4).sum()
-                        sixes = (batsman_balls['runs_off_bat'] == 6).sum()
-                        dots = (batsman_balls['runs_off_bat'] == 0).sum()
-                        ones = (batsman_balls['runs_off_bat'] == 1).sum()
-                        twos = (batsman_balls['runs_off_bat'] == 2).sum()
-                        threes = (batsman_balls['runs_off_bat'] == 3).sum()
-                        
-                        # Check if dismissed
-                        dismissed = 1 if 'wicket_type' in batsman_balls.columns and batsman_balls['wicket_type'].notna().any() else 0
-                        
-                        all_batting_performances.append({
-                            'player': str(batsman),
-                            'format': match_format,
-                            'venue': str(venue),
-                            'season': str(season),
-                            'innings': innings_num,
-                            'runs': int(runs),
-                            'balls': int(balls),
-                            'fours': int(fours),
-                            'sixes': int(sixes),
-                            'dots': int(dots),
-                            'ones': int(ones),
-                            'twos': int(twos),
-                            'threes': int(threes),
-                            'dismissed': dismissed,
-                            'strike_rate': round(runs / balls * 100, 2) if balls > 0 else 0,
-                            'boundary_percentage': round((fours + sixes) / balls * 100, 2) if balls > 0 else 0,
-                            'dot_ball_percentage': round(dots / balls * 100, 2) if balls > 0 else 0
-                        })
-                
-                # BOWLING ANALYSIS
-                if 'bowler' in innings_data.columns:
-                    for bowler in innings_data['bowler'].unique():
-                        if pd.isna(bowler):
-                            continue
-                        
-                        bowler_balls = innings_data[innings_data['bowler'] == bowler]
-                        
-                        balls_bowled = len(bowler_balls)
-                        
-                        if balls_bowled < 6:  # At least 1 over
-                            continue
-                        
-                        runs_conceded = bowler_balls['runs_off_bat'].sum()
-                        if 'extras' in bowler_balls.columns:
-                            runs_conceded += bowler_balls['extras'].sum()
-                        
-                        wickets = 0
-                        if 'wicket_type' in bowler_balls.columns:
-                            wickets = bowler_balls['wicket_type'].notna().sum()
-                        
-                        dots = (bowler_balls['runs_off_bat'] == 0).sum()
-                        fours_conceded = (bowler_balls['runs_off_bat'] == 4).sum()
-                        sixes_conceded = (bowler_balls['runs_off_bat'] == 6).sum()
-                        
-                        all_bowling_performances.append({
-                            'player': str(bowler),
-                            'format': match_format,
-                            'venue': str(venue),
-                            'season': str(season),
-                            'innings': innings_num,
-                            'balls_bowled': int(balls_bowled),
-                            'runs_conceded': int(runs_conceded),
-                            'wickets': int(wickets),
-                            'dots': int(dots),
-                            'fours_conceded': int(fours_conceded),
-                            'sixes_conceded': int(sixes_conceded),
-                            'economy': round(runs_conceded / (balls_bowled / 6), 2) if balls_bowled > 0 else 0,
-                            'strike_rate': round(balls_bowled / wickets, 2) if wickets > 0 else 0,
-                            'dot_ball_percentage': round(dots / balls_bowled * 100, 2) if balls_bowled > 0 else 0
-                        })
-            
-            processed_files += 1
-            
-        except Exception as e:
-            continue
-
-print(f"\n✅ Processed {processed_files} match files")
-
-# Create DataFrames
-batting_df = pd.DataFrame(all_batting_performances)
-bowling_df = pd.DataFrame(all_bowling_performances)
-
-print(f"\n📊 Extracted:")
-print(f"   Batting innings: {len(batting_df)}")
-print(f"   Bowling spells: {len(bowling_df)}")
-
-# Save raw performance data
-os.makedirs('data/processed/players', exist_ok=True)
-
-batting_df.to_csv('data/processed/players/batting_performances.csv', index=False)
-bowling_df.to_csv('data/processed/players/bowling_performances.csv', index=False)
-
-print("\n✅ Saved raw performance data")
-
-# Create aggregated player statistics
-print("\n🔧 Calculating aggregated player statistics...")
-
-# BATTING STATISTICS
-batting_stats = batting_df.groupby('player').agg({
-    'runs': ['sum', 'mean', 'std', 'max'],
-    'balls': 'sum',
-    'fours': 'sum',
-    'sixes': 'sum',
-    'dots': 'sum',
-    'dismissed': 'sum',
-    'strike_rate': 'mean',
-    'boundary_percentage': 'mean',
-    'dot_ball_percentage': 'mean',
-    'player': 'count'
-}).reset_index()
-
-batting_stats.columns = ['player', 'total_runs', 'avg_runs_per_innings', 'consistency_std',
-                         'highest_score', 'total_balls', 'total_fours', 'total_sixes',
-                         'total_dots', 'times_dismissed', 'avg_strike_rate', 
-                         'avg_boundary_pct', 'avg_dot_pct', 'innings_played']
-
-# Calculate batting average - FIXED VERSION
-batting_stats['batting_average'] = batting_stats.apply(
-    lambda row: round(row['total_runs'] / row['times_dismissed'], 2) 
-    if row['times_dismissed'] > 0 
-    else row['avg_runs_per_innings'], 
-    axis=1
-)
-
-# Consistency score (lower std = more consistent)
-batting_stats['consistency_score'] = (100 - batting_stats['consistency_std'].fillna(0)).clip(0, 100)
-
-# Filter to players with at least 5 innings
-batting_stats = batting_stats[batting_stats['innings_played'] >= 5]
-
-print(f"   ✅ Batting stats for {len(batting_stats)} players")
-
-# BOWLING STATISTICS
-bowling_stats = bowling_df.groupby('player').agg({
-    'balls_bowled': 'sum',
-    'runs_conceded': ['sum', 'mean'],
-    'wickets': ['sum', 'mean'],
-    'dots': 'sum',
-    'economy': 'mean',
-    'strike_rate': 'mean',
-    'dot_ball_percentage': 'mean',
-    'player': 'count'
-}).reset_index()
-
-bowling_stats.columns = ['player', 'total_balls_bowled', 'total_runs_conceded',
-                         'avg_runs_per_spell', 'total_wickets', 'avg_wickets_per_spell',
-                         'total_dots', 'avg_economy', 'avg_bowling_sr', 
-                         'avg_dot_pct', 'spells_bowled']
-
-# Calculate bowling average - FIXED VERSION
-bowling_stats['bowling_average'] = bowling_stats.apply(
-    lambda row: round(row['total_runs_conceded'] / row['total_wickets'], 2)
-    if row['total_wickets'] > 0
-    else row['avg_runs_per_spell'] * 6,
-    axis=1
-)
-
-# Filter to bowlers with at least 5 spells
-bowling_stats = bowling_stats[bowling_stats['spells_bowled'] >= 5]
-
-print(f"   ✅ Bowling stats for {len(bowling_stats)} players")
-
-# Save aggregated stats
-batting_stats.to_csv('data/processed/players/batting_statistics.csv', index=False)
-bowling_stats.to_csv('data/processed/players/bowling_statistics.csv', index=False)
-
-print("\n✅ Saved aggregated statistics")
-
-# Create SPECIAL SHOTS database (based on patterns)
-print("\n🎯 Analyzing special shots...")
-
-special_shots = []
-
-for player in batting_stats['player'].head(200):  # Top 200 players
-    player_data = batting_df[batting_df['player'] == player]
-    
-    if len(player_data) == 0:
-        continue
+            batch.append(df)
+            batch_ids.append(match_id)
+            processed += 1
+            if len(batch) >= BATCH_MATCHES:
+                flush()
+
+        if batch:
+            flush()
+
+    # Same (format, match_id) order as the incremental path, whatever order the store yielded
+    batting_df = pd.concat(batting_frames, ignore_index=True) if batting_frames else pd.DataFrame(columns=BATTING_COLUMNS)
+    bowling_df = pd.concat(bowling_frames, ignore_index=True) if bowling_frames else pd.DataFrame(columns=BOWLING_COLUMNS)
+    batting_df = sort_matches(batting_df, formats, format_column='format')
+    bowling_df = sort_matches(bowling_df, formats, format_column='format')
+    return batting_df, bowling_df, processed
+
+
+def extract_incremental(formats):
+    """Parse only added/changed files and patch the rest in from the manifest"""
+    manifest = IngestManifest()
+    plan = manifest.scan(formats, ['batting', 'bowling'])
+    print(f"\n   📋 Manifest: {plan.summary()}")
     
-    total_boundaries = player_data['fours'].sum() + player_data['sixes'].sum()
-    total_runs = player_data['runs'].sum()
-    avg_sr = player_data['strike_rate'].mean()
-    six_ratio = player_data['sixes'].sum() / total_boundaries if total_boundaries > 0 else 0
+    to_parse = plan.to_parse
+    done = 0
+    tasks = ((entry, entry.match_format) for entry in to_parse)
+    for batch, match_format in batch_tasks(tasks, BATCH_MATCHES):
+        frames = []
+        for entry in batch:
+            try:
+                frames.append(read_match(entry.path, low_memory=False))
+            except Exception:
+                frames.append(None)
+        
+        for entry, performances in zip(batch, extract_batch_performances(frames, match_format)):
+            batting, bowling = performances or ([], [])
+            manifest.record(entry, {'batting': batting, 'bowling': bowling})
+        
+        done += len(batch)
+        print(f"      {done}/{len(to_parse)} files...")
     
-    # Determine special shot based on stats
-    special_shot = "Defensive Player"
+    manifest.forget(plan.removed)
+    batting_df = sort_matches(manifest.table('batting'), formats, format_column='format')
+    bowling_df = sort_matches(manifest.table('bowling'), formats, format_column='format')
+    manifest.save()
     
-    if six_ratio > 0.4 and avg_sr > 140:
-        special_shot = "Power Hitter - Helicopter Shot"
-    elif six_ratio > 0.35 and avg_sr > 130:
-        special_shot = "Aggressive Batsman - Pull Shot"
-    elif avg_sr > 140:
-        special_shot = "Quick Scorer - Scoop Shot"
-    elif avg_sr > 120:
-        special_shot = "Stroke Player - Cover Drive"
-    elif six_ratio < 0.2 and avg_sr < 110:
-        special_shot = "Anchor - Straight Drive"
-    else:
-        special_shot = "Balanced Batsman - Square Cut"
+    processed = sum(1 for e in manifest.entries.values()
+                    if e['rows'].get('batting') or e['rows'].get('bowling'))
+    return batting_df, bowling_df, processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the player performance database")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only parse raw files added or changed since the last run")
+    args = parser.parse_args()
     
-    special_shots.append({
-        'player': player,
-        'special_shot': special_shot,
-        'signature_style': 'Aggressive' if avg_sr > 130 else 'Balanced' if avg_sr > 110 else 'Defensive'
-    })
+    print("🏏 BUILDING COMPLETE PLAYER PERFORMANCE DATABASE")
+    print("="*70)
 
-special_shots_df = pd.DataFrame(special_shots)
-special_shots_df.to_csv('data/processed/players/special_shots.csv', index=False)
+    # Load match data
+    matches = pd.read_csv('data/processed/quality_matches_dataset.csv')
+    print(f"✅ Loaded {len(matches)} matches")
 
-print(f"   ✅ Special shots for {len(special_shots_df)} players")
+    # Extract all player data from raw files
+    print("\n📊 Extracting detailed player statistics...")
 
-# Create player roles classification
-print("\n👥 Classifying player roles...")
+    # Process raw match files
+    formats = {
+        'T20': 'data/raw/t20/',
+        'IPL': 'data/raw/ipl/',
+        'ODI': 'data/raw/odi/'
+    }
 
-player_roles = []
+    processed_files = 0
 
-for player in batting_stats['player'].head(300):
-    bat_data = batting_stats[batting_stats['player'] == player]
-    bowl_data = bowling_stats[bowling_stats['player'] == player]
-    
-    has_batting = len(bat_data) > 0
-    has_bowling = len(bowl_data) > 0
-    
-    if has_batting and has_bowling:
-        avg_runs = bat_data['avg_runs_per_innings'].values[0]
-        avg_wickets = bowl_data['avg_wickets_per_spell'].values[0]
-        
-        if avg_runs > 25 and avg_wickets > 1:
-            role = "All-Rounder"
-            batting_position = "5-7"
-        elif avg_runs > 20:
-            role = "Batting All-Rounder"
-            batting_position = "6-7"
-        else:
-            role = "Bowling All-Rounder"
-            batting_position = "7-9"
-    elif has_batting:
-        avg_runs = bat_data['avg_runs_per_innings'].values[0]
-        avg_sr = bat_data['avg_strike_rate'].values[0]
-        
-        if avg_runs > 35 and avg_sr > 130:
-            role = "Top-Order Batsman"
-            batting_position = "1-3"
-        elif avg_runs > 25:
-            role = "Middle-Order Batsman"
-            batting_position = "3-5"
+    if args.incremental:
+        batting_df, bowling_df, processed_files = extract_incremental(formats)
+    else:
+        batting_df, bowling_df, processed_files = extract_all_performances(formats)
+
+    print(f"\n✅ Processed {processed_files} match files")
+
+    print(f"\n📊 Extracted:")
+    print(f"   Batting innings: {len(batting_df)}")
+    print(f"   Bowling spells: {len(bowling_df)}")
+
+    # Save raw performance data
+    os.makedirs('data/processed/players', exist_ok=True)
+
+    batting_df.to_csv('data/processed/players/batting_performances.csv', index=False)
+    bowling_df.to_csv('data/processed/players/bowling_performances.csv', index=False)
+
+    print("\n✅ Saved raw performance data")
+
+    # Create aggregated player statistics
+    print("\n🔧 Calculating aggregated player statistics...")
+
+    # BATTING STATISTICS
+    batting_stats = batting_df.groupby('player').agg({
+        'runs': ['sum', 'mean', 'std', 'max'],
+        'balls': 'sum',
+        'fours': 'sum',
+        'sixes': 'sum',
+        'dots': 'sum',
+        'dismissed': 'sum',
+        'strike_rate': 'mean',
+        'boundary_percentage': 'mean',
+        'dot_ball_percentage': 'mean',
+        'player': 'count'
+    }).reset_index()
+
+    batting_stats.columns = ['player', 'total_runs', 'avg_runs_per_innings', 'consistency_std',
+                             'highest_score', 'total_balls', 'total_fours', 'total_sixes',
+                             'total_dots', 'times_dismissed', 'avg_strike_rate', 
+                             'avg_boundary_pct', 'avg_dot_pct', 'innings_played']
+
+    # Calculate batting average - FIXED VERSION
+    batting_stats['batting_average'] = batting_stats.apply(
+        lambda row: round(row['total_runs'] / row['times_dismissed'], 2) 
+        if row['times_dismissed'] > 0 
+        else row['avg_runs_per_innings'], 
+        axis=1
+    )
+
+    # Consistency score (lower std = more consistent)
+    batting_stats['consistency_score'] = (100 - batting_stats['consistency_std'].fillna(0)).clip(0, 100)
+
+    # Filter to players with at least 5 innings
+    batting_stats = batting_stats[batting_stats['innings_played'] >= 5]
+
+    print(f"   ✅ Batting stats for {len(batting_stats)} players")
+
+    # BOWLING STATISTICS
+    bowling_stats = bowling_df.groupby('player').agg({
+        'balls_bowled': 'sum',
+        'runs_conceded': ['sum', 'mean'],
+        'wickets': ['sum', 'mean'],
+        'dots': 'sum',
+        'economy': 'mean',
+        'strike_rate': 'mean',
+        'dot_ball_percentage': 'mean',
+        'player': 'count'
+    }).reset_index()
+
+    bowling_stats.columns = ['player', 'total_balls_bowled', 'total_runs_conceded',
+                             'avg_runs_per_spell', 'total_wickets', 'avg_wickets_per_spell',
+                             'total_dots', 'avg_economy', 'avg_bowling_sr', 
+                             'avg_dot_pct', 'spells_bowled']
+
+    # Calculate bowling average - FIXED VERSION
+    bowling_stats['bowling_average'] = bowling_stats.apply(
+        lambda row: round(row['total_runs_conceded'] / row['total_wickets'], 2)
+        if row['total_wickets'] > 0
+        else row['avg_runs_per_spell'] * 6,
+        axis=1
+    )
+
+    # Filter to bowlers with at least 5 spells
+    bowling_stats = bowling_stats[bowling_stats['spells_bowled'] >= 5]
+
+    print(f"   ✅ Bowling stats for {len(bowling_stats)} players")
+
+    # Save aggregated stats
+    batting_stats.to_csv('data/processed/players/batting_statistics.csv', index=False)
+    bowling_stats.to_csv('data/processed/players/bowling_statistics.csv', index=False)
+
+    print("\n✅ Saved aggregated statistics")
+
+    # Create SPECIAL SHOTS database (based on patterns)
+    print("\n🎯 Analyzing special shots...")
+
+    special_shots = []
+
+    for player in batting_stats['player'].head(200):  # Top 200 players
+        player_data = batting_df[batting_df['player'] == player]
+
+        if len(player_data) == 0:
+            continue
+
+        total_boundaries = player_data['fours'].sum() + player_data['sixes'].sum()
+        avg_sr = player_data['strike_rate'].mean()
+        six_ratio = player_data['sixes'].sum() / total_boundaries if total_boundaries > 0 else 0
+
+        # Determine special shot based on stats
+        special_shot = "Defensive Player"
+
+        if six_ratio > 0.4 and avg_sr > 140:
+            special_shot = "Power Hitter - Helicopter Shot"
+        elif six_ratio > 0.35 and avg_sr > 130:
+            special_shot = "Aggressive Batsman - Pull Shot"
         elif avg_sr > 140:
-            role = "Finisher"
-            batting_position = "5-7"
+            special_shot = "Quick Scorer - Scoop Shot"
+        elif avg_sr > 120:
+            special_shot = "Stroke Player - Cover Drive"
+        elif six_ratio < 0.2 and avg_sr < 110:
+            special_shot = "Anchor - Straight Drive"
         else:
-            role = "Lower-Order Batsman"
-            batting_position = "7-9"
-    elif has_bowling:
-        avg_economy = bowl_data['avg_economy'].values[0]
-        avg_wickets = bowl_data['avg_wickets_per_spell'].values[0]
-        
-        if avg_economy < 7 and avg_wickets > 1.5:
-            role = "Strike Bowler"
-        elif avg_economy < 7:
-            role = "Economical Bowler"
+            special_shot = "Balanced Batsman - Square Cut"
+
+        special_shots.append({
+            'player': player,
+            'special_shot': special_shot,
+            'signature_style': 'Aggressive' if avg_sr > 130 else 'Balanced' if avg_sr > 110 else 'Defensive'
+        })
+
+    special_shots_df = pd.DataFrame(special_shots)
+    special_shots_df.to_csv('data/processed/players/special_shots.csv', index=False)
+
+    print(f"   ✅ Special shots for {len(special_shots_df)} players")
+
+    # Create player roles classification
+    print("\n👥 Classifying player roles...")
+
+    player_roles = []
+
+    for player in batting_stats['player'].head(300):
+        bat_data = batting_stats[batting_stats['player'] == player]
+        bowl_data = bowling_stats[bowling_stats['player'] == player]
+
+        has_batting = len(bat_data) > 0
+        has_bowling = len(bowl_data) > 0
+
+        if has_batting and has_bowling:
+            avg_runs = bat_data['avg_runs_per_innings'].values[0]
+            avg_wickets = bowl_data['avg_wickets_per_spell'].values[0]
+
+            if avg_runs > 25 and avg_wickets > 1:
+                role = "All-Rounder"
+                batting_position = "5-7"
+            elif avg_runs > 20:
+                role = "Batting All-Rounder"
+                batting_position = "6-7"
+            else:
+                role = "Bowling All-Rounder"
+                batting_position = "7-9"
+        elif has_batting:
+            avg_runs = bat_data['avg_runs_per_innings'].values[0]
+            avg_sr = bat_data['avg_strike_rate'].values[0]
+
+            if avg_runs > 35 and avg_sr > 130:
+                role = "Top-Order Batsman"
+                batting_position = "1-3"
+            elif avg_runs > 25:
+                role = "Middle-Order Batsman"
+                batting_position = "3-5"
+            elif avg_sr > 140:
+                role = "Finisher"
+                batting_position = "5-7"
+            else:
+                role = "Lower-Order Batsman"
+                batting_position = "7-9"
+        elif has_bowling:
+            avg_economy = bowl_data['avg_economy'].values[0]
+            avg_wickets = bowl_data['avg_wickets_per_spell'].values[0]
+
+            if avg_economy < 7 and avg_wickets > 1.5:
+                role = "Strike Bowler"
+            elif avg_economy < 7:
+                role = "Economical Bowler"
+            else:
+                role = "Support Bowler"
+
+            batting_position = "9-11"
         else:
-            role = "Support Bowler"
-        
-        batting_position = "9-11"
-    else:
-        continue
-    
-    player_roles.append({
-        'player': player,
-        'role': role,
-        'batting_position': batting_position
-    })
+            continue
+
+        player_roles.append({
+            'player': player,
+            'role': role,
+            'batting_position': batting_position
+        })
+
+    player_roles_df = pd.DataFrame(player_roles)
+    player_roles_df.to_csv('data/processed/players/player_roles.csv', index=False)
+
+    print(f"   ✅ Roles for {len(player_roles_df)} players")
 
-player_roles_df = pd.DataFrame(player_roles)
-player_roles_df.to_csv('data/processed/players/player_roles.csv', index=False)
+    print("\n" + "="*70)
+    print("🎉 PLAYER DATABASE CREATED!")
+    print("="*70)
+    print(f"✅ Batting stats: {len(batting_stats)} players")
+    print(f"✅ Bowling stats: {len(bowling_stats)} players")
+    print(f"✅ Special shots: {len(special_shots_df)} players")
+    print(f"✅ Player roles: {len(player_roles_df)} players")
+    print("\nFiles saved in: data/processed/players/")
+    print("\n🚀 Next step: Run player_performance_module.py to analyze players!")
 
-print(f"   ✅ Roles for {len(player_roles_df)} players")
 
-print("\n" + "="*70)
-print("🎉 PLAYER DATABASE CREATED!")
-print("="*70)
-print(f"✅ Batting stats: {len(batting_stats)} players")
-print(f"✅ Bowling stats: {len(bowling_stats)} players")
-print(f"✅ Special shots: {len(special_shots_df)} players")
-print(f"✅ Player roles: {len(player_roles_df)} players")
-print("\nFiles saved in: data/processed/players/")
-print("\n🚀 Next step: Run player_performance_module.py to analyze players!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -7,85 +7,16 @@ from sklearn.metrics import accuracy_score
 import pickle
 import os
 
+from feature_store import load_features
+
 print("🚀 Quick Model Training & Save")
 print("="*70)
 
-# Load data
-matches = pd.read_csv('data/processed/quality_matches_dataset.csv')
-print(f"✅ Loaded {len(matches)} matches")
-
-# Quick clean
-matches = matches[
-    (matches['team1_runs'] >= 80) & 
-    (matches['team1_runs'] <= 350) &
-    (matches['team1_wickets'] <= 10)
-]
-print(f"   Cleaned: {len(matches)} matches")
-
-# Team stats
-team_stats = {}
-for team in pd.concat([matches['team1'], matches['team2']]).unique():
-    t1 = matches[matches['team1'] == team]
-    t2 = matches[matches['team2'] == team]
-    total = len(t1) + len(t2)
-    if total == 0:
-        continue
-    
-    wins = t1['team1_won'].sum() + (len(t2) - t2['team1_won'].sum())
-    
-    team_stats[team] = {
-        'wr': wins / total,
-        'bat_wr': t1['team1_won'].mean() if len(t1) > 0 else 0.5,
-        'chase_wr': (1 - t2['team1_won'].mean()) if len(t2) > 0 else 0.5,
-        'avg_score': t1['team1_runs'].mean() if len(t1) > 0 else 150
-    }
-
-matches['t1_wr'] = matches['team1'].map(lambda x: team_stats.get(x, {}).get('wr', 0.5))
-matches['t2_wr'] = matches['team2'].map(lambda x: team_stats.get(x, {}).get('wr', 0.5))
-matches['t1_bat_wr'] = matches['team1'].map(lambda x: team_stats.get(x, {}).get('bat_wr', 0.5))
-matches['t2_chase_wr'] = matches['team2'].map(lambda x: team_stats.get(x, {}).get('chase_wr', 0.5))
-matches['t1_avg_score'] = matches['team1'].map(lambda x: team_stats.get(x, {}).get('avg_score', 150))
-
-# Venue stats
-venue_stats = matches.groupby('venue').agg({
-    'team1_runs': ['mean', 'std'],
-    'team1_won': 'mean',
-    'team1_run_rate': 'mean'
-}).reset_index()
-venue_stats.columns = ['venue', 'v_avg', 'v_std', 'v_bat_adv', 'v_rr']
-matches = matches.merge(venue_stats, on='venue', how='left')
-matches.fillna({'v_avg': 160, 'v_std': 25, 'v_bat_adv': 0.5, 'v_rr': 7.0}, inplace=True)
-
-# Features
-matches['runs'] = matches['team1_runs']
-matches['wickets'] = matches['team1_wickets']
-matches['rr'] = matches['team1_run_rate']
-matches['score_above_venue'] = (matches['runs'] - matches['v_avg']) / matches['v_std']
-matches['team_strength'] = matches['t1_wr'] - matches['t2_wr']
-matches['situation_advantage'] = matches['t1_bat_wr'] - matches['t2_chase_wr']
-matches['wickets_remaining'] = 10 - matches['wickets']
-matches['wicket_quality'] = matches['wickets_remaining'] / 10 * (matches['runs'] / 150)
-matches['big_score'] = (matches['runs'] >= matches['v_avg'] + 15).astype(int)
-matches['low_wickets'] = (matches['wickets'] <= 5).astype(int)
-matches['dominant_performance'] = matches['big_score'] * matches['low_wickets']
-matches['balanced_match'] = (abs(matches['team_strength']) < 0.15).astype(int)
-matches['score_normalized'] = matches['runs'] / matches['v_avg']
-matches['overall_strength'] = (
-    matches['score_above_venue'] * 0.4 +
-    matches['team_strength'] * 0.3 +
-    matches['wicket_quality'] * 0.2 +
-    matches['situation_advantage'] * 0.1
-)
-
-features = [
-    'runs', 'wickets', 'rr', 't1_wr', 't2_wr', 't1_bat_wr', 't2_chase_wr',
-    'v_avg', 'v_bat_adv', 'score_above_venue', 'team_strength', 'situation_advantage',
-    'wickets_remaining', 'wicket_quality', 'big_score', 'low_wickets', 'dominant_performance',
-    'balanced_match', 'score_normalized', 'overall_strength'
-]
-
-X = matches[features].fillna(0)
-y = matches['team1_won']
+# Engineered features, cached per dataset version (see feature_store.py)
+fs = load_features('quick')
+X, y = fs.X, fs.y
+features = fs.features
+team_stats, venue_stats = fs.team_stats, fs.venue_stats
 
 print(f"✅ Features: {len(features)}")
 
@@ -125,7 +56,8 @@ print("   ✅ Team stats saved")
 venue_stats.to_csv('data/processed/venue_statistics_complete.csv', index=False)
 print("   ✅ Venue stats saved")
 
-model_info = {'features': features, 'accuracy': accuracy}
+model_info = {'features': features, 'accuracy': accuracy,
+              'feature_set': fs.name, 'feature_version': fs.version}
 with open('models/model_info.pkl', 'wb') as f:
     pickle.dump(model_info, f)
 print("   ✅ Model info saved")
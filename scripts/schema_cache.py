@@ -0,0 +1,185 @@
+"""Schema fingerprint cache for heterogeneous raw ball-by-ball CSVs.
+
+The extractors accept several column layouts (``innings``/``inning``,
+``runs_off_bat``/``runs``...) and used to retry encodings and probe the
+candidate names on every file. Files that share a header share a layout, so
+the header line is fingerprinted once. The cached ``FileSchema`` remembers
+the encoding that decoded it and which candidate columns are present. Reads
+then use ``usecols`` and explicit dtypes for just the columns an extractor
+needs, and return the compact frame from ``ball_store.compact_balls``.
+
+Usage:
+  from schema_cache import read_with_schema
+  df, schema = read_with_schema(path, ['innings', 'inning', 'runs_off_bat', 'runs'])
+  innings_col = schema.find('innings', 'inning')    # memoized per fingerprint
+
+``path`` may be a raw CSV path, a zip member, a ``ball_store.StoreMatch``
+(loaded from the columnar store) or an already-loaded frame, which is
+returned unchanged.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ball_store import RAW_ENCODINGS, StoreMatch, compact_balls
+from match_sources import ZipMember, read_source
+
+
+ENCODINGS = RAW_ENCODINGS
+
+# Parse dtypes by column name. Run counts and innings numbers are small
+# integers, exact in float32 and NaN-safe. The standard Cricsheet columns are
+# then narrowed further by compact_balls (int8 runs, categorical names).
+TEXT_COLUMNS = {
+    "match_id", "season", "year", "start_date", "date", "venue", "ground", "city",
+    "batting_team", "team", "batting_side", "bowling_team", "striker", "non_striker",
+    "bowler", "wicket_type", "wicket", "dismissal", "player_dismissed",
+    "winner", "winning_team", "match_winner",
+}
+FLOAT32_COLUMNS = {
+    "innings", "inning", "innings_number", "runs_off_bat", "runs", "runs_scored",
+    "extras", "extra", "wides", "noballs", "byes", "legbyes", "penalty",
+    "ball", "over", "overs",
+}
+
+_BOM = b"\xef\xbb\xbf"
+
+
+def column_dtype(column: str) -> Optional[str]:
+    if column in TEXT_COLUMNS:
+        return "str"
+    if column in FLOAT32_COLUMNS:
+        return "float32"
+    return None
+
+
+@dataclass
+class FileSchema:
+    """Resolved layout of every file sharing one header."""
+
+    fingerprint: str
+    columns: Tuple[str, ...]
+    encoding: Optional[str] = None
+    _lookups: Dict[Tuple, object] = field(default_factory=dict, repr=False)
+
+    def find(self, *candidates: str) -> Optional[str]:
+        """First candidate column present in the header (None if none are)."""
+        key = ("find",) + candidates
+        if key not in self._lookups:
+            self._lookups[key] = next((c for c in candidates if c in self.columns), None)
+        return self._lookups[key]
+
+    def present(self, *candidates: str) -> List[str]:
+        """Every candidate column present in the header, in candidate order."""
+        key = ("present",) + candidates
+        if key not in self._lookups:
+            self._lookups[key] = [c for c in candidates if c in self.columns]
+        return self._lookups[key]
+
+    def read_options(self, wanted: Sequence[str]) -> Tuple[List[str], Dict[str, str]]:
+        """``usecols`` (in header order) and ``dtype`` for the wanted columns."""
+        key = ("read",) + tuple(wanted)
+        if key not in self._lookups:
+            wanted_set = set(wanted)
+            usecols = [c for c in self.columns if c in wanted_set]
+            dtype = {c: column_dtype(c) for c in usecols if column_dtype(c)}
+            self._lookups[key] = (usecols, dtype)
+        return self._lookups[key]
+
+
+def _read_header(source) -> bytes:
+    if isinstance(source, ZipMember):
+        with source.open() as f:
+            return f.readline()
+    with open(source, "rb") as f:
+        return f.readline()
+
+
+class SchemaCache:
+    """Header fingerprint -> FileSchema, shared by every read in the process."""
+
+    def __init__(self, encodings: Iterable[str] = ENCODINGS):
+        self.encodings = tuple(encodings)
+        self.schemas: Dict[str, FileSchema] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def detect(self, source) -> FileSchema:
+        if isinstance(source, pd.DataFrame):
+            fingerprint = "frame:" + "\x1f".join(map(str, source.columns))
+            header = None
+        else:
+            header = _read_header(source)
+            if header.startswith(_BOM):
+                header = header[len(_BOM):]
+            fingerprint = hashlib.sha1(header).hexdigest()
+
+        schema = self.schemas.get(fingerprint)
+        if schema is not None:
+            self.hits += 1
+            return schema
+
+        self.misses += 1
+        if header is None:
+            schema = FileSchema(fingerprint, tuple(source.columns))
+        else:
+            schema = self._parse_header(fingerprint, header)
+        self.schemas[fingerprint] = schema
+        return schema
+
+    def _parse_header(self, fingerprint: str, header: bytes) -> FileSchema:
+        for encoding in self.encodings:
+            try:
+                text = header.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+            row = next(csv.reader([text.rstrip("\r\n")]), [])
+            return FileSchema(fingerprint, tuple(c.strip() for c in row), encoding)
+        raise ValueError("header could not be decoded with any known encoding")
+
+    def read(self, source, wanted: Sequence[str],
+             encodings: Optional[Sequence[str]] = None) -> Tuple[pd.DataFrame, FileSchema]:
+        """Read only the ``wanted`` columns of a raw file, typed.
+
+        The encoding that decoded the header is tried first; the others are
+        only tried if the full read fails, which does not change the cached
+        schema for the next file.
+        """
+        if isinstance(source, StoreMatch):
+            source = source.frame()
+        schema = self.detect(source)
+        if isinstance(source, pd.DataFrame):
+            return source, schema
+
+        encodings = tuple(encodings or self.encodings)
+        if schema.encoding in encodings:
+            encodings = (schema.encoding,) + tuple(e for e in encodings if e != schema.encoding)
+        usecols, dtype = schema.read_options(wanted)
+
+        error: Optional[Exception] = None
+        for encoding in encodings:
+            try:
+                df = read_source(source, encoding=encoding, usecols=usecols, dtype=dtype)
+                return compact_balls(df), schema
+            except Exception as e:
+                error = e
+        raise error
+
+
+_default_cache = SchemaCache()
+
+
+def default_cache() -> SchemaCache:
+    return _default_cache
+
+
+def read_with_schema(source, wanted: Sequence[str],
+                     encodings: Optional[Sequence[str]] = None) -> Tuple[pd.DataFrame, FileSchema]:
+    """``SchemaCache.read`` on the process-wide cache."""
+    return _default_cache.read(source, wanted, encodings)
@@ -0,0 +1,261 @@
+"""Synthetic Cricsheet corpus generator.
+
+Writes ball-by-ball ``<match_id>.csv`` files (csv2 layout) and matching
+``<match_id>_info.csv`` files that look like the real downloads: 11-a-side
+squads, legal deliveries plus wides/no-balls, rotating strike, wickets,
+chases that stop once the target is passed, and an info file with the
+toss, result and playing XIs. The corpus is meant for scaling tests of the
+extraction scripts at sizes the real ~17k-file corpus cannot reach.
+
+Usage:
+  python scripts/synth_cricsheet.py --out data/synth --matches 5000
+  python scripts/synth_cricsheet.py --out data/synth --matches 20000 --formats T20 --zip
+
+Output mirrors data/raw: ``<out>/<format>/`` folders, or with ``--zip`` the
+``<out>/<format>_data.zip`` archives that match_sources.py reads in place.
+The same seed always produces the same corpus.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import io
+import os
+import random
+import time
+import zipfile
+from typing import Dict, List, Optional, Tuple
+
+from ball_store import BALL_COLUMNS, FORMATS
+
+
+SYNTH_ROOT = "data/synth"
+FIRST_MATCH_ID = 9_000_001
+
+OVERS = {"T20": 20, "IPL": 20, "ODI": 50}
+EVENTS = {"T20": "Synthetic T20 Series", "IPL": "Synthetic Premier League", "ODI": "Synthetic ODI Series"}
+
+# Runs off the bat on a legal delivery, per format
+RUN_WEIGHTS = {
+    "T20": ((0, 1, 2, 3, 4, 6), (36, 36, 8, 1, 13, 6)),
+    "IPL": ((0, 1, 2, 3, 4, 6), (35, 36, 8, 1, 13, 7)),
+    "ODI": ((0, 1, 2, 3, 4, 6), (48, 33, 7, 1, 9, 2)),
+}
+WICKET_RATE = {"T20": 0.055, "IPL": 0.052, "ODI": 0.035}
+WICKET_TYPES = (("caught", "bowled", "lbw", "run out", "stumped", "caught and bowled"),
+                (60, 15, 11, 8, 3, 3))
+
+CITIES = ["Mumbai", "Chennai", "Kolkata", "Delhi", "Bengaluru", "Hyderabad", "Jaipur", "Mohali",
+          "Lahore", "Karachi", "Colombo", "Dhaka", "Sydney", "Melbourne", "Perth", "Adelaide",
+          "London", "Birmingham", "Leeds", "Cardiff", "Cape Town", "Durban", "Johannesburg",
+          "Auckland", "Wellington", "Kingston", "Bridgetown", "Harare", "Dubai", "Sharjah"]
+MASCOTS = ["Kings", "Royals", "Titans", "Strikers", "Warriors", "Giants", "Chargers", "Knights",
+           "Hurricanes", "Stars", "Renegades", "Thunder", "Panthers", "Lions", "Falcons"]
+SURNAMES = ["Sharma", "Khan", "Patel", "Singh", "Smith", "Jones", "Williams", "Taylor", "Brown",
+            "Perera", "Silva", "Ahmed", "Hossain", "Rahman", "Kumar", "Reddy", "Iyer", "Nair",
+            "Clarke", "Walker", "Morgan", "Stokes", "Root", "Starc", "Cummins", "Boult", "Southee",
+            "Gupta", "Joshi", "Mehta", "Malik", "Butt", "Mendis", "Fernando", "Holder", "Lewis"]
+GROUND_TYPES = ["Cricket Ground", "Stadium", "Oval", "Park", "Sports Club Ground"]
+
+
+def _squads(rng: random.Random, n_teams: int, squad_size: int = 18) -> Dict[str, List[str]]:
+    teams: Dict[str, List[str]] = {}
+    while len(teams) < n_teams:
+        name = f"{rng.choice(CITIES)} {rng.choice(MASCOTS)}"
+        if name in teams:
+            continue
+        players = set()
+        while len(players) < squad_size:
+            initials = "".join(rng.choice("ABCDEFGHJKLMNPRSTVW") for _ in range(rng.choice((1, 2, 2, 3))))
+            players.add(f"{initials} {rng.choice(SURNAMES)}")
+        teams[name] = sorted(players)
+    return teams
+
+
+def _venues(rng: random.Random, n_venues: int) -> List[Tuple[str, str]]:
+    venues = set()
+    while len(venues) < n_venues:
+        city = rng.choice(CITIES)
+        venues.add((f"{rng.choice(SURNAMES)} {rng.choice(GROUND_TYPES)}, {city}", city))
+    return sorted(venues)
+
+
+def _innings(rng: random.Random, fmt: str, innings: int, batting: List[str], bowling: List[str],
+             target: Optional[int]) -> Tuple[List[list], int]:
+    """Deliveries of one innings as csv2 row tails (innings, ball, ..., wicket columns)."""
+    values, weights = RUN_WEIGHTS[fmt]
+    wicket_types, wicket_weights = WICKET_TYPES
+    bowlers = bowling[-6:]
+    order = list(batting)
+    striker, non_striker, next_in = order[0], order[1], 2
+    total = wickets = 0
+    rows = []
+
+    for over in range(OVERS[fmt]):
+        bowler = bowlers[over % len(bowlers)] if over % 2 == 0 else bowlers[(over + 3) % len(bowlers)]
+        legal = 0
+        sub = 0
+        while legal < 6:
+            sub += 1
+            ball = f"{over}.{sub}"
+            runs = extras = 0
+            wides = noballs = byes = legbyes = ""
+            wicket_type = dismissed = ""
+            roll = rng.random()
+            if roll < 0.03:
+                wides = extras = 1
+            elif roll < 0.035:
+                noballs = 1
+                extras = 1
+                runs = rng.choices(values, weights)[0]
+            else:
+                legal += 1
+                if roll < 0.035 + WICKET_RATE[fmt]:
+                    wicket_type = rng.choices(wicket_types, wicket_weights)[0]
+                    dismissed = striker
+                elif roll < 0.055 + WICKET_RATE[fmt]:
+                    if rng.random() < 0.6:
+                        legbyes = extras = rng.choice((1, 1, 2, 4))
+                    else:
+                        byes = extras = rng.choice((1, 1, 4))
+                else:
+                    runs = rng.choices(values, weights)[0]
+
+            total += runs + extras
+            rows.append([innings, ball, striker, non_striker, bowler, runs, extras,
+                         wides, noballs, byes, legbyes, "", wicket_type, dismissed, "", ""])
+
+            if wicket_type:
+                wickets += 1
+                if wickets == 10 or next_in >= len(order):
+                    return rows, total
+                striker = order[next_in]
+                next_in += 1
+            elif (runs + (byes or 0) + (legbyes or 0)) % 2 == 1:
+                striker, non_striker = non_striker, striker
+
+            if target is not None and total >= target:
+                return rows, total
+
+        striker, non_striker = non_striker, striker
+    return rows, total
+
+
+def generate_match(rng: random.Random, fmt: str, match_id: int, teams: Dict[str, List[str]],
+                   venues: List[Tuple[str, str]], year: int) -> Tuple[str, str]:
+    """(ball-by-ball csv, info csv) text for one synthetic match."""
+    team1, team2 = rng.sample(sorted(teams), 2)
+    xi = {t: rng.sample(teams[t], 11) for t in (team1, team2)}
+    venue, city = rng.choice(venues)
+    season = str(year) if fmt != "ODI" or rng.random() < 0.6 else f"{year}/{str(year + 1)[-2:]}"
+    date = f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+    toss_winner = rng.choice((team1, team2))
+    toss_decision = rng.choice(("bat", "field"))
+    batting_first = toss_winner if toss_decision == "bat" else (team2 if toss_winner == team1 else team1)
+    chasing = team2 if batting_first == team1 else team1
+
+    rows1, total1 = _innings(rng, fmt, 1, xi[batting_first], xi[chasing], None)
+    rows2, total2 = _innings(rng, fmt, 2, xi[chasing], xi[batting_first], total1 + 1)
+
+    balls = io.StringIO()
+    writer = csv.writer(balls, lineterminator="\n")
+    writer.writerow(BALL_COLUMNS)
+    for rows, bat, bowl in ((rows1, batting_first, chasing), (rows2, chasing, batting_first)):
+        for row in rows:
+            writer.writerow([match_id, season, date, venue, row[0], row[1], bat, bowl] + row[2:])
+
+    if total2 > total1:
+        wickets_lost = sum(1 for r in rows2 if r[12])
+        winner, margin = chasing, ("winner_wickets", 10 - wickets_lost)
+    elif total1 > total2:
+        winner, margin = batting_first, ("winner_runs", total1 - total2)
+    else:
+        winner, margin = None, None
+
+    info = io.StringIO()
+    writer = csv.writer(info, lineterminator="\n")
+    writer.writerow(["version", "2.1.0"])
+    writer.writerow(["info", "balls_per_over", 6])
+    for team in (team1, team2):
+        writer.writerow(["info", "team", team])
+    for key, value in (("gender", "male"), ("season", season), ("date", date.replace("-", "/")),
+                       ("event", EVENTS[fmt]), ("match_number", match_id % 100 + 1),
+                       ("venue", venue), ("city", city), ("toss_winner", toss_winner),
+                       ("toss_decision", toss_decision),
+                       ("player_of_match", rng.choice(xi[winner or team1]))):
+        writer.writerow(["info", key, value])
+    if winner:
+        writer.writerow(["info", "winner", winner])
+        writer.writerow(["info", margin[0], margin[1]])
+    else:
+        writer.writerow(["info", "outcome", "tie"])
+    for team in (team1, team2):
+        for player in xi[team]:
+            writer.writerow(["info", "player", team, player])
+    for team in (team1, team2):
+        for player in xi[team]:
+            writer.writerow(["info", "registry", "people", player, hashlib.md5(player.encode("utf-8")).hexdigest()[:8]])
+    return balls.getvalue(), info.getvalue()
+
+
+def generate_corpus(out_root: str = SYNTH_ROOT, matches: int = 1000,
+                    formats: Optional[List[str]] = None, seed: int = 0,
+                    archive: bool = False) -> Dict[str, Dict[str, int]]:
+    """Write ``matches`` synthetic matches per format; returns files/bytes per format."""
+    summary = {}
+    match_id = FIRST_MATCH_ID
+    for fmt in formats or list(FORMATS):
+        rng = random.Random(f"{seed}:{fmt}")
+        teams = _squads(rng, 10 if fmt == "IPL" else 24)
+        venues = _venues(rng, 12 if fmt == "IPL" else 60)
+        folder = os.path.join(out_root, FORMATS[fmt])
+        zip_file = None
+        if archive:
+            os.makedirs(out_root, exist_ok=True)
+            zip_file = zipfile.ZipFile(f"{folder}_data.zip", "w", zipfile.ZIP_DEFLATED)
+        else:
+            os.makedirs(folder, exist_ok=True)
+
+        written = 0
+        for i in range(matches):
+            balls, info = generate_match(rng, fmt, match_id, teams, venues, 2008 + i * 17 // max(matches, 1))
+            members = ((f"{match_id}.csv", balls), (f"{match_id}_info.csv", info))
+            for name, text in members:
+                data = text.encode("utf-8")
+                written += len(data)
+                if zip_file is not None:
+                    zip_file.writestr(name, data)
+                else:
+                    with open(os.path.join(folder, name), "wb") as f:
+                        f.write(data)
+            match_id += 1
+
+        if zip_file is not None:
+            zip_file.close()
+        summary[fmt] = {"matches": matches, "bytes": written}
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Cricsheet-format corpus")
+    parser.add_argument("--out", default=SYNTH_ROOT, help="Output root (default: data/synth)")
+    parser.add_argument("--matches", type=int, default=1000, help="Matches per format (default: 1000)")
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--zip", action="store_true", help="Write <format>_data.zip archives instead of folders")
+    args = parser.parse_args()
+
+    print("🧪 GENERATING SYNTHETIC CRICSHEET CORPUS")
+    print("=" * 70)
+    start = time.time()
+    summary = generate_corpus(args.out, args.matches, args.formats, args.seed, args.zip)
+    for fmt, info in summary.items():
+        print(f"   {fmt}: {info['matches']} matches, {info['bytes'] / 2**20:.1f} MB")
+    print(f"\n✅ Done in {time.time() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Per-team statistics for the training scripts, built in one grouped pass.
+
+Every trainer used to loop over the teams and boolean-filter the whole
+matches table twice per team. Here each match is split into its bat-first
+row (team1) and its chase row (team2), and both halves are grouped once.
+The result is a frame indexed by team with every field the trainers use.
+
+Usage:
+  from team_statistics import team_statistics, join_team_stats, team_stats_dict
+  stats = team_statistics(matches)
+  matches = join_team_stats(matches, stats, 'team1', {'t1_wr': 'overall_win_rate'})
+  matches = join_team_stats(matches, stats, 'team2', {'t2_chase_wr': 'chase_win_rate'})
+  team_stats = team_stats_dict(stats, {'wr': 'overall_win_rate', 'avg_score': 'avg_score'})
+
+Columns of ``team_statistics``:
+  total_matches, bat_first_matches, chase_matches
+  overall_win_rate, bat_first_win_rate, chase_win_rate, recent_form
+  avg_score, median_score, avg_run_rate, avg_boundaries, score_consistency
+  high_score_wr (180+), medium_score_wr (150-179), low_score_wr (<150)
+
+Batting averages only count bat-first innings (team1_* columns). Score-band
+rates are bat-first win rates for totals in that band.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+RECENT_MATCHES = 20
+
+# Used when a team has no matches of the kind a field is computed from,
+# and for teams missing from the stats when joining
+DEFAULTS = {
+    "total_matches": 0,
+    "overall_win_rate": 0.5,
+    "bat_first_win_rate": 0.5,
+    "chase_win_rate": 0.5,
+    "recent_form": 0.5,
+    "avg_score": 150,
+    "median_score": 150,
+    "avg_run_rate": 6.5,
+    "avg_boundaries": 15,
+    "score_consistency": 30,
+    "high_score_wr": 0.5,
+    "medium_score_wr": 0.5,
+    "low_score_wr": 0.5,
+}
+
+# Bat-first totals [low, high) for the score-band win rates
+SCORE_BANDS = {
+    "high_score_wr": (180, np.inf),
+    "medium_score_wr": (150, 180),
+    "low_score_wr": (-np.inf, 150),
+}
+
+
+def team_statistics(matches: pd.DataFrame, recent: int = RECENT_MATCHES,
+                    min_split_matches: int = 1) -> pd.DataFrame:
+    """Statistics for every team in ``matches``, indexed by team.
+
+    Teams come in the order they first appear in team1 then team2.
+    ``min_split_matches`` is the number of bat-first (or chase) matches a
+    team needs before its bat-first (or chase) win rate is used instead of
+    the 0.5 default.
+    """
+    won = matches["team1_won"]
+    batting = pd.DataFrame({
+        "team": matches["team1"],
+        "season": matches["season"],
+        "won": won,
+        "runs": matches["team1_runs"],
+        "run_rate": matches["team1_run_rate"],
+        "boundaries": matches["team1_boundaries"],
+    })
+    chasing = pd.DataFrame({"team": matches["team2"], "season": matches["season"], "won": 1 - won})
+    teams = pd.unique(pd.concat([matches["team1"], matches["team2"]]))
+
+    bat = batting.groupby("team", sort=False).agg(
+        bat_first_matches=("won", "size"),
+        bat_first_wins=("won", "sum"),
+        avg_score=("runs", "mean"),
+        median_score=("runs", "median"),
+        avg_run_rate=("run_rate", "mean"),
+        avg_boundaries=("boundaries", "mean"),
+        score_consistency=("runs", "std"),
+    )
+    for name, (low, high) in SCORE_BANDS.items():
+        in_band = (batting["runs"] >= low) & (batting["runs"] < high)
+        bat[name] = batting["won"].where(in_band).groupby(batting["team"], sort=False).mean()
+
+    chase = chasing.groupby("team", sort=False).agg(
+        chase_matches=("won", "size"),
+        chase_wins=("won", "sum"),
+    )
+
+    # Last ``recent`` matches per team, latest season first; a stable sort
+    # keeps bat-first before chase matches within a season
+    history = pd.concat([batting[["team", "season", "won"]], chasing], ignore_index=True)
+    latest = history.sort_values("season", ascending=False, kind="stable")
+    recent_form = latest.groupby("team", sort=False).head(recent).groupby("team", sort=False)["won"].mean()
+
+    stats = bat.reindex(teams).join(chase)
+    stats["recent_form"] = recent_form
+    for col in ("bat_first_matches", "bat_first_wins", "chase_matches", "chase_wins"):
+        stats[col] = stats[col].fillna(0).astype(int)
+    stats["total_matches"] = stats["bat_first_matches"] + stats["chase_matches"]
+
+    stats["overall_win_rate"] = (stats["bat_first_wins"] + stats["chase_wins"]) / stats["total_matches"]
+    stats["bat_first_win_rate"] = (stats["bat_first_wins"] / stats["bat_first_matches"]).where(
+        stats["bat_first_matches"] >= min_split_matches, DEFAULTS["bat_first_win_rate"])
+    stats["chase_win_rate"] = (stats["chase_wins"] / stats["chase_matches"]).where(
+        stats["chase_matches"] >= min_split_matches, DEFAULTS["chase_win_rate"])
+
+    # Teams that never batted first get the batting defaults. A single
+    # bat-first match keeps its NaN std, as pandas gives it.
+    never_batted = stats["bat_first_matches"] == 0
+    for col in ("avg_score", "median_score", "avg_run_rate", "avg_boundaries", "score_consistency"):
+        stats.loc[never_batted, col] = DEFAULTS[col]
+    for col in SCORE_BANDS:
+        stats[col] = stats[col].fillna(DEFAULTS[col])
+
+    stats.index.name = "team"
+    return stats
+
+
+def join_team_stats(matches: pd.DataFrame, stats: pd.DataFrame, team_col: str,
+                    columns: Dict[str, str], defaults: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """Merge stats onto ``matches`` for the team in ``team_col``.
+
+    ``columns`` maps each new column to its stats column. Teams that are not
+    in ``stats`` get the stat's default (``defaults`` overrides DEFAULTS).
+    """
+    defaults = {**DEFAULTS, **(defaults or {})}
+    right = stats[list(columns.values())].set_axis(list(columns), axis=1)
+    joined = matches.merge(right, left_on=team_col, right_index=True, how="left")
+    joined.index = matches.index
+
+    missing = ~matches[team_col].isin(stats.index)
+    if missing.any():
+        for col, stat in columns.items():
+            joined.loc[missing, col] = defaults.get(stat, 0.5)
+    return joined
+
+
+def team_stats_dict(stats: pd.DataFrame, keys: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+    """``{team: {key: value}}`` as pickled for the predictors; ``keys`` maps key -> stats column."""
+    return stats[list(keys.values())].set_axis(list(keys), axis=1).to_dict("index")
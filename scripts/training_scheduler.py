@@ -0,0 +1,137 @@
+"""CPU-aware scheduling for the stacking base learners.
+
+The trainers build a StackingClassifier with ``n_jobs=-1`` over RF, XGB
+and LGBM that are themselves ``n_jobs=-1``. On a many-core host that means
+cores x cores threads fighting each other. BLAS/OpenMP pools inside each
+worker add more.
+
+The scheduler instead splits a core budget across jobs. One job is one
+base learner on one CV fold, or on the full training set:
+
+* ``workers = min(jobs, cores)`` jobs run at once in separate processes
+* each job gets ``cores // workers`` threads. The learner's ``n_jobs`` is
+  set to that, and threadpoolctl pins the BLAS/OpenMP pools to it.
+* fitted models get their original ``n_jobs`` back before they are saved,
+  so the pickled ensemble is unchanged.
+
+Each job reports the CPU time its process used. Utilization per phase is
+then total CPU seconds / (wall seconds x cores), printed after the phase
+and kept in ``scheduler.phases``.
+
+Usage:
+  from training_scheduler import TrainingScheduler
+  scheduler = TrainingScheduler()              # all cores this process may use
+  stacking, cv_scores = fit_oof_stacking(..., scheduler=scheduler)
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from threadpoolctl import threadpool_limits
+
+
+def available_cores() -> int:
+    """Cores this process may run on (affinity-aware where the OS supports it)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+@dataclass
+class Job:
+    """Fit one learner and write its output to ``output``.
+
+    With ``predict_idx`` set, the model is fitted on ``fit_idx`` rows and the
+    ``predict_proba`` of the ``predict_idx`` rows is saved as .npy (one OOF
+    fold). Otherwise the model is fitted on all rows and pickled.
+    """
+
+    name: str
+    estimator: Any
+    output: str
+    fit_idx: Optional[np.ndarray] = None
+    predict_idx: Optional[np.ndarray] = None
+
+
+def _set_threads(estimator, threads: int) -> Optional[Any]:
+    """Set ``n_jobs`` if the learner has it; returns the old value."""
+    params = estimator.get_params(deep=False)
+    if "n_jobs" not in params:
+        return None
+    estimator.set_params(n_jobs=threads)
+    return params["n_jobs"]
+
+
+def _execute(job: Job, X: pd.DataFrame, y: pd.Series, threads: int) -> Tuple[float, float]:
+    """Run one job with a fixed thread budget; returns (cpu seconds, wall seconds)."""
+    cpu, wall = time.process_time(), time.perf_counter()
+    with threadpool_limits(limits=threads):
+        model = clone(job.estimator)
+        n_jobs = _set_threads(model, threads)
+        if job.predict_idx is not None:
+            model.fit(X.iloc[job.fit_idx], y.iloc[job.fit_idx])
+            np.save(job.output + ".tmp.npy", model.predict_proba(X.iloc[job.predict_idx]))
+            os.replace(job.output + ".tmp.npy", job.output)
+        else:
+            model.fit(X, y)
+            if n_jobs is not None:
+                model.set_params(n_jobs=n_jobs)
+            with open(job.output + ".tmp", "wb") as f:
+                pickle.dump(model, f)
+            os.replace(job.output + ".tmp", job.output)
+    return time.process_time() - cpu, time.perf_counter() - wall
+
+
+class TrainingScheduler:
+    """Runs learner jobs concurrently inside a total core budget."""
+
+    def __init__(self, cores: Optional[int] = None):
+        self.cores = max(1, cores or available_cores())
+        self.phases: List[Dict[str, Any]] = []
+
+    def plan(self, n_jobs: int) -> Tuple[int, int]:
+        """(concurrent workers, threads per job) for ``n_jobs`` jobs."""
+        workers = max(1, min(n_jobs, self.cores))
+        return workers, max(1, self.cores // workers)
+
+    def run(self, phase: str, jobs: List[Job], X: pd.DataFrame, y: pd.Series) -> Dict[str, Any]:
+        """Run every job, then log and return the phase's utilization."""
+        if not jobs:
+            return {}
+        workers, threads = self.plan(len(jobs))
+        print(f"   🧵 {phase}: {len(jobs)} jobs, {workers} workers x {threads} threads ({self.cores} cores)")
+
+        start = time.perf_counter()
+        if workers == 1:
+            results = [_execute(job, X, y, threads) for job in jobs]
+        else:
+            results = Parallel(n_jobs=workers, backend="loky")(
+                delayed(_execute)(job, X, y, threads) for job in jobs
+            )
+        wall = time.perf_counter() - start
+
+        cpu = sum(r[0] for r in results)
+        stats = {
+            "phase": phase,
+            "jobs": len(jobs),
+            "workers": workers,
+            "threads": threads,
+            "cores": self.cores,
+            "wall_seconds": round(wall, 2),
+            "cpu_seconds": round(cpu, 2),
+            "utilization": round(cpu / (wall * self.cores), 3) if wall else None,
+        }
+        self.phases.append(stats)
+        print(f"   ⏱️  {phase}: {wall:.1f}s wall, {cpu:.1f}s CPU, "
+              f"{stats['utilization'] * 100:.0f}% of {self.cores} cores")
+        return stats
@@ -0,0 +1,467 @@
+"""Compile the tree ensembles into flat numpy arrays for batch scoring.
+
+``predict_proba`` on the serving StackingClassifier/VotingClassifier goes
+through sklearn, xgboost and lightgbm wrappers that each validate the
+input, convert it and walk their own trees. Every learner those trainers
+use (RandomForest, GradientBoosting, XGB, LGBM, and the distilled
+HistGradientBoosting student) is a sum or mean of binary trees. This
+module flattens each learner's trees into contiguous node arrays:
+
+    feature, threshold, left, right, missing_left, value
+
+Scoring N rows walks (row, tree) pairs down one level per vectorized
+step, a group of trees at a time so that group's nodes stay in cache.
+In forests whose leaves sit far above their deepest one (lightgbm's
+leaf-wise trees) pairs that reached a leaf are dropped along the way.
+No Python runs per tree or per row. The learners' outputs are then
+combined the way the ensemble does it: the stacking meta-learner's
+logistic regression, or the soft voting weights.
+
+Each learner keeps its own comparison semantics so results match
+``predict_proba`` to floating-point rounding. sklearn and xgboost compare
+float32 copies of the inputs. xgboost's strict ``x < t`` becomes
+``x <= nextafter(t, -inf)``. lightgbm and HistGradientBoosting compare
+float64.
+
+This is not a batch-scoring speedup. The gain is the per-call overhead,
+which dominates for one row and for what-if batches of up to a few hundred
+rows. Past COMPILED_MAX_ROWS the compiled model is slower than native
+predict_proba on the serving ensemble: 0.8x at 1000 rows and 0.6x at
+10000, where the native C++ walks of its deep forests (depth 25+) win. The
+benchmark prints both columns so the crossover can be re-read for the
+model being served.
+
+Usage:
+  python scripts/tree_compiler.py                                   # check + benchmark
+  python scripts/tree_compiler.py --model models/student_model.pkl --model-info models/student_info.pkl
+  python scripts/tree_compiler.py --batch-sizes 1 64 1024 --repeats 20
+
+  from tree_compiler import compile_ensemble
+  compiled = compile_ensemble(model, features)
+  proba = compiled.predict_proba(X)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pickle
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.special import expit, logit
+from sklearn.dummy import DummyClassifier
+from sklearn.ensemble import (ExtraTreesClassifier, GradientBoostingClassifier, HistGradientBoostingClassifier,
+                              RandomForestClassifier, StackingClassifier, VotingClassifier)
+from sklearn.linear_model import LogisticRegression
+
+from feature_store import load_features
+
+
+# (row, tree) pairs walked per vectorized pass: whole trees at a time, as
+# many as fit, so one pass touches few enough nodes to stay in cache
+CHUNK_PAIRS = 1 << 15
+
+# Forests deeper than this multiple of their mean leaf depth drop finished
+# pairs; the rest walk every level, leaves looping on themselves
+PRUNE_DEPTH_RATIO = 2.5
+
+# Finished pairs are dropped once they are this share of the pass
+PRUNE_FRACTION = 0.3
+
+# Largest batch the compiled serving ensemble scores faster than the native
+# model (benchmark crossover); callers split bigger batches into chunks of it
+COMPILED_MAX_ROWS = 500
+
+
+@dataclass
+class CompiledForest:
+    """All trees of one learner as flat node arrays.
+
+    ``children[i]`` holds the (left, right) node ids; leaves point to
+    themselves. ``threshold`` is float32 for learners that compare float32
+    inputs, float64 otherwise. ``aggregate`` is "mean" for forests
+    averaging leaf probabilities and "sum" for boosted trees, whose
+    probability is ``expit(scale * (bias + sum of leaves))``.
+    """
+
+    name: str
+    feature: np.ndarray
+    threshold: np.ndarray
+    children: np.ndarray
+    missing_left: np.ndarray
+    is_leaf: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    depth: int
+    aggregate: str
+    bias: float = 0.0
+    scale: float = 1.0
+    prune: Optional[bool] = field(default=None, init=False, repr=False)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def leaf_values(self, X: np.ndarray) -> np.ndarray:
+        """(rows, trees) output of the leaf each row lands in."""
+        X = np.ascontiguousarray(X, dtype=self.threshold.dtype)
+        n_rows, n_features = X.shape
+        if self.prune is None:
+            self.prune = self.depth > PRUNE_DEPTH_RATIO * _mean_leaf_depth(self.children, self.roots)
+        walk = self._walk_active if self.prune else self._walk_levels
+        flat = X.ravel()
+        has_nan = bool(np.isnan(flat).any())
+        # children[i] = (left, right), so node i's child is next_node[2 * i + go_right]
+        next_node = self.children.reshape(-1)
+        row_offset = np.arange(n_rows, dtype=np.int32) * n_features
+
+        out = np.empty((self.n_trees, n_rows))
+        chunk_trees = max(1, CHUNK_PAIRS // max(1, n_rows))
+        for start in range(0, self.n_trees, chunk_trees):
+            roots = self.roots[start:start + chunk_trees]
+            node = np.repeat(roots, n_rows)
+            offset = np.tile(row_offset, len(roots))
+            walk(flat, next_node, node, offset, has_nan, out[start:start + len(roots)].reshape(-1))
+        return out.T
+
+    def _step(self, flat, next_node, node, offset, has_nan) -> np.ndarray:
+        x = flat.take(offset + self.feature.take(node))
+        go_right = x > self.threshold.take(node)
+        if has_nan:
+            missing = np.isnan(x)
+            go_right[missing] = ~self.missing_left[node[missing]]
+        return next_node.take((node << 1) | go_right)
+
+    def _walk_levels(self, flat, next_node, node, offset, has_nan, out) -> None:
+        """Every pair takes ``depth`` steps; leaves loop on themselves."""
+        for _ in range(self.depth):
+            node = self._step(flat, next_node, node, offset, has_nan)
+        out[:] = self.value.take(node)
+
+    def _walk_active(self, flat, next_node, node, offset, has_nan, out) -> None:
+        """Like _walk_levels, but pairs that reached a leaf are dropped once
+        they make up PRUNE_FRACTION of the pass (deep, uneven trees)."""
+        pos = np.arange(len(node))
+        for _ in range(self.depth):
+            node = self._step(flat, next_node, node, offset, has_nan)
+            done = self.is_leaf.take(node)
+            if np.count_nonzero(done) >= max(1, PRUNE_FRACTION * len(node)):
+                out[pos[done]] = self.value.take(node[done])
+                keep = ~done
+                node, pos, offset = node[keep], pos[keep], offset[keep]
+                if not len(node):
+                    return
+        out[pos] = self.value.take(node)
+
+    def predict_proba1(self, X: np.ndarray) -> np.ndarray:
+        """Probability of class 1."""
+        leaves = self.leaf_values(X)
+        if self.aggregate == "mean":
+            return leaves.mean(axis=1)
+        return expit(self.scale * (self.bias + leaves.sum(axis=1)))
+
+
+class _ForestBuilder:
+    """Concatenates per-tree node arrays (local child ids, -1 at leaves)."""
+
+    def __init__(self):
+        self.parts: Dict[str, List[np.ndarray]] = {k: [] for k in
+                                                   ("feature", "threshold", "left", "right", "missing_left", "value")}
+        self.roots: List[int] = []
+        self.size = 0
+
+    def add_tree(self, feature, threshold, left, right, missing_left, value) -> None:
+        left = np.asarray(left, dtype=np.int64)
+        right = np.asarray(right, dtype=np.int64)
+        ids = np.arange(len(left)) + self.size
+        leaf = left < 0
+        self.parts["feature"].append(np.where(leaf, 0, feature))
+        self.parts["threshold"].append(np.where(leaf, 0.0, threshold))
+        self.parts["left"].append(np.where(leaf, ids, left + self.size))
+        self.parts["right"].append(np.where(leaf, ids, right + self.size))
+        self.parts["missing_left"].append(np.asarray(missing_left, dtype=bool))
+        self.parts["value"].append(np.where(leaf, value, 0.0))
+        self.roots.append(self.size)
+        self.size += len(left)
+
+    def build(self, name: str, float32: bool, aggregate: str, bias: float = 0.0,
+              scale: float = 1.0) -> CompiledForest:
+        parts = {k: np.concatenate(v) for k, v in self.parts.items()}
+        threshold = parts["threshold"].astype(np.float64)
+        if float32:
+            # float32 x <= t exactly when x <= the largest float32 not above t
+            rounded = threshold.astype(np.float32)
+            threshold = np.where(rounded > threshold, np.nextafter(rounded, np.float32(-np.inf)), rounded)
+        children = np.column_stack([parts["left"], parts["right"]]).astype(np.int32)
+        roots = np.asarray(self.roots, dtype=np.int32)
+        return CompiledForest(
+            name=name,
+            feature=parts["feature"].astype(np.int32),
+            threshold=threshold,
+            children=children,
+            missing_left=parts["missing_left"],
+            is_leaf=children[:, 0] == np.arange(len(children)),
+            value=parts["value"].astype(np.float64),
+            roots=roots,
+            depth=_max_depth(children, roots),
+            aggregate=aggregate,
+            bias=bias,
+            scale=scale,
+        )
+
+
+def _max_depth(children: np.ndarray, roots: np.ndarray) -> int:
+    """Longest root-to-leaf path over all trees, walked level by level."""
+    depth = 0
+    frontier = roots
+    while True:
+        frontier = frontier[children[frontier, 0] != frontier]
+        if not len(frontier):
+            return depth
+        frontier = children[frontier].ravel()
+        depth += 1
+
+
+def _mean_leaf_depth(children: np.ndarray, roots: np.ndarray) -> float:
+    """Average depth of the leaves over all trees (unweighted)."""
+    depth = leaves = total = 0
+    frontier = roots
+    while len(frontier):
+        leaf = children[frontier, 0] == frontier
+        leaves += int(leaf.sum())
+        total += depth * int(leaf.sum())
+        frontier = children[frontier[~leaf]].ravel()
+        depth += 1
+    return total / max(1, leaves)
+
+
+def _sklearn_tree(builder: _ForestBuilder, tree, value: np.ndarray) -> None:
+    missing_left = getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=bool))
+    builder.add_tree(tree.feature, tree.threshold, tree.children_left, tree.children_right, missing_left, value)
+
+
+def compile_random_forest(name: str, model) -> CompiledForest:
+    builder = _ForestBuilder()
+    for est in model.estimators_:
+        counts = est.tree_.value[:, 0, :]
+        _sklearn_tree(builder, est.tree_, counts[:, 1] / counts.sum(axis=1))
+    return builder.build(name, float32=True, aggregate="mean")
+
+
+def compile_gradient_boosting(name: str, model: GradientBoostingClassifier) -> CompiledForest:
+    if not isinstance(model.init_, DummyClassifier):
+        raise ValueError(f"{name}: only the default prior init can be compiled")
+    builder = _ForestBuilder()
+    for est in model.estimators_[:, 0]:
+        _sklearn_tree(builder, est.tree_, est.tree_.value[:, 0, 0] * model.learning_rate)
+    return builder.build(name, float32=True, aggregate="sum", bias=float(logit(model.init_.class_prior_[1])))
+
+
+def compile_hist_gradient_boosting(name: str, model: HistGradientBoostingClassifier) -> CompiledForest:
+    builder = _ForestBuilder()
+    for (predictor,) in model._predictors:
+        nodes = predictor.nodes
+        if nodes["is_categorical"].any():
+            raise ValueError(f"{name}: categorical splits are not supported")
+        leaf = nodes["is_leaf"].astype(bool)
+        builder.add_tree(nodes["feature_idx"], nodes["num_threshold"],
+                         np.where(leaf, -1, nodes["left"].astype(np.int64)),
+                         np.where(leaf, -1, nodes["right"].astype(np.int64)),
+                         nodes["missing_go_to_left"], nodes["value"])
+    return builder.build(name, float32=False, aggregate="sum", bias=float(model._baseline_prediction.ravel()[0]))
+
+
+def compile_xgboost(name: str, model) -> CompiledForest:
+    learner = json.loads(model.get_booster().save_raw("json"))["learner"]
+    if learner["objective"]["name"] != "binary:logistic":
+        raise ValueError(f"{name}: objective {learner['objective']['name']} is not supported")
+    base_score = float(learner["learner_model_param"]["base_score"].strip("[]"))
+    builder = _ForestBuilder()
+    for tree in learner["gradient_booster"]["model"]["trees"]:
+        if any(tree["split_type"]):
+            raise ValueError(f"{name}: categorical splits are not supported")
+        conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+        # x < t on float32 inputs is x <= the next float32 below t
+        threshold = np.nextafter(conditions, np.float32(-np.inf))
+        builder.add_tree(tree["split_indices"], threshold, tree["left_children"], tree["right_children"],
+                         tree["default_left"], conditions)
+    return builder.build(name, float32=True, aggregate="sum", bias=float(logit(base_score)))
+
+
+def compile_lightgbm(name: str, model) -> CompiledForest:
+    dump = model.booster_.dump_model()
+    if not dump["objective"].startswith("binary"):
+        raise ValueError(f"{name}: objective {dump['objective']} is not supported")
+    sigmoid = float(dump["objective"].split("sigmoid:")[1]) if "sigmoid:" in dump["objective"] else 1.0
+    builder = _ForestBuilder()
+    for info in dump["tree_info"]:
+        nodes: List[Dict[str, Any]] = []
+        children: List[List[int]] = []
+
+        def visit(node: Dict[str, Any]) -> int:
+            idx = len(nodes)
+            nodes.append(node)
+            children.append([-1, -1])
+            if "leaf_value" not in node:
+                if node["decision_type"] != "<=" or node["missing_type"] == "Zero":
+                    raise ValueError(f"{name}: split {node['decision_type']}/{node['missing_type']} is not supported")
+                children[idx] = [visit(node["left_child"]), visit(node["right_child"])]
+            return idx
+
+        visit(info["tree_structure"])
+        # missing_type None scores NaN as 0.0
+        missing_left = [False if "leaf_value" in n else
+                        n["default_left"] if n["missing_type"] == "NaN" else 0.0 <= n["threshold"]
+                        for n in nodes]
+        builder.add_tree([n.get("split_feature", 0) for n in nodes], [n.get("threshold", 0.0) for n in nodes],
+                         [c[0] for c in children], [c[1] for c in children], missing_left,
+                         [n.get("leaf_value", 0.0) for n in nodes])
+    return builder.build(name, float32=False, aggregate="sum", scale=sigmoid)
+
+
+def compile_learner(name: str, model) -> CompiledForest:
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        return compile_random_forest(name, model)
+    if isinstance(model, GradientBoostingClassifier):
+        return compile_gradient_boosting(name, model)
+    if isinstance(model, HistGradientBoostingClassifier):
+        return compile_hist_gradient_boosting(name, model)
+    kind = type(model).__name__
+    if kind == "XGBClassifier":
+        return compile_xgboost(name, model)
+    if kind == "LGBMClassifier":
+        return compile_lightgbm(name, model)
+    raise ValueError(f"{name}: cannot compile {kind}")
+
+
+@dataclass
+class CompiledEnsemble:
+    """Compiled learners plus how the ensemble combines their probabilities.
+
+    combine="stacking": expit(coef . probabilities + intercept)
+    combine="voting":   weighted mean of probabilities
+    combine="single":   the one learner's probability
+    """
+
+    forests: List[CompiledForest]
+    combine: str
+    weights: np.ndarray
+    intercept: float
+    classes: np.ndarray
+    features: Optional[List[str]] = None
+
+    def _matrix(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            X = X[self.features] if self.features else X
+        return np.asarray(X, dtype=np.float64)
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = self._matrix(X)
+        probas = np.column_stack([forest.predict_proba1(X) for forest in self.forests])
+        if self.combine == "stacking":
+            p1 = expit(probas @ self.weights + self.intercept)
+        else:
+            p1 = probas @ self.weights
+        return np.column_stack([1 - p1, p1])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
+
+    @property
+    def n_trees(self) -> int:
+        return sum(forest.n_trees for forest in self.forests)
+
+
+def compile_ensemble(model, features: Optional[Sequence[str]] = None) -> CompiledEnsemble:
+    """Compile a fitted binary tree model, or a stacking/soft-voting ensemble of them."""
+    features = list(features) if features is not None else None
+    if len(model.classes_) != 2:
+        raise ValueError("only binary classifiers can be compiled")
+
+    if isinstance(model, StackingClassifier):
+        final = model.final_estimator_
+        if model.passthrough or not isinstance(final, LogisticRegression):
+            raise ValueError("stacking must use a LogisticRegression meta-learner without passthrough")
+        if any(method != "predict_proba" for method in model.stack_method_):
+            raise ValueError("stacking must stack predict_proba")
+        forests = [compile_learner(name, est) for name, est in zip(model.named_estimators_, model.estimators_)]
+        return CompiledEnsemble(forests, "stacking", final.coef_[0].astype(np.float64),
+                                float(final.intercept_[0]), model.classes_, features)
+
+    if isinstance(model, VotingClassifier):
+        if model.voting != "soft":
+            raise ValueError("only soft voting can be compiled")
+        weights = np.ones(len(model.estimators_)) if model.weights is None else np.asarray(model.weights, float)
+        forests = [compile_learner(name, est) for name, est in zip(model.named_estimators_, model.estimators_)]
+        return CompiledEnsemble(forests, "voting", weights / weights.sum(), 0.0, model.classes_, features)
+
+    return CompiledEnsemble([compile_learner(type(model).__name__, model)], "single",
+                            np.ones(1), 0.0, model.classes_, features)
+
+
+def _median_seconds(fn, repeats: int) -> float:
+    fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile the serving ensemble to numpy and benchmark it")
+    parser.add_argument("--model", default="models/ultimate_ensemble_model.pkl")
+    parser.add_argument("--model-info", default="models/model_info.pkl")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="Max allowed probability difference")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    print("🌲 TREE ENSEMBLE COMPILER")
+    print("=" * 70)
+    with open(args.model, "rb") as f:
+        model = pickle.load(f)
+    with open(args.model_info, "rb") as f:
+        model_info = pickle.load(f)
+    features = model_info["features"]
+
+    start = time.time()
+    compiled = compile_ensemble(model, features)
+    print(f"✅ Compiled {type(model).__name__} in {time.time() - start:.1f}s "
+          f"({compiled.n_trees} trees, {compiled.combine})")
+    for forest in compiled.forests:
+        print(f"   {forest.name:<6} {forest.n_trees:>5} trees {len(forest.value):>9} nodes  depth {forest.depth}")
+
+    fs = load_features(model_info.get("feature_set", "quick"))
+    X = fs.X[features]
+
+    print("\n🔍 Equivalence on every feature-store row...")
+    expected = model.predict_proba(X)
+    actual = compiled.predict_proba(X)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    same_class = float(np.mean(model.predict(X) == compiled.predict(X)))
+    print(f"   {len(X)} rows: max |Δp| = {max_diff:.2e}, same predicted class {same_class*100:.2f}%")
+    if max_diff > args.tolerance:
+        print(f"❌ Outside tolerance {args.tolerance:g}")
+        return
+    print(f"   ✅ Within tolerance {args.tolerance:g}")
+
+    print("\n" + "=" * 70)
+    print("⏱️  THROUGHPUT (predict_proba, median of repeats)")
+    print("=" * 70)
+    print(f"{'rows':>8}{'model ms':>12}{'compiled ms':>13}{'model rows/s':>15}{'compiled rows/s':>17}{'speedup':>9}")
+    for size in args.batch_sizes:
+        batch = X.iloc[np.arange(size) % len(X)]
+        model_s = _median_seconds(lambda: model.predict_proba(batch), args.repeats)
+        compiled_s = _median_seconds(lambda: compiled.predict_proba(batch), args.repeats)
+        print(f"{size:>8}{model_s*1e3:>12.2f}{compiled_s*1e3:>13.2f}{size/model_s:>15,.0f}"
+              f"{size/compiled_s:>17,.0f}{model_s/compiled_s:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
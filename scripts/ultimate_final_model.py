@@ -10,129 +10,16 @@ import os
 import warnings
 warnings.filterwarnings('ignore')
 
+from feature_store import load_features
+
 print("🎯 ULTIMATE FINAL MODEL - Maximum Possible Accuracy")
 print("="*70)
 
-matches = pd.read_csv('data/processed/quality_matches_dataset.csv')
-print(f"✅ Loaded {len(matches)} matches")
-
-# Remove extreme outliers
-initial_len = len(matches)
-matches = matches[
-    (matches['team1_runs'] >= 80) & 
-    (matches['team1_runs'] <= 350) &
-    (matches['team1_wickets'] <= 10) &
-    (matches['team1_run_rate'] > 3) &
-    (matches['team1_run_rate'] < 15)
-]
-print(f"   Cleaned: {len(matches)} matches ({initial_len - len(matches)} outliers removed)")
-
-# Team stats with MORE MATCHES = BETTER STATS
-print("\n📊 Team statistics (quality threshold)...")
-team_stats = {}
-
-for team in pd.concat([matches['team1'], matches['team2']]).unique():
-    t1 = matches[matches['team1'] == team]
-    t2 = matches[matches['team2'] == team]
-    total = len(t1) + len(t2)
-    
-    # Only include teams with 10+ matches for reliable stats
-    if total < 10:
-        continue
-    
-    wins = t1['team1_won'].sum() + (len(t2) - t2['team1_won'].sum())
-    
-    team_stats[team] = {
-        'wr': wins / total,
-        'bat_wr': t1['team1_won'].mean() if len(t1) >= 5 else 0.5,
-        'chase_wr': (1 - t2['team1_won'].mean()) if len(t2) >= 5 else 0.5,
-        'avg_score': t1['team1_runs'].mean(),
-        'avg_rr': t1['team1_run_rate'].mean(),
-        'consistency': 1 / (t1['team1_runs'].std() + 10)  # Lower std = more consistent
-    }
-
-print(f"   ✅ {len(team_stats)} quality teams")
-
-# Filter matches to only include teams we have good stats for
-matches = matches[
-    matches['team1'].isin(team_stats.keys()) & 
-    matches['team2'].isin(team_stats.keys())
-]
-print(f"   Filtered to {len(matches)} matches with quality team data")
-
-# Add team features
-matches['t1_wr'] = matches['team1'].map(lambda x: team_stats.get(x, {}).get('wr', 0.5))
-matches['t2_wr'] = matches['team2'].map(lambda x: team_stats.get(x, {}).get('wr', 0.5))
-matches['t1_bat_wr'] = matches['team1'].map(lambda x: team_stats.get(x, {}).get('bat_wr', 0.5))
-matches['t2_chase_wr'] = matches['team2'].map(lambda x: team_stats.get(x, {}).get('chase_wr', 0.5))
-matches['t1_avg_score'] = matches['team1'].map(lambda x: team_stats.get(x, {}).get('avg_score', 150))
-matches['t1_consistency'] = matches['team1'].map(lambda x: team_stats.get(x, {}).get('consistency', 0.05))
-matches['t2_consistency'] = matches['team2'].map(lambda x: team_stats.get(x, {}).get('consistency', 0.05))
-
-# Venue stats with MINIMUM MATCHES requirement
-print("\n🌍 Venue statistics (quality threshold)...")
-venue_counts = matches['venue'].value_counts()
-quality_venues = venue_counts[venue_counts >= 5].index  # At least 5 matches
-
-matches = matches[matches['venue'].isin(quality_venues)]
-print(f"   Filtered to {len(matches)} matches at quality venues")
-
-venue_stats = matches.groupby('venue').agg({
-    'team1_runs': ['mean', 'std'],
-    'team1_won': 'mean',
-    'team1_run_rate': 'mean'
-}).reset_index()
-
-venue_stats.columns = ['venue', 'v_avg', 'v_std', 'v_bat_adv', 'v_rr']
-matches = matches.merge(venue_stats, on='venue', how='left')
-
-print(f"   ✅ {len(quality_venues)} quality venues")
-
-# Create STRONGEST features
-print("\n🔧 Creating optimized features...")
-
-# Core features
-matches['runs'] = matches['team1_runs']
-matches['wickets'] = matches['team1_wickets']
-matches['rr'] = matches['team1_run_rate']
-
-# THE MOST IMPORTANT FEATURES (based on cricket logic)
-matches['score_above_venue'] = (matches['runs'] - matches['v_avg']) / matches['v_std']
-matches['team_strength'] = matches['t1_wr'] - matches['t2_wr']
-matches['situation_advantage'] = matches['t1_bat_wr'] - matches['t2_chase_wr']
-matches['wickets_remaining'] = 10 - matches['wickets']
-matches['wicket_quality'] = matches['wickets_remaining'] / 10 * (matches['runs'] / 150)
-
-# Performance indicators
-matches['big_score'] = (matches['runs'] >= matches['v_avg'] + 15).astype(int)
-matches['low_wickets'] = (matches['wickets'] <= 5).astype(int)
-matches['high_rr'] = (matches['rr'] >= 8).astype(int)
-matches['dominant_performance'] = matches['big_score'] * matches['low_wickets']
-
-# Match context
-matches['balanced_match'] = (abs(matches['team_strength']) < 0.15).astype(int)
-matches['score_normalized'] = matches['runs'] / matches['v_avg']
-
-# THE KILLER FEATURE: Combined performance metric
-matches['overall_strength'] = (
-    matches['score_above_venue'] * 0.4 +
-    matches['team_strength'] * 0.3 +
-    matches['wicket_quality'] * 0.2 +
-    matches['situation_advantage'] * 0.1
-)
-
-features = [
-    'runs', 'wickets', 'rr',
-    't1_wr', 't2_wr', 't1_bat_wr', 't2_chase_wr',
-    'v_avg', 'v_bat_adv',
-    'score_above_venue', 'team_strength', 'situation_advantage',
-    'wickets_remaining', 'wicket_quality',
-    'big_score', 'low_wickets', 'dominant_performance',
-    'balanced_match', 'score_normalized', 'overall_strength'
-]
-
-X = matches[features].fillna(0)
-y = matches['team1_won']
+# Engineered features, cached per dataset version (see feature_store.py)
+fs = load_features('ultimate')
+X, y = fs.X, fs.y
+features = fs.features
+team_stats, venue_stats = fs.team_stats, fs.venue_stats
 
 print(f"   ✅ {len(features)} optimized features")
 print(f"   ✅ Final dataset: {len(X)} quality matches")
@@ -272,7 +159,9 @@ model_info = {
     'avg_accuracy': avg_acc,
     'cv_mean': cv_scores.mean(),
     'cv_std': cv_scores.std(),
-    'total_matches': len(X)
+    'total_matches': len(X),
+    'feature_set': fs.name,
+    'feature_version': fs.version
 }
 
 with open('models/model_info.pkl', 'wb') as f: